@@ -50,41 +50,71 @@ print(f'Neo4j seeded: {len(stmts)} statement(s) executed.')
 echo "Neo4j seeded successfully."
 
 # ---------------------------------------------------------------
-# 2. OpenSearch — create index and bulk-load chunks
+# 2. OpenSearch — create index (if missing) and index changed chunks
 # ---------------------------------------------------------------
-echo ""
-echo "Creating OpenSearch index..."
-
-# Delete index if it exists (idempotent)
-curl -sf -X DELETE "http://opensearch:9200/strategy-chunks" > /dev/null 2>&1 || true
-
-# Create index with mapping
-curl -sf -X PUT "http://opensearch:9200/strategy-chunks" \
-  -H "Content-Type: application/json" \
-  -d '{
-  "mappings": {
-    "properties": {
-      "chunk_id":      { "type": "keyword" },
-      "doc_id":        { "type": "keyword" },
-      "doc_title":     { "type": "text" },
-      "doc_year":      { "type": "integer" },
-      "organization":  { "type": "keyword" },
-      "chunk_text":    { "type": "text", "analyzer": "standard" },
-      "section":       { "type": "keyword" },
-      "page_number":   { "type": "integer" },
-      "themes":        { "type": "keyword" },
-      "countries":     { "type": "keyword" },
-      "chunk_order":   { "type": "integer" }
+# Re-runs keep the index and model and only re-index changed chunks;
+# SEED_RESET=1 drops both and starts over.
+SEED_RESET="${SEED_RESET:-0}"
+MODEL="$SEED_DIR/opensearch/lsa-model.npz"
+MCP_DIR="$REPO_ROOT/poc/mcp-servers/strategy-review"
+
+# Refitting the embedding model changes every vector, so it is only done
+# when the model is missing.
+if [ "$SEED_RESET" = 1 ] || [ ! -f "$MODEL" ]; then
+  echo ""
+  echo "Fitting the embedding model..."
+  PYTHONPATH="$MCP_DIR" "$REPO_ROOT/poc/.venv/bin/python3" \
+    -m strategy_review_mcp.embeddings \
+    "$SEED_DIR/opensearch/chunks.ndjson" \
+    --model "$MODEL"
+fi
+
+if [ "$SEED_RESET" = 1 ] || ! curl -sf -o /dev/null "http://opensearch:9200/strategy-chunks"; then
+  echo ""
+  echo "Creating OpenSearch index..."
+
+  # Delete index if it exists (idempotent)
+  curl -sf -X DELETE "http://opensearch:9200/strategy-chunks" > /dev/null 2>&1 || true
+
+  # Create index with mapping
+  curl -sf -X PUT "http://opensearch:9200/strategy-chunks" \
+    -H "Content-Type: application/json" \
+    -d '{
+    "settings": {
+      "index": { "knn": true }
+    },
+    "mappings": {
+      "properties": {
+        "chunk_id":      { "type": "keyword" },
+        "doc_id":        { "type": "keyword" },
+        "doc_title":     { "type": "text" },
+        "doc_year":      { "type": "integer" },
+        "organization":  { "type": "keyword" },
+        "chunk_text":    { "type": "text", "analyzer": "standard" },
+        "section":       { "type": "keyword" },
+        "page_number":   { "type": "integer" },
+        "themes":        { "type": "keyword" },
+        "countries":     { "type": "keyword" },
+        "chunk_order":   { "type": "integer" },
+        "content_hash":  { "type": "keyword", "index": false },
+        "chunk_vector":  {
+          "type": "knn_vector",
+          "dimension": 64,
+          "method": { "name": "hnsw", "space_type": "cosinesimil", "engine": "lucene" }
+        }
+      }
     }
-  }
-}'
-echo ""
-echo "Index 'strategy-chunks' created."
+  }'
+  echo ""
+  echo "Index 'strategy-chunks' created."
+fi
 
-echo "Bulk indexing document chunks..."
-curl -sf -X POST "http://opensearch:9200/_bulk" \
-  -H "Content-Type: application/x-ndjson" \
-  --data-binary "@$SEED_DIR/opensearch/chunks.ndjson"
+echo ""
+echo "Indexing document chunks..."
+PYTHONPATH="$MCP_DIR" OPENSEARCH_URL="http://opensearch:9200" \
+  "$REPO_ROOT/poc/.venv/bin/python3" -m strategy_review_mcp.ingest \
+  "$SEED_DIR/opensearch/chunks.ndjson" \
+  --model "$MODEL"
 
 echo ""
 echo "OpenSearch seeded successfully."
@@ -0,0 +1,120 @@
+"""Round trips and latency of get_chunk_context vs per-chunk lookups.
+
+Replays a reading workload over every seeded document — expand each chunk
+in document order with one neighbour either side, then revisit random
+chunks with wider windows — three ways:
+
+  - per-chunk:  one term query per neighbouring chunk_id (what a client
+                could do with derived ids and no range support)
+  - no cache:   get_chunk_context with its per-document cache disabled
+  - cached:     get_chunk_context as shipped
+
+Each backend call can be given a simulated network round trip
+(--rtt-ms), since the memory backend answers in well under a millisecond
+and OpenSearch in a few.
+
+Usage (from poc/mcp-servers/strategy-review):
+
+    SEARCH_BACKEND=memory uv run python benchmarks/bench_chunk_context.py
+    uv run python benchmarks/bench_chunk_context.py --rtt-ms 0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Any
+
+from strategy_review_mcp import server
+from strategy_review_mcp.server import _close_clients, get_chunk_context
+
+
+class _CountingBackend:
+    """Wraps the search backend to count calls and add a fixed delay."""
+
+    def __init__(self, backend: Any, rtt: float):
+        self.backend = backend
+        self.rtt = rtt
+        self.calls = 0
+
+    async def search(self, body: dict[str, Any]) -> dict[str, Any]:
+        self.calls += 1
+        await asyncio.sleep(self.rtt)
+        return await self.backend.search(body)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.backend, name)
+
+
+async def _per_chunk(chunk_id: str, before: int, after: int) -> list[Any]:
+    """Fetch the anchor, then each neighbour by its derived id."""
+    backend = server._get_search_backend()
+    body = {"size": 1, "query": {"term": {"chunk_id": chunk_id}}}
+    anchor = (await backend.search(body))["hits"]["hits"][0]["_source"]
+    doc_id, order = anchor["doc_id"], anchor["chunk_order"]
+    chunks = []
+    for o in range(max(order - before, 0), order + after + 1):
+        body = {"size": 1, "query": {"term": {"chunk_id": f"{doc_id}_{o:03d}"}}}
+        chunks.extend((await backend.search(body))["hits"]["hits"])
+    return chunks
+
+
+async def _context(chunk_id: str, before: int, after: int) -> list[Any]:
+    result = await get_chunk_context(chunk_id, before, after)
+    if "error" in result:
+        raise SystemExit(f"get_chunk_context failed: {result['error']}")
+    return result["chunks"]
+
+
+async def _main(args: argparse.Namespace) -> None:
+    backend = server._get_search_backend()
+    listing = await backend.search(
+        {"size": 10_000, "query": {"match_all": {}}, "_source": ["chunk_id"]}
+    )
+    chunk_ids = sorted(h["_source"]["chunk_id"] for h in listing["hits"]["hits"])
+    rng = random.Random(0)
+    workload = [(c, 1, 1) for c in chunk_ids] + [
+        (rng.choice(chunk_ids), 2, 2) for _ in range(args.revisits)
+    ]
+    print(
+        f"{len(workload)} expansions over {len(chunk_ids)} chunks, "
+        f"simulated RTT {args.rtt_ms} ms"
+    )
+
+    counting = _CountingBackend(backend, args.rtt_ms / 1000)
+    server._search_backend = counting
+    print(f"{'strategy':<12}{'round trips':>12}{'per call':>10}{'median ms':>11}")
+    for label, fetch, cache_docs in (
+        ("per-chunk", _per_chunk, 0),
+        ("no cache", _context, 0),
+        ("cached", _context, server.CHUNK_CONTEXT_CACHE_DOCS),
+    ):
+        server._chunk_context_cache = server.TTLCache(
+            maxsize=cache_docs, ttl=server.QUERY_CACHE_TTL_SECONDS
+        )
+        counting.calls = 0
+        times = []
+        for chunk_id, before, after in workload:
+            start = time.perf_counter()
+            await fetch(chunk_id, before, after)
+            times.append(time.perf_counter() - start)
+        print(
+            f"{label:<12}{counting.calls:>12}{counting.calls / len(workload):>10.2f}"
+            f"{statistics.median(times) * 1000:>11.2f}"
+        )
+    server._search_backend = backend
+    await _close_clients()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rtt-ms", type=float, default=2.0)
+    parser.add_argument("--revisits", type=int, default=30)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Duplicate call storms: backend calls and latency with and without
+single-flight coalescing.
+
+Several chat sessions or parallel sub-agents often ask the same question at
+the same moment. This fires --storms bursts of --width identical calls, one
+burst at a time (a search_documents query, a search_chunks query or a
+get_page_image page, in turn, each burst with new arguments), through the
+tool functions in-process, once with COALESCE_CALLS off and once on, and
+reports:
+
+  - the search requests and blob downloads the server made (the "backend"
+    and "blob" stages of server_stats),
+  - client-side p50/p99 per call and the wall time of all the storms,
+  - the coalesced counts of cache_stats.
+
+The result and page caches are off, so every burst starts cold, as the
+first one for a new query does. The search backend is a fake OpenSearch
+node (see bench_opensearch_faults.py) and the pages come from the stand-in
+blob service of bench_load.py, both with a fixed round-trip latency.
+
+Usage (from poc/mcp-servers/strategy-review):
+
+    uv run python benchmarks/bench_coalescing.py
+    uv run python benchmarks/bench_coalescing.py --width 32 --search-latency-ms 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from pathlib import Path
+from typing import Any
+
+# Every burst must start cold — set before the server is imported.
+os.environ["QUERY_CACHE_SIZE"] = "0"
+os.environ["PAGE_CACHE_MAX_BYTES"] = "0"
+os.environ["GRAPH_SUMMARY_REFRESH_SECONDS"] = "0"
+
+from bench_load import (
+    SEED_DIR,
+    _seed_pages,
+    build_workload,
+    start_fake_blob_service,
+)
+from bench_opensearch_faults import INDEX, start_node
+
+from strategy_review_mcp import server
+from strategy_review_mcp.bm25 import BM25Index
+from strategy_review_mcp.search_backends import (
+    OpenSearchBackend,
+    TimedBackend,
+)
+
+TOOLS = ("search_documents", "search_chunks", "get_page_image")
+
+# The storage SDK logs every request and response.
+logging.getLogger("azure").setLevel(logging.WARNING)
+
+
+def build_storms(n: int, seed: int) -> list[tuple[str, dict[str, Any]]]:
+    """One (tool, args) per storm, each with arguments not used before."""
+    rng = random.Random(seed)
+    queries = list(
+        dict.fromkeys(
+            args["query"]
+            for _, args in build_workload(4 * n, {"search_chunks": 1}, 4 * n, seed)
+        )
+    )
+    pages = [(doc_id, p) for doc_id, nums in _seed_pages().items() for p in nums]
+    rng.shuffle(pages)
+    storms = []
+    for i in range(n):
+        tool = TOOLS[i % len(TOOLS)]
+        if tool == "get_page_image":
+            doc_id, page_num = pages[i % len(pages)]
+            storms.append((tool, {"doc_id": doc_id, "page_num": page_num}))
+        else:
+            storms.append((tool, {"query": queries[i % len(queries)], "top_k": 5}))
+    return storms
+
+
+def _percentile(values: list[float], q: float) -> float:
+    return values[min(len(values) - 1, max(0, round(q * len(values)) - 1))]
+
+
+async def run(
+    storms: list[tuple[str, dict[str, Any]]], width: int, coalesce: bool
+) -> dict[str, Any]:
+    """Fire the storms one after another; counts and timings."""
+    server._search_flight = server.SingleFlight(enabled=coalesce)
+    server._page_flight = server.SingleFlight(enabled=coalesce)
+    server._metrics.reset()
+    latencies: list[float] = []
+    errors = 0
+
+    async def call(tool: str, args: dict[str, Any]) -> None:
+        nonlocal errors
+        start = time.perf_counter()
+        result = await getattr(server, tool)(**args)
+        latencies.append((time.perf_counter() - start) * 1000)
+        errors += server._is_error(result)
+
+    start = time.perf_counter()
+    for tool, args in storms:
+        await asyncio.gather(*(call(tool, args) for _ in range(width)))
+    wall = time.perf_counter() - start
+
+    tools = server._metrics.snapshot()["tools"]
+
+    def stage_count(stage: str) -> int:
+        return sum(
+            t["stages_ms"].get(stage, {}).get("count", 0) for t in tools.values()
+        )
+
+    latencies.sort()
+    return {
+        "calls": len(latencies),
+        "errors": errors,
+        "searches": stage_count("backend"),
+        "downloads": stage_count("blob"),
+        "p50_ms": _percentile(latencies, 0.5),
+        "p99_ms": _percentile(latencies, 0.99),
+        "wall_s": wall,
+        "coalesced": sum(
+            f["coalesced"] for f in server._cache_stats()["coalescing"].values()
+        ),
+    }
+
+
+async def _main(args: argparse.Namespace) -> dict[str, Any]:
+    rng = random.Random(args.seed)
+    index = BM25Index.from_ndjson(SEED_DIR / "opensearch" / "chunks.ndjson")
+    node, url = await start_node(
+        ("ok", 0.0, 0.0), index, None, args.search_latency_ms / 1000, rng
+    )
+    blob_runner, endpoint = await start_fake_blob_service(args.blob_latency_ms / 1000)
+    server.AZURE_BLOB_ENDPOINT = endpoint
+    server._search_backend = TimedBackend(
+        OpenSearchBackend(url, "", "", INDEX, pool_maxsize=64), server._metrics
+    )
+    storms = build_storms(args.storms, args.seed)
+    print(
+        f"{args.storms} storms of {args.width} identical calls "
+        f"({', '.join(TOOLS)} in turn); search {args.search_latency_ms:g} ms, "
+        f"blob {args.blob_latency_ms:g} ms"
+    )
+    print(
+        f"{'coalesce':<10}{'calls':>7}{'searches':>10}{'downloads':>11}"
+        f"{'p50 ms':>9}{'p99 ms':>9}{'wall s':>8}{'coalesced':>11}{'errors':>8}"
+    )
+    results = {}
+    try:
+        # Connections, imports and the like, before either run.
+        await run(build_storms(len(TOOLS), args.seed + 1), args.width, True)
+        for mode in ("off", "on"):
+            r = results[mode] = await run(storms, args.width, mode == "on")
+            print(
+                f"{mode:<10}{r['calls']:>7}{r['searches']:>10}{r['downloads']:>11}"
+                f"{r['p50_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['wall_s']:>8.2f}"
+                f"{r['coalesced']:>11}{r['errors']:>8}"
+            )
+    finally:
+        await server._close_clients()
+        await blob_runner.cleanup()
+        if node is not None:
+            await node.cleanup()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--storms", type=int, default=60)
+    parser.add_argument("--width", type=int, default=8)
+    parser.add_argument("--search-latency-ms", type=float, default=20)
+    parser.add_argument("--blob-latency-ms", type=float, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    args = parser.parse_args()
+    results = asyncio.run(_main(args))
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Concurrency benchmark for the strategy-review tools.
+
+Replays the fan-out the web app sends for one chat turn (``Promise.all`` over
+N tool calls) against the live OpenSearch / Azurite stack and reports the
+wall-clock time two ways:
+
+  - serial:   each call awaited before the next starts. This is what the
+              previous synchronous handlers amounted to, because a blocking
+              client call held the event loop for its full duration.
+  - parallel: all calls started together with ``asyncio.gather``, which is
+              what the async handlers allow.
+
+Usage (from poc/mcp-servers/strategy-review, with the docker stack seeded):
+
+    uv run python benchmarks/bench_concurrency.py --calls 12 --rounds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any
+
+from strategy_review_mcp.server import _close_clients, mcp
+
+# A representative tool mix — the same shapes the strategy-review skill sends.
+_CALL_MIX: list[tuple[str, dict[str, Any]]] = [
+    ("search_documents", {"query": "maternal health", "top_k": 5}),
+    ("search_chunks", {"query": "TB elimination", "top_k": 5}),
+    ("get_page_image", {"doc_id": "GH_2024", "page_num": 1}),
+    ("search_chunks", {"query": "malaria bed nets", "doc_id": "GH_2024"}),
+    ("get_page_image", {"doc_id": "TB_2025", "page_num": 2}),
+    ("search_documents", {"query": "gender equality", "top_k": 3}),
+]
+
+
+def _build_calls(n: int) -> list[tuple[str, dict[str, Any]]]:
+    return [_CALL_MIX[i % len(_CALL_MIX)] for i in range(n)]
+
+
+async def _run_serial(calls: list[tuple[str, dict[str, Any]]]) -> float:
+    start = time.perf_counter()
+    for name, args in calls:
+        await mcp.call_tool(name, args)
+    return time.perf_counter() - start
+
+
+async def _run_parallel(calls: list[tuple[str, dict[str, Any]]]) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(mcp.call_tool(name, args) for name, args in calls))
+    return time.perf_counter() - start
+
+
+async def _main(n_calls: int, rounds: int) -> None:
+    calls = _build_calls(n_calls)
+
+    # Warm-up: open the connection pools so both modes start from the same state.
+    await _run_parallel(calls)
+
+    serial = [await _run_serial(calls) for _ in range(rounds)]
+    parallel = [await _run_parallel(calls) for _ in range(rounds)]
+    await _close_clients()
+
+    s_med = statistics.median(serial) * 1000
+    p_med = statistics.median(parallel) * 1000
+    print(f"{n_calls} tool calls per round, {rounds} rounds (median wall-clock)")
+    print(f"  serial   (blocking handlers): {s_med:8.1f} ms")
+    print(f"  parallel (async handlers):    {p_med:8.1f} ms")
+    print(f"  speed-up:                     {s_med / p_med:8.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=12, help="calls per round")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds per mode")
+    args = parser.parse_args()
+    asyncio.run(_main(args.calls, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
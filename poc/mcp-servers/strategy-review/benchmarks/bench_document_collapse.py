@@ -0,0 +1,154 @@
+"""Skewed-corpus check for document-level search.
+
+Builds a scratch index in which one long document owns most of the chunks
+matching the query, then runs the same query two ways:
+
+  - over-fetch: the previous strategy — ``top_k * 5`` chunk hits, deduped by
+                doc_id in Python.
+  - collapse:   the current strategy — ``size=top_k`` with field collapsing
+                on doc_id.
+
+It reports how many distinct documents each returns and the response size,
+and exits non-zero if collapsing does not return exactly ``top_k`` documents.
+The scratch index is deleted afterwards.
+
+Usage (from poc/mcp-servers/strategy-review, with OpenSearch running):
+
+    uv run python benchmarks/bench_document_collapse.py --top-k 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from typing import Any
+
+from opensearchpy import OpenSearch, helpers
+
+SCRATCH_INDEX = "strategy-chunks-collapse-bench"
+QUERY = "tuberculosis elimination"
+
+
+def _corpus(long_doc_chunks: int, short_docs: int) -> list[dict[str, Any]]:
+    chunks = []
+    for i in range(long_doc_chunks):
+        chunks.append(
+            {
+                "chunk_id": f"LONG_{i:04d}",
+                "doc_id": "LONG",
+                "doc_title": "Tuberculosis Elimination Compendium",
+                "chunk_text": f"Tuberculosis elimination programme section {i}. "
+                "Tuberculosis elimination requires case finding.",
+                "chunk_order": i,
+            }
+        )
+    for d in range(short_docs):
+        chunks.append(
+            {
+                "chunk_id": f"SHORT{d}_0001",
+                "doc_id": f"SHORT{d}",
+                "doc_title": f"Regional Health Plan {d}",
+                "chunk_text": "Among other priorities, tuberculosis elimination "
+                "is mentioned once in this plan.",
+                "chunk_order": 1,
+            }
+        )
+    return chunks
+
+
+def _multi_match() -> dict[str, Any]:
+    return {
+        "multi_match": {
+            "query": QUERY,
+            "fields": ["doc_title^2", "chunk_text"],
+            "type": "best_fields",
+        }
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--long-doc-chunks", type=int, default=200)
+    parser.add_argument("--short-docs", type=int, default=20)
+    args = parser.parse_args()
+
+    url = os.environ.get("OPENSEARCH_URL", "http://localhost:9200")
+    user = os.environ.get("OPENSEARCH_USER", "admin")
+    client = OpenSearch(
+        hosts=[url],
+        http_auth=(user, os.environ.get("OPENSEARCH_PASSWORD", "admin"))
+        if user
+        else None,
+        use_ssl=url.startswith("https"),
+        verify_certs=False,
+    )
+
+    client.indices.delete(index=SCRATCH_INDEX, ignore=[404])
+    client.indices.create(
+        index=SCRATCH_INDEX,
+        body={
+            "mappings": {
+                "properties": {
+                    "chunk_id": {"type": "keyword"},
+                    "doc_id": {"type": "keyword"},
+                    "doc_title": {"type": "text"},
+                    "chunk_text": {"type": "text", "analyzer": "standard"},
+                    "chunk_order": {"type": "integer"},
+                }
+            }
+        },
+    )
+    try:
+        helpers.bulk(
+            client,
+            (
+                {"_index": SCRATCH_INDEX, "_id": c["chunk_id"], "_source": c}
+                for c in _corpus(args.long_doc_chunks, args.short_docs)
+            ),
+            refresh="wait_for",
+        )
+
+        source = ["doc_id", "doc_title", "chunk_text"]
+        over = client.search(
+            index=SCRATCH_INDEX,
+            body={"size": args.top_k * 5, "query": _multi_match(), "_source": source},
+        )
+        collapsed = client.search(
+            index=SCRATCH_INDEX,
+            body={
+                "size": args.top_k,
+                "collapse": {"field": "doc_id"},
+                "track_total_hits": False,
+                "query": _multi_match(),
+                "_source": source,
+            },
+        )
+    finally:
+        client.indices.delete(index=SCRATCH_INDEX, ignore=[404])
+
+    over_docs = {h["_source"]["doc_id"] for h in over["hits"]["hits"]}
+    collapsed_ids = [h["_source"]["doc_id"] for h in collapsed["hits"]["hits"]]
+    print(
+        f"Skewed corpus: 1 document x {args.long_doc_chunks} chunks "
+        f"+ {args.short_docs} single-chunk documents, top_k={args.top_k}"
+    )
+    print(
+        f"  over-fetch: {len(over_docs):2d} distinct docs, "
+        f"{len(json.dumps(over)):7d} response bytes"
+    )
+    print(
+        f"  collapse:   {len(set(collapsed_ids)):2d} distinct docs, "
+        f"{len(json.dumps(collapsed)):7d} response bytes"
+    )
+
+    expected = min(args.top_k, args.short_docs + 1)
+    if len(collapsed_ids) != expected or len(set(collapsed_ids)) != expected:
+        print(f"FAIL: expected exactly {expected} distinct documents")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Calls and response size: in-context filtering vs filters and facet_counts.
+
+Answers a few structured questions the way agents did before filters —
+broad search_chunks calls whose results are filtered and counted in the
+model's context — and with the filters parameter / facet_counts tool, and
+reports tool calls, JSON bytes returned (~tokens at 4 characters each)
+and whether the answer is right.
+
+Run against the memory backend (no services) or OpenSearch seeded by
+seed/opensearch/seed.sh.
+
+Usage (from poc/mcp-servers/strategy-review):
+
+    SEARCH_BACKEND=memory uv run python benchmarks/bench_facets.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from collections import Counter
+from typing import Any
+
+# Every call must hit the backend — set before the server is imported.
+os.environ["QUERY_CACHE_SIZE"] = "0"
+
+from strategy_review_mcp.server import (
+    _close_clients,
+    facet_counts,
+    search_chunks,
+)
+
+# How broad an in-context search has to be to see everything it filters.
+BROAD_TOP_K = 50
+
+
+class _Transcript:
+    """Tool calls an agent made and the bytes they put in its context."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.bytes = 0
+
+    async def __call__(self, tool: Any, *args: Any, **kwargs: Any) -> Any:
+        result = await tool(*args, **kwargs)
+        self.calls += 1
+        self.bytes += len(json.dumps(result, ensure_ascii=False))
+        return result
+
+
+async def _themes_in_context(doc_id: str) -> tuple[_Transcript, dict[str, int]]:
+    """Count themes over the chunks a broad search of the document returns."""
+    t = _Transcript()
+    results = await t(search_chunks, "health", doc_id=doc_id, top_k=BROAD_TOP_K)
+    return t, dict(Counter(theme for r in results for theme in r["themes"]))
+
+
+async def _themes_faceted(doc_id: str) -> tuple[_Transcript, dict[str, int]]:
+    t = _Transcript()
+    result = await t(facet_counts, doc_id=doc_id, facets=["themes"])
+    return t, {f["value"]: f["chunks"] for f in result["facets"]["themes"]}
+
+
+async def _filter_in_context(
+    query: str, filters: dict[str, Any], top_k: int
+) -> tuple[_Transcript, list[str]]:
+    """Broad search, then keep the chunks matching the filters in context."""
+    t = _Transcript()
+    results = await t(
+        search_chunks,
+        query,
+        top_k=BROAD_TOP_K,
+        fields=["doc_title", "snippet", "themes", "countries", "page_number"],
+    )
+    kept = [
+        r["chunk_id"]
+        for r in results
+        if set(r["themes"]) & set(filters.get("themes", r["themes"]))
+        and set(r["countries"]) & set(filters.get("countries", r["countries"]))
+    ]
+    return t, kept[:top_k]
+
+
+async def _filter_param(
+    query: str, filters: dict[str, Any], top_k: int
+) -> tuple[_Transcript, list[str]]:
+    t = _Transcript()
+    results = await t(
+        search_chunks,
+        query,
+        top_k=top_k,
+        filters=filters,
+        fields=["doc_title", "snippet", "page_number"],
+    )
+    return t, [r["chunk_id"] for r in results]
+
+
+def _row(label: str, t: _Transcript, ok: bool) -> None:
+    print(f"  {label:<22}{t.calls:>6}{t.bytes:>9}{t.bytes // 4:>9}   {ok}")
+
+
+async def _main() -> None:
+    print(f"  {'':<22}{'calls':>6}{'bytes':>9}{'~tokens':>9}   same answer")
+    for doc_id in ("GE_2023", "GH_2024"):
+        print(f"Which themes does {doc_id} cover and how heavily?")
+        t_ctx, ctx_counts = await _themes_in_context(doc_id)
+        t_fac, fac_counts = await _themes_faceted(doc_id)
+        _row("in-context counting", t_ctx, ctx_counts == fac_counts)
+        _row("facet_counts", t_fac, True)
+
+    for query, filters in (
+        ("treatment coverage", {"countries": ["NGA"]}),
+        ("health", {"themes": ["TB"], "countries": ["IND"]}),
+    ):
+        print(f"Top 3 for {query!r} with {filters}:")
+        t_ctx, ctx_ids = await _filter_in_context(query, filters, 3)
+        t_par, par_ids = await _filter_param(query, filters, 3)
+        _row("in-context filtering", t_ctx, ctx_ids == par_ids)
+        _row("filters parameter", t_par, True)
+    await _close_clients()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,138 @@
+"""Query retries per answer: BM25 vs hybrid (BM25 + kNN with RRF).
+
+Simulates an agent answering a set of information needs over the seed
+corpus. Each need has a few phrasings, from how a user would ask it to the
+corpus's own vocabulary; the agent tries them in order through
+search_chunks and stops at the first one that puts a relevant chunk in the
+top --top-k. Retries are the extra phrasings needed; a need is unanswered
+if no phrasing works.
+
+The search result cache is disabled so every call reaches the backend.
+Run against the memory backend (no services) or OpenSearch seeded by
+seed/opensearch/seed.sh; both need the fitted embedding model.
+
+Usage (from poc/mcp-servers/strategy-review):
+
+    SEARCH_BACKEND=memory uv run python benchmarks/bench_hybrid_retries.py
+    uv run python benchmarks/bench_hybrid_retries.py --top-k 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+# Every call must hit the backend — set before the server is imported.
+os.environ["QUERY_CACHE_SIZE"] = "0"
+
+from strategy_review_mcp.server import _close_clients, search_chunks
+
+# (phrasings, most natural first; relevant chunk ids)
+NEEDS: list[tuple[list[str], set[str]]] = [
+    (
+        ["mothers dying in childbirth", "maternal deaths", "maternal mortality"],
+        {"GH_2024_002", "GE_2023_002", "GE_2023_004"},
+    ),
+    (
+        ["bed nets against mosquitoes", "insecticide nets", "malaria prevention"],
+        {"GH_2024_004"},
+    ),
+    (
+        ["childhood immunization rates", "vaccination coverage", "DTP3 coverage"],
+        {"GH_2024_006"},
+    ),
+    (
+        ["TB drugs stop working", "drug resistant TB", "MDR-TB rifampicin"],
+        {"TB_2025_002"},
+    ),
+    (
+        ["electronic patient records", "digital health information system"],
+        {"GH_2024_007"},
+    ),
+    (
+        ["money earmarked for women", "gender budget", "gender-responsive budgeting"],
+        {"GE_2023_003"},
+    ),
+    (
+        ["teenage brides", "adolescent girls child marriage"],
+        {"GE_2023_002"},
+    ),
+    (
+        ["new vaccines against tuberculosis", "TB vaccine candidate M72"],
+        {"TB_2025_004"},
+    ),
+    (
+        ["patients with both TB and HIV", "TB-HIV co-infection"],
+        {"TB_2025_003", "GH_2024_003", "GH_2024_005"},
+    ),
+    (
+        ["undiagnosed tuberculosis", "case notification gap", "missing millions"],
+        {"TB_2025_001"},
+    ),
+    (
+        ["pregnant women cannot get to a hospital", "emergency obstetric care"],
+        {"GE_2023_004", "GH_2024_002"},
+    ),
+    (
+        ["antiretroviral treatment scale-up", "ART coverage 95-95-95"],
+        {"GH_2024_003"},
+    ),
+]
+
+
+async def _answer(
+    phrasings: list[str], relevant: set[str], mode: str, top_k: int
+) -> tuple[int | None, list[float]]:
+    """Attempts needed (None if unanswered) and the latency of each call."""
+    latencies = []
+    for attempt, query in enumerate(phrasings, start=1):
+        start = time.perf_counter()
+        results = await search_chunks(query, top_k=top_k, mode=mode)
+        latencies.append(time.perf_counter() - start)
+        if results and "error" in results[0]:
+            raise SystemExit(f"{mode} search failed: {results[0]['error']}")
+        if relevant & {r["chunk_id"] for r in results}:
+            return attempt, latencies
+    return None, latencies
+
+
+async def _main(top_k: int, verbose: bool) -> None:
+    print(f"{len(NEEDS)} information needs, relevant chunk in top {top_k}")
+    print(
+        f"{'mode':<8}{'1st try':>9}{'answered':>10}{'retries/answer':>16}"
+        f"{'calls':>7}{'median ms':>11}"
+    )
+    for mode in ("bm25", "hybrid"):
+        first, answered, retries, calls, latencies = 0, 0, [], 0, []
+        for phrasings, relevant in NEEDS:
+            attempts, times = await _answer(phrasings, relevant, mode, top_k)
+            calls += len(times)
+            latencies.extend(times)
+            if attempts is not None:
+                answered += 1
+                first += attempts == 1
+                retries.append(attempts - 1)
+            if verbose:
+                status = f"attempt {attempts}" if attempts else "unanswered"
+                print(f"  {mode:<7} {phrasings[0]!r}: {status}")
+        print(
+            f"{mode:<8}{first:>6}/{len(NEEDS):<2}{answered:>7}/{len(NEEDS):<2}"
+            f"{statistics.mean(retries) if retries else 0:>16.2f}{calls:>7}"
+            f"{statistics.median(latencies) * 1000:>11.2f}"
+        )
+    await _close_clients()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(_main(args.top_k, args.verbose))
+
+
+if __name__ == "__main__":
+    main()
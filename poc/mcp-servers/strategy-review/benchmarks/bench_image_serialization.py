@@ -0,0 +1,136 @@
+"""Serialization cost of returning a page image: JSON dict vs MCP image block.
+
+Runs one image through FastMCP's result conversion and the JSON-RPC framing
+the stdio transport writes, two ways:
+
+  - before: the previous get_page_image shape — a dict with an
+            ``image_base64`` field, which FastMCP serializes into a JSON text
+            block (and, for a dict return type, again as structuredContent).
+  - after:  the current shape — a small JSON metadata text block plus a
+            native ImageContent block.
+
+Reports wire bytes, median time and tracemalloc peak memory per image. No
+backing services are needed; the image is synthesized or read from disk.
+
+Usage (from poc/mcp-servers/strategy-review):
+
+    uv run python benchmarks/bench_image_serialization.py --width 1654 --height 2339
+    uv run python benchmarks/bench_image_serialization.py --image page_001.png
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import io
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+from mcp.server.fastmcp import FastMCP
+from mcp.types import CallToolResult, ContentBlock, ImageContent, JSONRPCResponse
+from PIL import Image
+
+from strategy_review_mcp.server import _json_block
+
+
+def _synthetic_page(width: int, height: int) -> bytes:
+    """A noisy grayscale page — compresses about as badly as a scanned page."""
+    img = Image.effect_noise((width, height), 64)
+    out = io.BytesIO()
+    img.save(out, format="PNG")
+    return out.getvalue()
+
+
+def _build_server(image_bytes: bytes) -> FastMCP:
+    server = FastMCP("bench")
+
+    @server.tool()
+    async def before(doc_id: str, page_num: int) -> dict[str, Any]:
+        return {
+            "doc_id": doc_id,
+            "page_num": page_num,
+            "image_base64": base64.b64encode(image_bytes).decode("utf-8"),
+            "content_type": "image/png",
+        }
+
+    @server.tool(structured_output=False)
+    async def after(doc_id: str, page_num: int) -> list[ContentBlock]:
+        return [
+            _json_block(
+                {
+                    "doc_id": doc_id,
+                    "page_num": page_num,
+                    "content_type": "image/png",
+                    "bytes": len(image_bytes),
+                }
+            ),
+            ImageContent(
+                type="image",
+                data=base64.b64encode(image_bytes).decode("ascii"),
+                mimeType="image/png",
+            ),
+        ]
+
+    return server
+
+
+async def _wire_message(server: FastMCP, tool: str) -> str:
+    """Call a tool and frame its result exactly as the stdio transport does."""
+    converted = await server.call_tool(tool, {"doc_id": "GH_2024", "page_num": 1})
+    if isinstance(converted, tuple):
+        content, structured = converted
+    else:
+        content, structured = converted, None
+    result = CallToolResult(content=list(content), structuredContent=structured)
+    response = JSONRPCResponse(
+        jsonrpc="2.0",
+        id=1,
+        result=result.model_dump(by_alias=True, mode="json", exclude_none=True),
+    )
+    return response.model_dump_json(by_alias=True, exclude_none=True)
+
+
+async def _measure(server: FastMCP, tool: str, rounds: int) -> tuple[int, float, int]:
+    size = len(await _wire_message(server, tool))
+    times, peaks = [], []
+    for _ in range(rounds):
+        tracemalloc.start()
+        start = time.perf_counter()
+        await _wire_message(server, tool)
+        times.append(time.perf_counter() - start)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return size, statistics.median(times), max(peaks)
+
+
+async def _main(image_bytes: bytes, rounds: int) -> None:
+    server = _build_server(image_bytes)
+    print(f"image: {len(image_bytes) / 1024:.1f} KiB, {rounds} rounds")
+    print(f"{'shape':<10}{'wire KiB':>10}{'median ms':>11}{'peak MiB':>10}")
+    for tool in ("before", "after"):
+        size, median, peak = await _measure(server, tool, rounds)
+        print(
+            f"{tool:<10}{size / 1024:>10.1f}{median * 1000:>11.2f}{peak / 2**20:>10.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--image", type=Path, help="PNG to use instead of noise")
+    parser.add_argument("--width", type=int, default=1654)
+    parser.add_argument("--height", type=int, default=2339)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    if args.image is not None:
+        image_bytes = args.image.read_bytes()
+    else:
+        image_bytes = _synthetic_page(args.width, args.height)
+    asyncio.run(_main(image_bytes, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
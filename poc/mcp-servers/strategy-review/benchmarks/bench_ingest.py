@@ -0,0 +1,174 @@
+"""Ingestion throughput: full loads and incremental re-runs.
+
+Generates a synthetic corpus (--docs documents of --pages pages, about 100k
+chunks by default) from the seed chunk texts and times the ingest pipeline
+on it:
+
+  - pipeline:     read, chunk, hash and embed into a bulk NDJSON file
+                  (--output mode; no services needed)
+  - full load:    into a scratch index with one bulk thread, then --threads
+  - re-run:       the same input again (every chunk unchanged)
+  - 1% changed:   one document in a hundred edited
+
+The index stages need OpenSearch (--url); without it only the pipeline is
+timed. The scratch index is deleted afterwards.
+
+Usage (from poc/mcp-servers/strategy-review):
+
+    uv run python benchmarks/bench_ingest.py
+    uv run python benchmarks/bench_ingest.py --url http://localhost:9200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from opensearchpy import OpenSearch
+from opensearchpy.exceptions import ConnectionError as OpenSearchConnectionError
+
+from strategy_review_mcp.embeddings import LsaEncoder, embedding_text
+from strategy_review_mcp.ingest import (
+    DEFAULT_CHUNK_CHARS,
+    IngestStats,
+    ingest,
+    iter_chunks,
+    write_bulk_file,
+)
+
+SEED_CHUNKS = Path(__file__).resolve().parents[3] / "seed" / "opensearch"
+SEED_CHUNKS /= "chunks.ndjson"
+
+SCRATCH_INDEX = "strategy-chunks-bench-ingest"
+
+
+def _seed_chunks() -> list[dict[str, Any]]:
+    lines = [json.loads(line) for line in SEED_CHUNKS.read_text().splitlines()]
+    return [obj for obj in lines if "chunk_text" in obj]
+
+
+def _write_corpus(path: Path, docs: int, pages: int, edited: set[int]) -> None:
+    """Documents of ``pages`` pages, each page about three chunks long."""
+    sentences = [
+        s.strip() + "."
+        for chunk in _seed_chunks()
+        for s in chunk["chunk_text"].split(".")
+        if s.strip()
+    ]
+    rng = random.Random(0)
+    with open(path, "w", encoding="utf-8") as f:
+        for d in range(docs):
+            doc_pages = []
+            for p in range(1, pages + 1):
+                paragraphs = [" ".join(rng.choices(sentences, k=4)) for _ in range(4)]
+                if d in edited and p == 1:
+                    paragraphs[0] = "Revised: " + paragraphs[0]
+                doc_pages.append({"page_number": p, "text": "\n\n".join(paragraphs)})
+            doc = {
+                "doc_id": f"SYN_{d:05d}",
+                "doc_title": f"Synthetic strategy {d}",
+                "doc_year": 2015 + d % 10,
+                "organization": "Synthetic",
+                "themes": ["HIV", "TB", "Malaria"][d % 3 : d % 3 + 1],
+                "pages": doc_pages,
+            }
+            f.write(json.dumps(doc) + "\n")
+
+
+def _report(label: str, stats: IngestStats, elapsed: float) -> None:
+    print(
+        f"{label:<16}{elapsed:>8.1f}{stats.read / elapsed:>10.0f}"
+        f"{stats.indexed:>9}{stats.unchanged:>11}{stats.deleted:>9}"
+    )
+
+
+def _create_scratch_index(client: OpenSearch, dims: int) -> None:
+    mapping = json.loads(
+        (SEED_CHUNKS.parent / "create-index.sh")
+        .read_text()
+        .split("-d '", 1)[1]
+        .split("}'", 1)[0]
+        + "}"
+    )
+    mapping["mappings"]["properties"]["chunk_vector"]["dimension"] = dims
+    client.indices.delete(index=SCRATCH_INDEX, ignore_unavailable=True)
+    client.indices.create(index=SCRATCH_INDEX, body=mapping)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--pages", type=int, default=18)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--url", help="OpenSearch URL for the index stages")
+    args = parser.parse_args()
+
+    seed = _seed_chunks()
+    encoder = LsaEncoder.fit([embedding_text(c) for c in seed])
+    salt = b"bench"
+    print(
+        f"{'stage':<16}{'seconds':>8}{'chunks/s':>10}{'indexed':>9}"
+        f"{'unchanged':>11}{'deleted':>9}"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = Path(tmp) / "docs.ndjson"
+        _write_corpus(corpus, args.docs, args.pages, set())
+
+        start = time.perf_counter()
+        stats = write_bulk_file(
+            Path(tmp) / "bulk.ndjson",
+            iter_chunks([str(corpus)], DEFAULT_CHUNK_CHARS),
+            SCRATCH_INDEX,
+            encoder=encoder,
+            salt=salt,
+        )
+        _report("pipeline", stats, time.perf_counter() - start)
+        if args.url is None:
+            return
+
+        client = OpenSearch(
+            hosts=[args.url],
+            http_auth=("admin", "admin"),
+            verify_certs=False,
+            timeout=120,
+            pool_maxsize=args.threads,
+        )
+        try:
+            client.info()
+        except OpenSearchConnectionError:
+            raise SystemExit(f"OpenSearch is not reachable at {args.url}")
+
+        edited = set(range(0, args.docs, 100))
+        stages = [
+            ("full, 1 thread", 1, True, set()),
+            (f"full, {args.threads} threads", args.threads, True, set()),
+            ("re-run", args.threads, False, set()),
+            ("1% changed", args.threads, False, edited),
+        ]
+        try:
+            for label, threads, recreate, edits in stages:
+                if recreate:
+                    _create_scratch_index(client, encoder.dims)
+                _write_corpus(corpus, args.docs, args.pages, edits)
+                start = time.perf_counter()
+                stats = ingest(
+                    client,
+                    SCRATCH_INDEX,
+                    iter_chunks([str(corpus)], DEFAULT_CHUNK_CHARS),
+                    encoder=encoder,
+                    salt=salt,
+                    threads=threads,
+                )
+                _report(label, stats, time.perf_counter() - start)
+        finally:
+            client.indices.delete(index=SCRATCH_INDEX, ignore_unavailable=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,594 @@
+"""Load test: the MCP server over stdio or HTTP, driven like the web app.
+
+Starts strategy-review-mcp as a child process speaking MCP over stdio (as
+web/lib/mcp-manager.ts does by default) or Streamable HTTP, replays a mix
+of search, chunk context, facet and page image calls built from the terms,
+chunk ids and pages of the seed data at a fixed concurrency, and reports
+throughput and client-side p50/p95/p99 per tool, followed by the server's
+own stage breakdown from server_stats.
+
+--sessions N stands for N web workers. Over stdio (--transport stdio) each
+gets its own server process, as each worker spawns one today; with
+--transport http they all connect to one shared Streamable HTTP server.
+The calls are spread over the sessions.
+
+Two stacks:
+
+  - fake (default): no services. The server searches with the in-process
+    memory backend and reads page images from a stand-in blob service
+    (served from seed/azurite by this process, with ETags and an optional
+    --blob-latency-ms), so it runs on an offline CI box.
+  - docker: whatever OPENSEARCH_URL / AZURE_STORAGE_BLOB_ENDPOINT point at
+    (the docker-compose stack by default), seeded by the seed scripts.
+
+Queries repeat with a Zipf-like skew over --distinct-queries, so the search
+cache sees a realistic hit rate; --no-cache turns it off. The page cache
+starts empty on every run.
+
+To catch regressions, --save writes the results as JSON and a later run
+with --baseline compares against them, exiting 1 when a tool's p99 grows
+or the throughput drops by more than --tolerance.
+
+Usage (from poc/mcp-servers/strategy-review):
+
+    uv run python benchmarks/bench_load.py --requests 2000 --concurrency 16
+    uv run python benchmarks/bench_load.py --save /tmp/base.json
+    uv run python benchmarks/bench_load.py --baseline /tmp/base.json
+    uv run python benchmarks/bench_load.py --stack docker --mix search_chunks=1
+    uv run python benchmarks/bench_load.py --transport http --sessions 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import socket
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.exceptions import McpError
+from mcp.types import (
+    CallToolRequest,
+    CallToolRequestParams,
+    CallToolResult,
+    ClientRequest,
+    TextContent,
+)
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+SEED_DIR = PROJECT_DIR.parents[1] / "seed"
+CONTAINER = "strategy-pages"
+
+DEFAULT_MIX = {
+    "search_chunks": 35,
+    "search_documents": 20,
+    "get_chunk_context": 10,
+    "facet_counts": 10,
+    "get_page_image": 20,
+    "get_page_images": 5,
+}
+
+_STOPWORDS = frozenset(
+    {
+        "also",
+        "been",
+        "from",
+        "have",
+        "into",
+        "more",
+        "over",
+        "such",
+        "than",
+        "that",
+        "their",
+        "these",
+        "this",
+        "through",
+        "with",
+        "will",
+        "which",
+        "while",
+        "where",
+        "within",
+        "across",
+        "including",
+    }
+)
+
+Call = tuple[str, dict[str, Any]]
+
+
+# ---------------------------------------------------------------------------
+# Workload
+# ---------------------------------------------------------------------------
+
+
+def _seed_chunks() -> list[dict[str, Any]]:
+    lines = (SEED_DIR / "opensearch" / "chunks.ndjson").read_text().splitlines()
+    return [c for c in map(json.loads, lines) if "chunk_text" in c]
+
+
+def _seed_pages() -> dict[str, list[int]]:
+    """Page numbers with a seeded image, per document."""
+    pages: dict[str, list[int]] = defaultdict(list)
+    for png in sorted((SEED_DIR / "azurite").glob("*/page_*.png")):
+        pages[png.parent.name].append(int(png.stem.split("_")[1]))
+    return dict(pages)
+
+
+def build_workload(
+    n: int, mix: dict[str, float], distinct_queries: int, seed: int
+) -> list[Call]:
+    """``n`` tool calls drawn from ``mix`` over the seed data."""
+    rng = random.Random(seed)
+    chunks = _seed_chunks()
+    pages = _seed_pages()
+    terms = [
+        term
+        for term, _ in Counter(
+            token
+            for c in chunks
+            for token in re.findall(r"[a-z]{4,}", c["chunk_text"].lower())
+            if token not in _STOPWORDS
+        ).most_common(200)
+    ]
+    queries = [
+        " ".join(rng.sample(terms, rng.randint(1, 3))) for _ in range(distinct_queries)
+    ]
+    query_weights = [1 / (i + 1) for i in range(len(queries))]
+    doc_ids = sorted({c["doc_id"] for c in chunks})
+
+    def query() -> str:
+        return rng.choices(queries, query_weights)[0]
+
+    def page_image() -> dict[str, Any]:
+        doc_id = rng.choice(sorted(pages))
+        args = {"doc_id": doc_id, "page_num": rng.choice(pages[doc_id])}
+        if rng.random() < 0.5:
+            args.update(max_width=1024, format="webp")
+        return args
+
+    def page_images() -> dict[str, Any]:
+        doc_id = rng.choice(sorted(pages))
+        return {"doc_id": doc_id, "pages": pages[doc_id][:4], "max_width": 1024}
+
+    def search_chunks() -> dict[str, Any]:
+        args: dict[str, Any] = {"query": query(), "top_k": 5}
+        if rng.random() < 0.3:
+            args["doc_id"] = rng.choice(doc_ids)
+        return args
+
+    makers = {
+        "search_chunks": search_chunks,
+        "search_documents": lambda: {"query": query(), "top_k": 5},
+        "get_chunk_context": lambda: {
+            "chunk_id": rng.choice(chunks)["chunk_id"],
+            "before": 1,
+            "after": 1,
+        },
+        "facet_counts": lambda: {
+            "query": query(),
+            "facets": ["themes", "countries"],
+        },
+        "get_page_image": page_image,
+        "get_page_images": page_images,
+    }
+    tools = rng.choices(list(mix), list(mix.values()), k=n)
+    return [(tool, makers[tool]()) for tool in tools]
+
+
+# ---------------------------------------------------------------------------
+# Stand-in blob service (fake stack)
+# ---------------------------------------------------------------------------
+
+
+async def start_fake_blob_service(latency: float) -> tuple[web.AppRunner, str]:
+    """Serve seed/azurite as the page container on a free local port.
+
+    Implements what the server's downloads need: GET (whole or ranged) with
+    an ETag, 304 for a matching If-None-Match, and BlobNotFound errors; and
+    the container properties its pre-warm requests.
+    """
+    blobs = {}
+    for png in (SEED_DIR / "azurite").glob("*/*.png"):
+        data = png.read_bytes()
+        etag = '"0x' + hashlib.sha256(data).hexdigest()[:16].upper() + '"'
+        blobs[f"{png.parent.name}/{png.name}"] = (data, etag)
+
+    async def get_blob(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        name = request.match_info["name"]
+        if name not in blobs:
+            return web.Response(
+                status=404,
+                headers={"x-ms-error-code": "BlobNotFound"},
+                text="<?xml version='1.0' encoding='utf-8'?><Error>"
+                "<Code>BlobNotFound</Code>"
+                "<Message>The specified blob does not exist.</Message></Error>",
+                content_type="application/xml",
+            )
+        data, etag = blobs[name]
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        headers = {
+            "ETag": etag,
+            "Content-Type": "image/png",
+            "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT",
+            "x-ms-blob-type": "BlockBlob",
+        }
+        byte_range = request.headers.get("x-ms-range") or request.headers.get("Range")
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", byte_range or "")
+        if match is None:
+            return web.Response(body=data, headers=headers)
+        first = int(match[1])
+        last = min(int(match[2] or len(data) - 1), len(data) - 1)
+        headers["Content-Range"] = f"bytes {first}-{last}/{len(data)}"
+        return web.Response(status=206, body=data[first : last + 1], headers=headers)
+
+    async def get_container(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        return web.Response(
+            headers={
+                "ETag": '"0x1"',
+                "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT",
+            }
+        )
+
+    app = web.Application()
+    app.router.add_get(f"/devstoreaccount1/{CONTAINER}", get_container)
+    app.router.add_get(f"/devstoreaccount1/{CONTAINER}/{{name:.+}}", get_blob)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    return runner, f"http://127.0.0.1:{port}/devstoreaccount1"
+
+
+# ---------------------------------------------------------------------------
+# Driving the server
+# ---------------------------------------------------------------------------
+
+
+async def _call_tool(
+    session: ClientSession, tool: str, args: dict[str, Any]
+) -> CallToolResult:
+    """tools/call without ClientSession.call_tool's client-side JSON Schema
+    validation of the result (about 4 ms a call in Python, far more than
+    the web app's compiled validator), which would swamp the server time."""
+    request = CallToolRequest(params=CallToolRequestParams(name=tool, arguments=args))
+    return await session.send_request(ClientRequest(request), CallToolResult)
+
+
+def _is_error(result: CallToolResult) -> bool:
+    if result.isError:
+        return True
+    first = result.content[0] if result.content else None
+    if not isinstance(first, TextContent):
+        return False
+    try:
+        value = json.loads(first.text)
+    except ValueError:
+        return False
+    return isinstance(value, dict) and "error" in value
+
+
+async def _replay(
+    sessions: list[ClientSession], calls: list[Call], concurrency: int
+) -> tuple[list[tuple[str, float, bool]], float]:
+    """Run ``calls`` on ``concurrency`` workers spread over the sessions;
+    (tool, seconds, error) per call."""
+    samples: list[tuple[str, float, bool]] = []
+    queue = iter(calls)
+
+    async def worker(session: ClientSession) -> None:
+        for tool, args in queue:
+            start = time.perf_counter()
+            try:
+                error = _is_error(await _call_tool(session, tool, args))
+            except McpError:
+                error = True
+            samples.append((tool, time.perf_counter() - start, error))
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(worker(sessions[i % len(sessions)]) for i in range(concurrency))
+    )
+    return samples, time.perf_counter() - start
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted ``values``."""
+    return values[min(len(values) - 1, max(0, round(q * len(values)) - 1))]
+
+
+def summarize(
+    samples: list[tuple[str, float, bool]], elapsed: float
+) -> dict[str, dict[str, float]]:
+    by_tool: dict[str, list[tuple[float, bool]]] = defaultdict(list)
+    for tool, seconds, error in samples:
+        by_tool[tool].append((seconds, error))
+        by_tool["all"].append((seconds, error))
+    results = {}
+    for tool, rows in sorted(by_tool.items(), key=lambda kv: kv[0] == "all"):
+        latencies = sorted(s for s, _ in rows)
+        results[tool] = {
+            "calls": len(rows),
+            "errors": sum(e for _, e in rows),
+            "rps": len(rows) / elapsed,
+            **{f"p{q}": _percentile(latencies, q / 100) * 1000 for q in (50, 95, 99)},
+            "max": latencies[-1] * 1000,
+        }
+    return results
+
+
+def _print_results(results: dict[str, dict[str, float]]) -> None:
+    print(
+        f"{'tool':<20}{'calls':>7}{'errors':>7}{'req/s':>9}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+    )
+    for tool, r in results.items():
+        print(
+            f"{tool:<20}{r['calls']:>7}{r['errors']:>7}{r['rps']:>9.1f}"
+            f"{r['p50']:>9.2f}{r['p95']:>9.2f}{r['p99']:>9.2f}{r['max']:>9.2f}"
+        )
+
+
+def _print_server_stages(stats: dict[str, Any]) -> None:
+    print("\nserver-side p99 ms by stage (server_stats):")
+    for tool, s in stats["tools"].items():
+        stages = "  ".join(
+            f"{stage} {summary['p99']:.2f}" for stage, summary in s["stages_ms"].items()
+        )
+        print(f"  {tool:<20}total {s['latency_ms'].get('p99', 0):.2f}  {stages}")
+    caches = stats["caches"]
+    rates = {name: c["hit_rate"] for name, c in caches.items() if c and "hit_rate" in c}
+    print("  cache hit rates: " + ", ".join(f"{k} {v:.0%}" for k, v in rates.items()))
+    coalesced = {name: f["coalesced"] for name, f in caches["coalescing"].items()}
+    print("  coalesced calls: " + ", ".join(f"{k} {v}" for k, v in coalesced.items()))
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """Regressions of p99 per tool and of overall throughput."""
+    regressions = []
+    for tool, r in results.items():
+        base = baseline.get(tool)
+        if base is None:
+            continue
+        if r["p99"] > base["p99"] * (1 + tolerance):
+            regressions.append(
+                f"{tool}: p99 {r['p99']:.2f} ms vs {base['p99']:.2f} ms baseline"
+            )
+    if "all" in baseline and results["all"]["rps"] < baseline["all"]["rps"] * (
+        1 - tolerance
+    ):
+        regressions.append(
+            f"throughput {results['all']['rps']:.1f} req/s "
+            f"vs {baseline['all']['rps']:.1f} req/s baseline"
+        )
+    return regressions
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+
+def _server_cpu_seconds() -> float | None:
+    """CPU time used so far by this process's children (the servers), read
+    from /proc; None where there is no /proc. Unlike latency, this is not
+    skewed by the client competing for the same cores."""
+    proc = Path("/proc")
+    if not (proc / "self" / "stat").exists():
+        return None
+    ticks = os.sysconf("SC_CLK_TCK")
+    total = 0
+    for stat in proc.glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == os.getpid():  # ppid
+            total += int(fields[11]) + int(fields[12])  # utime + stime
+    return total / ticks
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _start_http_server(
+    stack: AsyncExitStack, env: dict[str, str], errlog: Any
+) -> str:
+    """Start one server with --transport http; return its MCP URL once up."""
+    port = _free_port()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "strategy_review_mcp.server",
+        "--transport",
+        "http",
+        "--port",
+        str(port),
+        env=env,
+        cwd=PROJECT_DIR,
+        stdout=errlog,
+        stderr=errlog,
+    )
+
+    async def stop() -> None:
+        process.terminate()
+        await process.wait()
+
+    stack.push_async_callback(stop)
+    for _ in range(300):
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            if process.returncode is not None:
+                raise SystemExit("The HTTP server exited; see --server-log")
+            await asyncio.sleep(0.05)
+            continue
+        writer.close()
+        return f"http://127.0.0.1:{port}/mcp"
+    raise SystemExit("The HTTP server did not start listening")
+
+
+async def _connect(
+    stack: AsyncExitStack,
+    args: argparse.Namespace,
+    env: dict[str, str],
+    errlog: Any,
+) -> list[ClientSession]:
+    """Open --sessions initialized client sessions."""
+    if args.transport == "http":
+        url = await _start_http_server(stack, env, errlog)
+        transports = [streamablehttp_client(url) for _ in range(args.sessions)]
+    else:
+        server = StdioServerParameters(
+            command=sys.executable,
+            args=["-m", "strategy_review_mcp.server"],
+            env=env,
+            cwd=PROJECT_DIR,
+        )
+        transports = [stdio_client(server, errlog=errlog) for _ in range(args.sessions)]
+
+    async def open_session(transport: Any) -> ClientSession:
+        read, write, *_ = await stack.enter_async_context(transport)
+        session = await stack.enter_async_context(ClientSession(read, write))
+        await session.initialize()
+        return session
+
+    # One at a time: AsyncExitStack is not safe to enter concurrently.
+    return [await open_session(t) for t in transports]
+
+
+def _parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        tool, _, weight = part.partition("=")
+        if tool not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(
+                f"unknown tool {tool!r}; choose from {', '.join(DEFAULT_MIX)}"
+            )
+        mix[tool] = float(weight or 1)
+    return mix
+
+
+async def _main(args: argparse.Namespace, errlog: Any) -> dict[str, Any]:
+    calls = build_workload(
+        args.warmup + args.requests, args.mix, args.distinct_queries, args.seed
+    )
+    env = dict(os.environ)
+    runner = None
+    with tempfile.TemporaryDirectory() as page_cache:
+        env.update(PAGE_CACHE_DIR=page_cache, GRAPH_SUMMARY_REFRESH_SECONDS="0")
+        if args.no_cache:
+            env["QUERY_CACHE_SIZE"] = "0"
+        if args.stack == "fake":
+            runner, endpoint = await start_fake_blob_service(
+                args.blob_latency_ms / 1000
+            )
+            env.update(
+                SEARCH_BACKEND="memory",
+                AZURE_STORAGE_BLOB_ENDPOINT=endpoint,
+                AZURE_STORAGE_CONTAINER=CONTAINER,
+            )
+        try:
+            async with AsyncExitStack() as stack:
+                start = time.perf_counter()
+                sessions = await _connect(stack, args, env, errlog)
+                startup = time.perf_counter() - start
+                await _replay(sessions, calls[: args.warmup], args.concurrency)
+                for session in sessions:
+                    await _call_tool(session, "server_stats", {"reset": True})
+                cpu_before = _server_cpu_seconds()
+                samples, elapsed = await _replay(
+                    sessions, calls[args.warmup :], args.concurrency
+                )
+                cpu_after = _server_cpu_seconds()
+                stats = await _call_tool(sessions[0], "server_stats", {})
+        finally:
+            if runner is not None:
+                await runner.cleanup()
+
+    print(
+        f"{args.stack} stack over {args.transport}, {args.sessions} session(s), "
+        f"{args.requests} calls (+{args.warmup} warm-up), concurrency "
+        f"{args.concurrency}: {elapsed:.1f} s, ready after {startup:.1f} s"
+    )
+    results = summarize(samples, elapsed)
+    if cpu_before is not None and cpu_after is not None:
+        results["all"]["server_cpu_ms"] = (cpu_after - cpu_before) / len(samples) * 1000
+        print(f"server CPU per call: {results['all']['server_cpu_ms']:.2f} ms")
+    _print_results(results)
+    if args.transport == "stdio" and args.sessions > 1:
+        print("\n(server_stats of the first of the server processes)")
+    _print_server_stages(json.loads(stats.content[0].text))
+    return results
+
+
+def _save_and_compare(args: argparse.Namespace, results: dict[str, Any]) -> int:
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"\nno regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stack", choices=("fake", "docker"), default="fake")
+    parser.add_argument("--transport", choices=("stdio", "http"), default="stdio")
+    parser.add_argument("--sessions", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--mix",
+        type=_parse_mix,
+        default=DEFAULT_MIX,
+        help="tool=weight,... (default: %(default)s)",
+    )
+    parser.add_argument("--distinct-queries", type=int, default=300)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--blob-latency-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against a --save file")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--server-log", default=os.devnull)
+    args = parser.parse_args()
+    with open(args.server_log, "w") as errlog:
+        results = asyncio.run(_main(args, errlog))
+    sys.exit(_save_and_compare(args, results))
+
+
+if __name__ == "__main__":
+    main()
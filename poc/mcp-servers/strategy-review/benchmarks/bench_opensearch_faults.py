@@ -0,0 +1,307 @@
+"""Search tail latency under OpenSearch node faults: timeouts, retries,
+hedged requests and circuit breakers.
+
+Starts one local HTTP node per --node, each injecting its own fault in
+front of a search engine, and runs search_chunks calls at a fixed
+concurrency through the server's OpenSearchBackend pointed at all of them,
+once per client configuration:
+
+  - plain:   30 s timeout, no retries, hedging or breaker
+  - retry:   --timeout per tool, --retries with jittered backoff
+  - hedge:   retry, plus a second node after --hedge-ms
+  - breaker: hedge, plus a circuit breaker per node
+
+Each reports client-side p50/p95/p99/max, the share of calls that failed,
+and how often the policy stepped in (server_stats "search_backend").
+
+Node faults (--node, once per node; default: ok, pause:0.05:1, error:0.2):
+
+  ok                 answers normally
+  pause:P:SECONDS    with probability P, stalls first (a GC pause)
+  error:P            with probability P, answers 503
+  reset:P            with probability P, drops the connection
+  blackhole          accepts and never answers
+  down               nothing listening (connection refused)
+
+By default the nodes answer from the seed chunks with the memory
+backend's BM25 index, so no services are needed; --upstream makes them
+fault-injecting proxies in front of a real OpenSearch (e.g. the
+docker-compose one, seeded by seed/opensearch/seed.sh).
+
+Usage (from poc/mcp-servers/strategy-review):
+
+    uv run python benchmarks/bench_opensearch_faults.py
+    uv run python benchmarks/bench_opensearch_faults.py --node ok --node blackhole \\
+        --configs retry,breaker
+    uv run python benchmarks/bench_opensearch_faults.py \\
+        --upstream http://localhost:9200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from pathlib import Path
+from typing import Any
+
+from aiohttp import ClientSession, web
+
+# Every call must reach the backend — set before the server is imported.
+os.environ["QUERY_CACHE_SIZE"] = "0"
+os.environ["GRAPH_SUMMARY_REFRESH_SECONDS"] = "0"
+
+from bench_load import SEED_DIR, _free_port, build_workload
+
+from strategy_review_mcp import server
+from strategy_review_mcp.bm25 import BM25Index
+from strategy_review_mcp.search_backends import (
+    OpenSearchBackend,
+    TimedBackend,
+)
+
+INDEX = "strategy-chunks"
+
+# opensearch-py logs every request, and the tools every failed call.
+logging.getLogger("opensearch").setLevel(logging.CRITICAL)
+logging.getLogger("strategy_review_mcp").setLevel(logging.CRITICAL)
+
+
+# ---------------------------------------------------------------------------
+# Fault-injecting nodes
+# ---------------------------------------------------------------------------
+
+
+def _parse_fault(spec: str) -> tuple[str, float, float]:
+    kind, *params = spec.split(":")
+    values = [float(p) for p in params]
+    if kind in ("ok", "blackhole", "down") and not values:
+        return kind, 0.0, 0.0
+    if kind in ("error", "reset") and len(values) == 1:
+        return kind, values[0], 0.0
+    if kind == "pause" and len(values) == 2:
+        return kind, values[0], values[1]
+    raise SystemExit(f"bad fault {spec!r}; see --help")
+
+
+async def start_node(
+    fault: tuple[str, float, float],
+    index: BM25Index | None,
+    upstream: str | None,
+    latency: float,
+    rng: random.Random,
+) -> tuple[web.AppRunner | None, str]:
+    """Start one node on a free port; return its runner and URL."""
+    kind, probability, seconds = fault
+    port = _free_port()
+    if kind == "down":
+        return None, f"http://127.0.0.1:{port}"
+    client = ClientSession() if upstream else None
+
+    async def local(request: web.Request) -> web.Response:
+        assert index is not None
+        path = request.path
+        if path.startswith("/_cat/indices"):
+            rows = [{"index": INDEX, "uuid": "bench", "docs.count": str(len(index))}]
+            return web.json_response(rows)
+        try:
+            if path.endswith("/_msearch"):
+                text = await request.text()
+                bodies = [json.loads(x) for x in text.splitlines() if x][1::2]
+                responses = [index.search(body) for body in bodies]
+                return web.json_response({"took": 1, "responses": responses})
+            if path.endswith("/_search"):
+                return web.json_response(index.search(await request.json()))
+        except ValueError as e:
+            return web.json_response({"error": str(e), "status": 400}, status=400)
+        return web.json_response({"error": f"not faked: {path}"}, status=400)
+
+    async def proxy(request: web.Request) -> web.Response:
+        assert client is not None
+        headers = {
+            k: v
+            for k, v in request.headers.items()
+            if k.lower() in ("authorization", "content-type")
+        }
+        async with client.request(
+            request.method,
+            upstream + request.path_qs,
+            data=await request.read(),
+            headers=headers,
+            ssl=False,
+        ) as response:
+            return web.Response(
+                status=response.status,
+                body=await response.read(),
+                content_type="application/json",
+            )
+
+    async def handle(request: web.Request) -> web.StreamResponse:
+        await asyncio.sleep(latency * rng.uniform(0.5, 1.5))
+        if kind == "blackhole":
+            await asyncio.Event().wait()
+        if kind == "pause" and rng.random() < probability:
+            await asyncio.sleep(seconds)
+        if kind == "error" and rng.random() < probability:
+            return web.json_response({"error": "injected", "status": 503}, status=503)
+        if kind == "reset" and rng.random() < probability:
+            assert request.transport is not None
+            request.transport.close()
+            return web.Response()
+        return await (proxy(request) if upstream else local(request))
+
+    app = web.Application(client_max_size=64 * 2**20)
+    app.router.add_route("*", "/{tail:.*}", handle)
+    if client is not None:
+        app.on_cleanup.append(lambda _: client.close())
+    runner = web.AppRunner(app, access_log=None, handler_cancellation=True)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner, f"http://127.0.0.1:{port}"
+
+
+# ---------------------------------------------------------------------------
+# Client configurations
+# ---------------------------------------------------------------------------
+
+
+def configs(args: argparse.Namespace) -> dict[str, dict[str, Any]]:
+    retry = {
+        "timeout": args.timeout,
+        "retries": args.retries,
+        "backoff": args.backoff_ms / 1000,
+    }
+    hedge = {**retry, "hedge_after": args.hedge_ms / 1000}
+    return {
+        "plain": {"timeout": 30},
+        "retry": retry,
+        "hedge": hedge,
+        "breaker": {**hedge, "breaker_failures": 5, "breaker_reset": 10},
+    }
+
+
+def _is_error(result: Any) -> bool:
+    if isinstance(result, dict):
+        return "error" in result
+    return bool(result) and "error" in result[0]
+
+
+async def run(
+    urls: list[str], config: dict[str, Any], calls: list[Any], concurrency: int
+) -> tuple[list[tuple[float, bool]], dict[str, Any]]:
+    """(seconds, error) per call, and the backend's counters."""
+    backend = OpenSearchBackend(
+        ",".join(urls), "", "", INDEX, pool_maxsize=concurrency, **config
+    )
+    server._search_backend = TimedBackend(backend, server._metrics)
+    samples: list[tuple[float, bool]] = []
+    queue = iter(calls)
+
+    async def worker() -> None:
+        for _, args in queue:
+            start = time.perf_counter()
+            result = await server.search_chunks(**args)
+            samples.append((time.perf_counter() - start, _is_error(result)))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    stats = backend.stats()
+    await server._close_clients()
+    return samples, stats
+
+
+def _percentile(values: list[float], q: float) -> float:
+    return values[min(len(values) - 1, max(0, round(q * len(values)) - 1))]
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+
+async def _main(args: argparse.Namespace) -> dict[str, Any]:
+    rng = random.Random(args.seed)
+    index = None
+    if not args.upstream:
+        index = BM25Index.from_ndjson(SEED_DIR / "opensearch" / "chunks.ndjson")
+    specs = args.node or ["ok", "pause:0.05:1", "error:0.2"]
+    nodes = [
+        await start_node(
+            _parse_fault(spec), index, args.upstream, args.latency_ms / 1000, rng
+        )
+        for spec in specs
+    ]
+    urls = [url for _, url in nodes]
+    calls = build_workload(
+        args.warmup + args.requests, {"search_chunks": 1}, 300, args.seed
+    )
+    chosen = configs(args)
+    names = args.configs.split(",") if args.configs else list(chosen)
+
+    print(
+        f"{args.requests} search_chunks calls (+{args.warmup} warm-up), "
+        f"concurrency {args.concurrency}, nodes: {', '.join(specs)}"
+    )
+    print(
+        f"{'config':<9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+        f"{'errors':>8}{'retries':>9}{'hedges':>9}{'won':>6}{'fast':>6}{'opened':>8}"
+    )
+    results = {}
+    try:
+        # Imports, first searches and the like, on healthy settings.
+        await run(urls, chosen["hedge"], calls[: args.warmup], args.concurrency)
+        for name in names:
+            samples, stats = await run(
+                urls, chosen[name], calls[args.warmup :], args.concurrency
+            )
+            latencies = sorted(s * 1000 for s, _ in samples)
+            errors = sum(e for _, e in samples) / len(samples)
+            opened = sum(n["opened"] for n in stats["nodes"].values())
+            results[name] = {
+                "p50": _percentile(latencies, 0.5),
+                "p95": _percentile(latencies, 0.95),
+                "p99": _percentile(latencies, 0.99),
+                "max": latencies[-1],
+                "errors": errors,
+                **{k: v for k, v in stats.items() if k != "nodes"},
+            }
+            r = results[name]
+            print(
+                f"{name:<9}{r['p50']:>9.1f}{r['p95']:>9.1f}{r['p99']:>9.1f}"
+                f"{r['max']:>9.1f}{errors:>8.1%}{r['retries_sent']:>9}"
+                f"{r['hedges_sent']:>9}{r['hedges_won']:>6}{r['failed_fast']:>6}"
+                f"{opened:>8}"
+            )
+    finally:
+        for runner, _ in nodes:
+            if runner is not None:
+                await runner.cleanup()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--node", action="append", help="fault of one node")
+    parser.add_argument("--upstream", help="proxy to this OpenSearch instead")
+    parser.add_argument("--configs", help="comma-separated subset to run")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--timeout", type=float, default=2.0)
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--backoff-ms", type=float, default=50)
+    parser.add_argument("--hedge-ms", type=float, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    args = parser.parse_args()
+    results = asyncio.run(_main(args))
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
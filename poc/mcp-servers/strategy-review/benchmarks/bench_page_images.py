@@ -0,0 +1,85 @@
+"""Serial vs parallel multi-page fetch benchmark.
+
+Fetches the same page range of one document two ways against local Azurite:
+
+  - serial:   one get_page_image call per page, awaited in turn (what an
+              agent reviewing a section does today).
+  - parallel: a single get_page_images call, which downloads the pages
+              concurrently over the shared blob client.
+
+The local page cache is disabled so every round measures real downloads.
+Pages that are not seeded are reported as missing and still cost a round
+trip in both modes.
+
+Usage (from poc/mcp-servers/strategy-review, with Azurite seeded):
+
+    uv run python benchmarks/bench_page_images.py --doc GH_2024 --pages 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+# Measure downloads, not disk hits — must be set before the server is imported.
+os.environ["PAGE_CACHE_MAX_BYTES"] = "0"
+
+from strategy_review_mcp.server import (
+    _close_clients,
+    get_page_image,
+    get_page_images,
+)
+
+
+async def _serial(doc_id: str, pages: list[int]) -> float:
+    start = time.perf_counter()
+    for page in pages:
+        await get_page_image(doc_id, page)
+    return time.perf_counter() - start
+
+
+async def _parallel(doc_id: str, pages: list[int]) -> float:
+    start = time.perf_counter()
+    await get_page_images(doc_id, pages=pages)
+    return time.perf_counter() - start
+
+
+async def _main(doc_id: str, n_pages: int, rounds: int) -> None:
+    pages = list(range(1, n_pages + 1))
+    # The first block is the JSON summary of found / missing pages.
+    warm = json.loads((await get_page_images(doc_id, pages=pages))[0].text)
+
+    serial = [await _serial(doc_id, pages) for _ in range(rounds)]
+    parallel = [await _parallel(doc_id, pages) for _ in range(rounds)]
+    await _close_clients()
+
+    s_med = statistics.median(serial) * 1000
+    p_med = statistics.median(parallel) * 1000
+    print(
+        f"{doc_id} pages 1-{n_pages}: {len(warm['pages'])} found, "
+        f"{len(warm['missing'])} missing; {rounds} rounds (median wall-clock)"
+    )
+    rows = [
+        (f"serial   get_page_image x{n_pages}", f"{s_med:8.1f} ms"),
+        ("parallel get_page_images", f"{p_med:8.1f} ms"),
+        ("speed-up", f"{s_med / p_med:8.2f}x"),
+    ]
+    for label, value in rows:
+        print(f"  {label + ':':<32}{value}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--doc", default="GH_2024", help="document id")
+    parser.add_argument("--pages", type=int, default=10, help="pages 1..N")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds per mode")
+    args = parser.parse_args()
+    asyncio.run(_main(args.doc, args.pages, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
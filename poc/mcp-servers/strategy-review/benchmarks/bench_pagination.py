@@ -0,0 +1,167 @@
+"""Deep paging through search_chunks: growing top_k vs cursors.
+
+Scales the seed chunks up (--scale copies of each, with distinct chunk ids
+and therefore many tied scores) into a scratch NDJSON file served by the
+memory backend, then reads --pages pages of --page-size results for each
+query two ways:
+
+  - top_k:   what agents did before cursors — re-run search_chunks with
+             top_k = page * page_size and keep the last page_size results
+  - cursor:  paginate=True, then cursor=next_cursor
+
+and reports per-page latency and JSON bytes at the first, middle and last
+page. It also checks that the cursor pages are a duplicate-free,
+score-ordered partition of the full result list, and that paging stays on
+its snapshot when the NDJSON is rewritten (a reseed) between pages.
+
+Usage (from poc/mcp-servers/strategy-review; no services needed):
+
+    uv run python benchmarks/bench_pagination.py
+    uv run python benchmarks/bench_pagination.py --scale 200 --pages 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SEED_CHUNKS = Path(__file__).resolve().parents[3] / "seed" / "opensearch"
+SEED_CHUNKS /= "chunks.ndjson"
+
+QUERIES = [
+    "maternal health",
+    "tuberculosis elimination",
+    "malaria control Nigeria",
+    "community health workers",
+]
+
+
+def _write_scaled(path: Path, scale: int, keep: float = 1.0) -> int:
+    """Write ``scale`` copies of the seed chunks (the first ``keep`` share)."""
+    lines = [json.loads(line) for line in SEED_CHUNKS.read_text().splitlines()]
+    docs = [obj for obj in lines if "chunk_text" in obj]
+    docs = docs[: max(1, int(len(docs) * keep))]
+    with open(path, "w", encoding="utf-8") as f:
+        for copy in range(scale):
+            for doc in docs:
+                chunk_id = f"{doc['chunk_id']}_c{copy:04d}"
+                f.write(json.dumps({"index": {"_id": chunk_id}}) + "\n")
+                f.write(json.dumps({**doc, "chunk_id": chunk_id}) + "\n")
+    return len(docs) * scale
+
+
+def _ranked_ids(results: list[dict]) -> list[str]:
+    """Chunk ids in the cursor's total order (score desc, chunk_id asc)."""
+    return [
+        r["chunk_id"]
+        for r in sorted(results, key=lambda r: (-r["score"], r["chunk_id"]))
+    ]
+
+
+async def _timed(fn, **kwargs):
+    start = time.perf_counter()
+    result = await fn(**kwargs)
+    return result, time.perf_counter() - start
+
+
+async def _main(args: argparse.Namespace, path: Path) -> int:
+    from strategy_review_mcp.server import _close_clients, search_chunks
+
+    n = _write_scaled(path, args.scale)
+    size = args.page_size
+    print(f"{n} chunks, {len(QUERIES)} queries, {args.pages} pages of {size}")
+    await search_chunks(QUERIES[0], top_k=1)  # load outside the timed loops
+
+    marks = sorted({1, (args.pages + 1) // 2, args.pages})
+    timings = {mode: {m: [] for m in marks} for mode in ("top_k", "cursor")}
+    sizes = {mode: {m: [] for m in marks} for mode in ("top_k", "cursor")}
+    failures = 0
+
+    for query in QUERIES:
+        full = await search_chunks(query, top_k=n, fields=["score"])
+        cursor, paged = None, []
+        for page in range(1, args.pages + 1):
+            grown, t_grow = await _timed(search_chunks, query=query, top_k=page * size)
+            response, t_cur = await _timed(
+                search_chunks, query=query, top_k=size, paginate=True, cursor=cursor
+            )
+            if "error" in response:
+                raise SystemExit(f"cursor page failed: {response['error']}")
+            paged.extend(response["results"])
+            if page in marks:
+                timings["top_k"][page].append(t_grow)
+                timings["cursor"][page].append(t_cur)
+                sizes["top_k"][page].append(len(json.dumps(grown)))
+                sizes["cursor"][page].append(len(json.dumps(response)))
+            cursor = response["next_cursor"]
+            if cursor is None:
+                break
+
+        ids = [r["chunk_id"] for r in paged]
+        if len(set(ids)) != len(ids) or ids != _ranked_ids(full)[: len(ids)]:
+            failures += 1
+            print(f"INCONSISTENT pages for {query!r}")
+
+    print(
+        f"{'page':>6}{'top_k ms':>10}{'cursor ms':>11}{'top_k KB':>10}{'cursor KB':>11}"
+    )
+    for m in marks:
+        print(
+            f"{m:>6}"
+            f"{statistics.median(timings['top_k'][m]) * 1000:>10.2f}"
+            f"{statistics.median(timings['cursor'][m]) * 1000:>11.2f}"
+            f"{statistics.mean(sizes['top_k'][m]) / 1024:>10.1f}"
+            f"{statistics.mean(sizes['cursor'][m]) / 1024:>11.1f}"
+        )
+
+    # Reseed between pages: the cursor must keep serving the old snapshot.
+    query = QUERIES[0]
+    first = await search_chunks(query, top_k=size, paginate=True)
+    before = await search_chunks(query, top_k=2 * size, fields=["score"])
+    _write_scaled(path, args.scale, keep=0.5)
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+    second = await search_chunks(query, top_k=size, cursor=first["next_cursor"])
+    after = await search_chunks(query, top_k=2 * size, fields=["score"])
+    paged_ids = [r["chunk_id"] for r in first["results"] + second["results"]]
+    consistent = paged_ids == _ranked_ids(before)
+    changed = _ranked_ids(after) != paged_ids
+    print(
+        f"Reseed between pages: pages {'match' if consistent else 'DIFFER from'} "
+        f"the original snapshot; new searches "
+        f"{'see' if changed else 'do NOT see'} the reseeded data"
+    )
+    failures += not consistent
+
+    await _close_clients()
+    print(f"Consistency: {len(QUERIES) + 1 - failures}/{len(QUERIES) + 1} checks ok")
+    return 1 if failures else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "chunks.ndjson"
+        # Configure the server before it is imported.
+        os.environ.update(
+            SEARCH_BACKEND="memory",
+            MEMORY_INDEX_PATH=str(path),
+            EMBEDDING_MODEL_PATH=str(Path(tmp) / "none.npz"),
+            QUERY_CACHE_SIZE="0",
+        )
+        sys.exit(asyncio.run(_main(args, path)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Response size and latency of page image renditions.
+
+For each rendition spec, fetches the same pages through get_page_image and
+reports the serialized response size plus the latency of the first (cold)
+and subsequent (warm, cached) calls, next to the full-resolution original.
+
+A throwaway page cache directory is used so the cold numbers are real.
+
+Usage (from poc/mcp-servers/strategy-review, with Azurite seeded):
+
+    uv run python benchmarks/bench_renditions.py --doc GH_2024 --pages 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import Any
+
+# Fresh cache so the first call per spec measures download + render.
+os.environ["PAGE_CACHE_DIR"] = tempfile.mkdtemp(prefix="bench-renditions-")
+
+from strategy_review_mcp.server import _close_clients, get_page_image
+
+SPECS: list[tuple[str, dict[str, Any]]] = [
+    ("original png", {}),
+    ("webp w1024 q80", {"format": "webp", "max_width": 1024, "quality": 80}),
+    ("webp w512 q75", {"format": "webp", "max_width": 512, "quality": 75}),
+    ("jpeg w768 q70", {"format": "jpeg", "max_width": 768, "quality": 70}),
+]
+
+
+async def _measure(doc_id: str, pages: list[int], warm_rounds: int) -> None:
+    print(f"{'spec':<16}{'bytes/page':>12}{'cold ms':>10}{'warm ms':>10}")
+    for label, kwargs in SPECS:
+        sizes, cold, warm = [], [], []
+        for page in pages:
+            start = time.perf_counter()
+            result = await get_page_image(doc_id, page, **kwargs)
+            cold.append(time.perf_counter() - start)
+            if len(result) == 1:  # a lone text block is an error
+                continue
+            sizes.append(sum(len(block.model_dump_json()) for block in result))
+            for _ in range(warm_rounds):
+                start = time.perf_counter()
+                await get_page_image(doc_id, page, **kwargs)
+                warm.append(time.perf_counter() - start)
+        if not sizes:
+            print(f"{label:<16}  (no pages found)")
+            continue
+        print(
+            f"{label:<16}{statistics.mean(sizes):>12.0f}"
+            f"{statistics.median(cold) * 1000:>10.2f}"
+            f"{statistics.median(warm) * 1000:>10.3f}"
+        )
+    await _close_clients()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--doc", default="GH_2024", help="document id")
+    parser.add_argument("--pages", type=int, default=5, help="pages 1..N")
+    parser.add_argument("--warm-rounds", type=int, default=20)
+    args = parser.parse_args()
+    pages = list(range(1, args.pages + 1))
+    asyncio.run(_measure(args.doc, pages, args.warm_rounds))
+
+
+if __name__ == "__main__":
+    main()
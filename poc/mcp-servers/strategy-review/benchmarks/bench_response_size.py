@@ -0,0 +1,107 @@
+"""Response size of the search tools: full text vs snippets vs projections.
+
+Runs search_documents and search_chunks for a fixed query set with three
+field selections and reports the serialized JSON size of the results (what
+the tool returns to the model) and a rough token count (~4 characters per
+token):
+
+  - full:     every field, including the whole chunk_text of each chunk
+  - default:  the tools' defaults — highlighted snippets, no chunk_text
+  - minimal:  ids, title and snippet only
+  - budget:   every field, with max_tokens=--max-tokens (hits kept in rank
+              order while they fit, the last one cut at a sentence)
+
+The hits column is the mean number of results per call; "truncated" counts
+the results cut short to fit the budget.
+
+Run against the memory backend (no services) or OpenSearch seeded by
+seed/opensearch/seed.sh.
+
+Usage (from poc/mcp-servers/strategy-review):
+
+    SEARCH_BACKEND=memory uv run python benchmarks/bench_response_size.py
+    uv run python benchmarks/bench_response_size.py --top-k 10 --max-tokens 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+
+# Measure what the backend returns, not cached results — set before import.
+os.environ["QUERY_CACHE_SIZE"] = "0"
+
+from strategy_review_mcp.server import (
+    CHUNK_FIELDS,
+    DOCUMENT_FIELDS,
+    _close_clients,
+    search_chunks,
+    search_documents,
+)
+
+QUERIES = [
+    "maternal health",
+    "tuberculosis elimination",
+    "HIV/AIDS prevention",
+    "malaria control Nigeria",
+    "gender equality digital health",
+    "vaccine delivery",
+    "funding USD million",
+    "community health workers",
+]
+
+SELECTIONS: dict[str, dict[str, list[str] | None]] = {
+    "full": {
+        "search_documents": list(DOCUMENT_FIELDS),
+        "search_chunks": list(CHUNK_FIELDS),
+    },
+    "default": {"search_documents": None, "search_chunks": None},
+    "minimal": {
+        "search_documents": ["doc_title", "snippet"],
+        "search_chunks": ["doc_title", "snippet"],
+    },
+}
+
+TOOLS = {"search_documents": search_documents, "search_chunks": search_chunks}
+
+
+async def _main(top_k: int, max_tokens: int) -> None:
+    print(f"{len(QUERIES)} queries, top_k={top_k}; bytes and ~tokens per call")
+    print(
+        f"{'tool':<18}{'fields':<10}{'bytes':>9}{'~tokens':>9}{'vs full':>9}"
+        f"{'hits':>7}{'truncated':>11}"
+    )
+    selections = {**SELECTIONS, "budget": SELECTIONS["full"]}
+    for tool, fn in TOOLS.items():
+        full = None
+        for label, selection in selections.items():
+            budget = {"max_tokens": max_tokens} if label == "budget" else {}
+            total = hits = truncated = 0
+            for query in QUERIES:
+                results = await fn(query, top_k=top_k, fields=selection[tool], **budget)
+                if results and "error" in results[0]:
+                    raise SystemExit(f"{tool} failed: {results[0]['error']}")
+                total += len(json.dumps(results, ensure_ascii=False))
+                hits += len(results)
+                truncated += sum(bool(r.get("truncated")) for r in results)
+            per_call = total / len(QUERIES)
+            full = full or per_call
+            print(
+                f"{tool:<18}{label:<10}{per_call:>9.0f}{per_call / 4:>9.0f}"
+                f"{per_call / full:>8.0%}{hits / len(QUERIES):>7.1f}{truncated:>11}"
+            )
+    await _close_clients()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--max-tokens", type=int, default=600)
+    args = parser.parse_args()
+    asyncio.run(_main(args.top_k, args.max_tokens))
+
+
+if __name__ == "__main__":
+    main()
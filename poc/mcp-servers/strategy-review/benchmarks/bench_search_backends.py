@@ -0,0 +1,201 @@
+"""Parity and latency of the memory search backend against OpenSearch.
+
+Indexes the seed chunks into a scratch single-shard OpenSearch index, loads
+the same NDJSON into the in-memory BM25 backend, then sends both backends
+the exact bodies the search tools build:
+
+  - parity:  every query must return the same hits with the same scores
+             (relative tolerance --rtol); the script exits non-zero if not.
+  - latency: median and p95 per backend over --rounds repetitions, with
+             the search result cache bypassed.
+
+With --memory-only, OpenSearch is not contacted and only the memory
+backend's latency is reported. The scratch index is deleted afterwards.
+
+Usage (from poc/mcp-servers/strategy-review, with OpenSearch running):
+
+    uv run python benchmarks/bench_search_backends.py --rounds 50
+    uv run python benchmarks/bench_search_backends.py --memory-only
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import statistics
+import sys
+import time
+from typing import Any
+
+from opensearchpy.helpers import async_bulk
+
+from strategy_review_mcp.bm25 import BM25Index
+from strategy_review_mcp.search_backends import (
+    MemoryBackend,
+    OpenSearchBackend,
+    SearchBackend,
+)
+from strategy_review_mcp.server import (
+    MEMORY_INDEX_PATH,
+    OPENSEARCH_PASSWORD,
+    OPENSEARCH_URL,
+    OPENSEARCH_USER,
+    _chunks_query,
+    _documents_query,
+)
+
+SCRATCH_INDEX = "strategy-chunks-backend-bench"
+
+# Same mapping as seed/opensearch/create-index.sh, pinned to one shard so
+# term statistics are global like the memory backend's.
+INDEX_BODY = {
+    "settings": {"number_of_shards": 1, "number_of_replicas": 0},
+    "mappings": {
+        "properties": {
+            "chunk_id": {"type": "keyword"},
+            "doc_id": {"type": "keyword"},
+            "doc_title": {"type": "text"},
+            "doc_year": {"type": "integer"},
+            "organization": {"type": "keyword"},
+            "chunk_text": {"type": "text", "analyzer": "standard"},
+            "section": {"type": "keyword"},
+            "page_number": {"type": "integer"},
+            "themes": {"type": "keyword"},
+            "countries": {"type": "keyword"},
+            "chunk_order": {"type": "integer"},
+        }
+    },
+}
+
+QUERIES = [
+    "maternal health",
+    "tuberculosis elimination",
+    "HIV/AIDS prevention",
+    "malaria control Nigeria",
+    "gender equality digital health",
+    "vaccine delivery",
+    "funding USD million",
+    "universal health coverage",
+    "Sub-Saharan Africa South Asia",
+    "community health workers",
+]
+
+
+def _bodies(doc_ids: list[str], top_k: int) -> list[tuple[str, dict[str, Any]]]:
+    bodies = []
+    for query in QUERIES:
+        bodies.append((f"documents {query!r}", _documents_query(query, top_k)))
+        bodies.append((f"chunks    {query!r}", _chunks_query(query, None, top_k)))
+        for doc_id in doc_ids:
+            bodies.append(
+                (
+                    f"chunks    {query!r} in {doc_id}",
+                    _chunks_query(query, doc_id, top_k),
+                )
+            )
+    return bodies
+
+
+def _hits(response: dict[str, Any]) -> list[tuple[str, float]]:
+    return [(h["_id"], h["_score"]) for h in response["hits"]["hits"]]
+
+
+def _same(
+    expected: list[tuple[str, float]], actual: list[tuple[str, float]], rtol: float
+) -> bool:
+    """Same hits with the same ranked scores; ties may come back in any order."""
+    return (
+        len(expected) == len(actual)
+        and all(
+            math.isclose(a, b, rel_tol=rtol) for (_, a), (_, b) in zip(expected, actual)
+        )
+        and {i for i, _ in expected} == {i for i, _ in actual}
+    )
+
+
+async def _latency(
+    backend: SearchBackend, bodies: list[dict[str, Any]], rounds: int
+) -> list[float]:
+    times = []
+    for _ in range(rounds):
+        for body in bodies:
+            start = time.perf_counter()
+            await backend.search(body)
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def _report(label: str, times: list[float]) -> None:
+    p95 = statistics.quantiles(times, n=20)[18] if len(times) > 1 else times[0]
+    print(
+        f"  {label:<12} median {statistics.median(times) * 1000:7.3f} ms"
+        f"   p95 {p95 * 1000:7.3f} ms   ({len(times)} searches)"
+    )
+
+
+async def _setup_scratch_index(backend: OpenSearchBackend, corpus: BM25Index) -> None:
+    client = backend.client
+    await client.indices.delete(index=SCRATCH_INDEX, ignore=[404])
+    await client.indices.create(index=SCRATCH_INDEX, body=INDEX_BODY)
+    await async_bulk(
+        client,
+        (
+            {"_index": SCRATCH_INDEX, "_id": doc_id, "_source": doc}
+            for doc_id, doc in zip(corpus.ids, corpus.docs)
+        ),
+        refresh="wait_for",
+    )
+
+
+async def _main(args: argparse.Namespace) -> int:
+    corpus = BM25Index.from_ndjson(MEMORY_INDEX_PATH)
+    doc_ids = sorted({d["doc_id"] for d in corpus.docs})
+    labelled = _bodies(doc_ids, args.top_k)
+    bodies = [body for _, body in labelled]
+
+    memory = MemoryBackend(MEMORY_INDEX_PATH)
+    print(f"{len(corpus)} chunks from {MEMORY_INDEX_PATH}, {len(bodies)} bodies")
+
+    if args.memory_only:
+        await memory.search(bodies[0])  # load outside the timed loop
+        print("Latency (in-process, no OpenSearch):")
+        _report("memory", await _latency(memory, bodies, args.rounds))
+        return 0
+
+    opensearch = OpenSearchBackend(
+        OPENSEARCH_URL, OPENSEARCH_USER, OPENSEARCH_PASSWORD, SCRATCH_INDEX
+    )
+    failures = 0
+    try:
+        await _setup_scratch_index(opensearch, corpus)
+        for label, body in labelled:
+            expected = _hits(await opensearch.search(body))
+            actual = _hits(await memory.search(body))
+            if not _same(expected, actual, args.rtol):
+                failures += 1
+                print(f"MISMATCH {label}")
+                print(f"  opensearch: {expected}")
+                print(f"  memory:     {actual}")
+        print(f"Parity: {len(bodies) - failures}/{len(bodies)} bodies match")
+
+        print("Latency:")
+        _report("opensearch", await _latency(opensearch, bodies, args.rounds))
+        _report("memory", await _latency(memory, bodies, args.rounds))
+    finally:
+        await opensearch.client.indices.delete(index=SCRATCH_INDEX, ignore=[404])
+        await opensearch.close()
+    return 1 if failures else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--rtol", type=float, default=1e-4)
+    parser.add_argument("--memory-only", action="store_true")
+    sys.exit(asyncio.run(_main(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
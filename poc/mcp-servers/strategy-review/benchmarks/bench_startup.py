@@ -0,0 +1,239 @@
+"""Startup benchmark: import time and time to the first tool response.
+
+The web app spawns strategy-review-mcp when it starts, and the first chat
+turn waits for whatever the server has not done yet. This measures both
+halves in fresh processes:
+
+  - imports: ``python -X importtime -c "import strategy_review_mcp.server"``,
+    reported as the total and a breakdown by top-level package. The backend
+    SDKs (azure, neo4j, opensearchpy) and NumPy are meant to load on first
+    use or in the background, so their presence in the import tree is
+    reported as a regression.
+  - first response: spawn the server over stdio, then time ``initialize``
+    and ``tools/list`` (ready, as web/lib/mcp-manager.ts connects), the
+    first search_chunks and the first get_page_image, cold and with
+    --prewarm. With --idle seconds between ready and the first call (a
+    user reading the page before asking), the pre-warm has loaded the
+    index and opened the blob connection by then.
+
+It runs on the fake stack of bench_load.py (memory backend and a stand-in
+blob service; Neo4j is absent, so its pre-warm check fails fast and is
+only logged). Medians over --runs processes are reported; --save and
+--baseline catch regressions as in bench_load.py.
+
+Usage (from poc/mcp-servers/strategy-review):
+
+    uv run python benchmarks/bench_startup.py
+    uv run python benchmarks/bench_startup.py --runs 10 --save /tmp/start.json
+    uv run python benchmarks/bench_startup.py --baseline /tmp/start.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Any
+
+from bench_load import (
+    CONTAINER,
+    PROJECT_DIR,
+    _call_tool,
+    _is_error,
+    _seed_pages,
+    start_fake_blob_service,
+)
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+# Imported on first use (or by the pre-warm), never by importing the server.
+DEFERRED = ("azure", "neo4j", "opensearchpy", "numpy")
+
+FIRST_CALLS = {
+    "search_chunks": {"query": "maternal health outcomes", "top_k": 5},
+    "get_page_image": None,  # the first seeded page, filled in by _main
+}
+
+
+# ---------------------------------------------------------------------------
+# Imports
+# ---------------------------------------------------------------------------
+
+
+def import_profile(env: dict[str, str]) -> tuple[float, dict[str, float], list[str]]:
+    """Total import ms, self ms per top-level package, and the deferred
+    packages that were imported anyway, for one fresh interpreter."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import strategy_review_mcp.server"],
+        cwd=PROJECT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0.0
+    packages: dict[str, float] = defaultdict(float)
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        module = name.strip()
+        packages[module.split(".")[0]] += int(self_us) / 1000
+        if module == "strategy_review_mcp.server":
+            total = int(cumulative_us) / 1000
+    deferred = [p for p in DEFERRED if p in packages]
+    return total, dict(packages), deferred
+
+
+# ---------------------------------------------------------------------------
+# First response
+# ---------------------------------------------------------------------------
+
+
+async def first_response(
+    env: dict[str, str], prewarm: bool, idle: float, errlog: Any
+) -> dict[str, float]:
+    """Milliseconds from spawn to initialized, then for each first call."""
+    server = StdioServerParameters(
+        command=sys.executable,
+        args=["-m", "strategy_review_mcp.server"] + (["--prewarm"] if prewarm else []),
+        env=env,
+        cwd=PROJECT_DIR,
+    )
+    timings = {}
+    async with AsyncExitStack() as stack:
+        start = time.perf_counter()
+        read, write = await stack.enter_async_context(
+            stdio_client(server, errlog=errlog)
+        )
+        session = await stack.enter_async_context(ClientSession(read, write))
+        await session.initialize()
+        await session.list_tools()
+        timings["ready_ms"] = (time.perf_counter() - start) * 1000
+        await asyncio.sleep(idle)
+        for tool, args in FIRST_CALLS.items():
+            start = time.perf_counter()
+            result = await _call_tool(session, tool, args)
+            timings[f"{tool}_ms"] = (time.perf_counter() - start) * 1000
+            if _is_error(result):
+                raise SystemExit(f"{tool} failed: {result.content[0]}")
+    return timings
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Timings that grew by more than ``tolerance`` over the baseline."""
+    regressions = []
+    pairs = [("import_ms", results["import_ms"], baseline.get("import_ms"))]
+    for mode in ("cold", "prewarm"):
+        for key, value in results[mode].items():
+            pairs.append((f"{mode} {key}", value, baseline.get(mode, {}).get(key)))
+    for name, value, base in pairs:
+        if base is not None and value > base * (1 + tolerance):
+            regressions.append(f"{name}: {value:.1f} vs {base:.1f} baseline")
+    return regressions
+
+
+async def _main(args: argparse.Namespace, errlog: Any) -> tuple[dict[str, Any], int]:
+    pages = _seed_pages()
+    doc_id = min(pages)
+    FIRST_CALLS["get_page_image"] = {"doc_id": doc_id, "page_num": pages[doc_id][0]}
+
+    env = dict(os.environ, GRAPH_SUMMARY_REFRESH_SECONDS="0", SEARCH_BACKEND="memory")
+    env.pop("PREWARM_CLIENTS", None)
+
+    profiles = [import_profile(env) for _ in range(args.runs)]
+    import_ms = statistics.median(p[0] for p in profiles)
+    packages = {
+        name: statistics.median(p[1].get(name, 0.0) for p in profiles)
+        for name in profiles[0][1]
+    }
+    deferred = sorted({name for p in profiles for name in p[2]})
+
+    print(f"import strategy_review_mcp.server: {import_ms:.0f} ms (median)")
+    for name, ms in sorted(packages.items(), key=lambda kv: -kv[1])[: args.top]:
+        print(f"  {name:<24}{ms:8.1f} ms")
+
+    results: dict[str, Any] = {"import_ms": import_ms}
+    runner, endpoint = await start_fake_blob_service(0)
+    try:
+        # No page cache, so every run's first page comes from the blob.
+        env.update(
+            AZURE_STORAGE_BLOB_ENDPOINT=endpoint,
+            AZURE_STORAGE_CONTAINER=CONTAINER,
+            PAGE_CACHE_MAX_BYTES="0",
+        )
+        # Interleaved, so drift in machine load affects both alike.
+        runs: dict[str, list[dict[str, float]]] = {"cold": [], "prewarm": []}
+        for _ in range(args.runs):
+            for mode, timings in runs.items():
+                timings.append(
+                    await first_response(env, mode == "prewarm", args.idle, errlog)
+                )
+    finally:
+        await runner.cleanup()
+    for mode, timings in runs.items():
+        results[mode] = {
+            key: statistics.median(t[key] for t in timings) for key in timings[0]
+        }
+
+    print(f"\nms from spawn (median of {args.runs}, first call {args.idle} s later)")
+    keys = list(results["cold"])
+    print(f"{'':<10}" + "".join(f"{k.removesuffix('_ms'):>18}" for k in keys))
+    for mode in ("cold", "prewarm"):
+        print(f"{mode:<10}" + "".join(f"{results[mode][k]:>18.1f}" for k in keys))
+
+    status = 0
+    if deferred:
+        print(f"\nREGRESSION imported at startup: {', '.join(deferred)}")
+        status = 1
+    return results, status
+
+
+def _save_and_compare(
+    args: argparse.Namespace, results: dict[str, Any], status: int
+) -> int:
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"\nno regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return status
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--idle", type=float, default=1.0)
+    parser.add_argument("--top", type=int, default=12, help="packages to list")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against a --save file")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--server-log", default=os.devnull)
+    args = parser.parse_args()
+    with open(args.server_log, "w") as errlog:
+        results, status = asyncio.run(_main(args, errlog))
+    sys.exit(_save_and_compare(args, results, status))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,616 @@
+"""Array-backed BM25 index for corpora that fit in memory.
+
+Loads chunks from the same NDJSON used to seed OpenSearch and answers the
+subset of the OpenSearch query DSL the server sends (match, multi_match,
+term/terms, range, bool, knn, collapse, _source, highlight,
+sort/search_after, terms/cardinality aggregations), so the search tools
+can run without an OpenSearch cluster.
+
+Each text field is a CSR-style inverted index: a vocabulary mapping terms
+to rows, and flat NumPy arrays of posting doc ids and term frequencies.
+Scoring follows Lucene's BM25Similarity (k1=1.2, b=0.75), including the
+lossy one-byte encoding of field lengths, so scores line up with those of
+a single-shard OpenSearch index over the same documents.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# Analyzed ("text") fields in create-index.sh; every other field is a keyword
+# except the knn_vector field.
+TEXT_FIELDS = ("doc_title", "chunk_text")
+VECTOR_FIELD = "chunk_vector"
+
+K1 = 1.2
+B = 0.75
+
+# Approximates the standard analyzer (UAX#29 word breaks, lowercased):
+# letters join across ' . : and digits across . , ; so "world's", "u.s" and
+# "287,000" stay single tokens while "2024-2028" and "hiv/aids" split.
+_TOKEN = re.compile(
+    r"\w+(?:(?:(?<=[^\W\d])[.:'’](?=[^\W\d])|(?<=\d)[.,;'’](?=\d))\w+)*"
+)
+
+
+def analyze(text: str) -> list[str]:
+    """Split text into lowercased terms the way the index does."""
+    return [token.lower() for token in _TOKEN.findall(text)]
+
+
+# Sentence boundaries for highlight passages (the unified highlighter's
+# default boundary scanner).
+_SENTENCE = re.compile(r"[^.!?]*(?:[.!?]+|$)\s*")
+
+
+def _query_terms(query: Any, field: str) -> set[str]:
+    """Analyzed terms that match and multi_match clauses search ``field`` for."""
+    terms: set[str] = set()
+    if isinstance(query, list):
+        for clause in query:
+            terms |= _query_terms(clause, field)
+    elif isinstance(query, dict):
+        for kind, spec in query.items():
+            if kind == "match" and field in spec:
+                value = spec[field]
+                if isinstance(value, dict):
+                    value = value["query"]
+                terms.update(analyze(str(value)))
+            elif kind == "multi_match" and any(
+                f.partition("^")[0] == field for f in spec.get("fields", [])
+            ):
+                terms.update(analyze(str(spec["query"])))
+            elif kind == "bool":
+                terms |= _query_terms(list(spec.values()), field)
+    return terms
+
+
+def highlight(
+    text: str,
+    terms: set[str],
+    fragment_size: int = 100,
+    number_of_fragments: int = 5,
+    pre_tag: str = "<em>",
+    post_tag: str = "</em>",
+    no_match_size: int = 0,
+) -> list[str]:
+    """Best passages of ``text`` with query terms wrapped in tags.
+
+    Sentences are grouped into passages of about ``fragment_size``
+    characters, ranked by distinct then total matched terms, and the top
+    ``number_of_fragments`` are returned in document order. With no match,
+    the first ``no_match_size`` characters are returned untagged.
+    """
+    passages: list[tuple[int, str]] = []
+    current = ""
+    for sentence in _SENTENCE.findall(text):
+        if current and len(current) + len(sentence) > fragment_size:
+            passages.append((len(passages), current.strip()))
+            current = ""
+        current += sentence
+    if current.strip():
+        passages.append((len(passages), current.strip()))
+
+    ranked = []
+    for position, passage in passages:
+        hits = [t.lower() for t in _TOKEN.findall(passage) if t.lower() in terms]
+        if hits:
+            ranked.append((-len(set(hits)), -len(hits), position, passage))
+    if not ranked:
+        return [text[:no_match_size].strip()] if no_match_size > 0 else []
+
+    best = sorted(ranked)[:number_of_fragments]
+    return [
+        _TOKEN.sub(
+            lambda m: f"{pre_tag}{m[0]}{post_tag}" if m[0].lower() in terms else m[0],
+            passage,
+        )
+        for *_, passage in sorted(best, key=lambda r: r[2])
+    ]
+
+
+def _sort_fields(sort: list[Any]) -> list[tuple[str, bool]]:
+    """(field, descending) pairs of a sort spec; _score defaults to desc."""
+    fields = []
+    for entry in sort:
+        if isinstance(entry, str):
+            fields.append((entry, entry == "_score"))
+            continue
+        field, order = next(iter(entry.items()))
+        if isinstance(order, dict):
+            order = order.get("order", "desc" if field == "_score" else "asc")
+        fields.append((field, order == "desc"))
+    return fields
+
+
+_RANGE_OPS = {
+    "gte": np.greater_equal,
+    "gt": np.greater,
+    "lte": np.less_equal,
+    "lt": np.less,
+}
+
+
+def _after_key(values: np.ndarray | None, after: Any) -> float:
+    """Key of a search_after value on the scale of a ``_sort_column``."""
+    if after is None:
+        return np.inf
+    if values is None:
+        return float(after)
+    # A string between two ranks sits halfway.
+    pos = int(np.searchsorted(values, str(after)))
+    found = pos < len(values) and values[pos] == str(after)
+    return float(pos) if found else pos - 0.5
+
+
+# ---------------------------------------------------------------------------
+# Lucene field-length norms (SmallFloat.intToByte4 / byte4ToInt)
+# ---------------------------------------------------------------------------
+
+
+def _long_to_int4(i: int) -> int:
+    num_bits = i.bit_length()
+    if num_bits < 4:
+        return i
+    shift = num_bits - 4
+    return ((i >> shift) & 0x07) | ((shift + 1) << 3)
+
+
+def _int4_to_long(i: int) -> int:
+    bits = i & 0x07
+    shift = (i >> 3) - 1
+    return bits if shift == -1 else (bits | 0x08) << shift
+
+
+_NUM_FREE_VALUES = 255 - _long_to_int4(2**31 - 1)
+
+
+def _encoded_length(length: int) -> int:
+    """Field length as Lucene reads it back from its one-byte norm."""
+    if length < _NUM_FREE_VALUES:
+        return length
+    encoded = _NUM_FREE_VALUES + _long_to_int4(length - _NUM_FREE_VALUES)
+    return _NUM_FREE_VALUES + _int4_to_long(encoded - _NUM_FREE_VALUES)
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+
+class FieldIndex:
+    """Inverted index of one text field."""
+
+    def __init__(self, values: list[str | None]):
+        vocab: dict[str, int] = {}
+        term_ids: list[int] = []
+        doc_ids: list[int] = []
+        freqs: list[int] = []
+        lengths = np.zeros(len(values), dtype=np.float64)
+        has_field = np.zeros(len(values), dtype=bool)
+
+        for doc, value in enumerate(values):
+            if value is None:
+                continue
+            tokens = analyze(value)
+            has_field[doc] = True
+            lengths[doc] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                term_ids.append(vocab.setdefault(term, len(vocab)))
+                doc_ids.append(doc)
+                freqs.append(tf)
+
+        order = np.argsort(np.asarray(term_ids, dtype=np.int64), kind="stable")
+        self.vocab = vocab
+        self.doc_ids = np.asarray(doc_ids, dtype=np.int32)[order]
+        self.freqs = np.asarray(freqs, dtype=np.float64)[order]
+        counts = np.bincount(np.asarray(term_ids, dtype=np.int64), minlength=len(vocab))
+        self.offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+        # Lucene: avgdl from exact totals, per-doc length from the lossy norm.
+        self.doc_count = int(has_field.sum())
+        avgdl = lengths.sum() / self.doc_count if self.doc_count else 1.0
+        encoded = np.array([_encoded_length(int(n)) for n in lengths])
+        self.norms = K1 * (1 - B + B * encoded / avgdl)
+
+    def score(self, text: str, boost: float, n_docs: int) -> np.ndarray:
+        """BM25 scores of every document for a match query (OR of terms).
+
+        Documents matching no term score NaN so callers can tell "no match"
+        apart from a genuine score.
+        """
+        scores = np.zeros(n_docs, dtype=np.float64)
+        matched = np.zeros(n_docs, dtype=bool)
+        for term in analyze(text):
+            row = self.vocab.get(term)
+            if row is None:
+                continue
+            start, end = self.offsets[row], self.offsets[row + 1]
+            docs = self.doc_ids[start:end]
+            tf = self.freqs[start:end]
+            df = end - start
+            idf = math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+            scores[docs] += boost * idf * tf / (tf + self.norms[docs])
+            matched[docs] = True
+        scores[~matched] = np.nan
+        return scores
+
+
+class BM25Index:
+    """All chunks of a corpus plus one FieldIndex per text field."""
+
+    def __init__(
+        self,
+        docs: list[dict[str, Any]],
+        ids: list[str],
+        vectors: np.ndarray | None = None,
+    ):
+        self.docs = docs
+        self.ids = ids
+        self.fields = {
+            name: FieldIndex([d.get(name) for d in docs]) for name in TEXT_FIELDS
+        }
+        self._keywords: dict[str, dict[Any, np.ndarray]] = {}
+        self._sort_columns: dict[str, tuple[np.ndarray | None, np.ndarray]] = {}
+        self.vectors: np.ndarray | None = None
+        if vectors is not None:
+            self.set_vectors(vectors)
+
+    def set_vectors(self, vectors: np.ndarray) -> None:
+        """Attach one VECTOR_FIELD embedding per chunk (unit-normalized here)."""
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        # Zero vectors cannot be indexed for cosine similarity; never match.
+        self.vectors = np.divide(
+            vectors, norms, out=np.full(vectors.shape, np.nan), where=norms > 0
+        )
+
+    @classmethod
+    def from_ndjson(cls, path: Path) -> BM25Index:
+        """Load a corpus from bulk-API NDJSON or plain one-document-per-line."""
+        docs: list[dict[str, Any]] = []
+        ids: list[str] = []
+        vectors: list[list[float] | None] = []
+        pending_id: str | None = None
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                obj = json.loads(line)
+                action = obj.get("index") or obj.get("create")
+                if len(obj) == 1 and isinstance(action, dict):
+                    pending_id = action.get("_id")
+                    continue
+                vectors.append(obj.pop(VECTOR_FIELD, None))
+                docs.append(obj)
+                ids.append(pending_id or obj.get("chunk_id") or str(len(ids)))
+                pending_id = None
+        if any(v is None for v in vectors):
+            return cls(docs, ids)
+        return cls(docs, ids, np.asarray(vectors, dtype=np.float64))
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    # -- query evaluation ----------------------------------------------------
+
+    def _keyword_postings(self, field: str) -> dict[Any, np.ndarray]:
+        """Value -> doc indices for a keyword field, built on first use."""
+        postings = self._keywords.get(field)
+        if postings is None:
+            lists: dict[Any, list[int]] = {}
+            for i, doc in enumerate(self.docs):
+                value = doc.get(field)
+                for item in value if isinstance(value, list) else [value]:
+                    if item is not None:
+                        lists.setdefault(item, []).append(i)
+            postings = {k: np.asarray(v, dtype=np.int64) for k, v in lists.items()}
+            self._keywords[field] = postings
+        return postings
+
+    def _sort_column(self, field: str) -> tuple[np.ndarray | None, np.ndarray]:
+        """Ascending sort key per doc (missing values: inf), built on first use.
+
+        Numbers are their own keys; strings are keyed by their rank in the
+        sorted distinct values, which are returned alongside (else None).
+        """
+        column = self._sort_columns.get(field)
+        if column is None:
+            values = [doc.get(field) for doc in self.docs]
+            present = [v for v in values if v is not None]
+            if all(isinstance(v, (int, float)) for v in present):
+                keys = [np.inf if v is None else v for v in values]
+                column = (None, np.array(keys, dtype=float))
+            else:
+                distinct = np.unique(np.array([str(v) for v in present]))
+                rank = {v: float(r) for r, v in enumerate(distinct.tolist())}
+                keys = [np.inf if v is None else rank[str(v)] for v in values]
+                column = (distinct, np.array(keys))
+            self._sort_columns[field] = column
+        return column
+
+    def _keyword_mask(self, field: str, values: list[Any]) -> np.ndarray:
+        postings = self._keyword_postings(field)
+        mask = np.zeros(len(self.docs), dtype=bool)
+        for value in values:
+            docs = postings.get(value)
+            if docs is not None:
+                mask[docs] = True
+        return mask
+
+    def _match(self, field: str, text: Any, boost: float = 1.0) -> np.ndarray:
+        if field in self.fields:
+            return self.fields[field].score(str(text), boost, len(self.docs))
+        # match on a keyword field is an exact term query
+        return np.where(self._keyword_mask(field, [text]), boost, np.nan)
+
+    def _evaluate(self, query: dict[str, Any]) -> np.ndarray:
+        """Scores for a query clause; NaN marks documents that do not match."""
+        if len(query) != 1:
+            raise ValueError(f"Expected one query clause, got {list(query)}")
+        kind, spec = next(iter(query.items()))
+        n = len(self.docs)
+
+        if kind == "match_all":
+            return np.ones(n)
+        if kind == "match":
+            field, value = next(iter(spec.items()))
+            if isinstance(value, dict):
+                return self._match(field, value["query"], value.get("boost", 1.0))
+            return self._match(field, value)
+        if kind == "multi_match":
+            if spec.get("type", "best_fields") != "best_fields":
+                raise ValueError("Only best_fields multi_match is supported")
+            tie = spec.get("tie_breaker", 0.0)
+            per_field = []
+            for entry in spec["fields"]:
+                field, _, boost = entry.partition("^")
+                per_field.append(self._match(field, spec["query"], float(boost or 1.0)))
+            stacked = np.vstack(per_field)
+            matched = ~np.all(np.isnan(stacked), axis=0)
+            filled = np.nan_to_num(stacked, nan=0.0)
+            best = filled.max(axis=0)
+            scores = best + tie * (filled.sum(axis=0) - best)
+            return np.where(matched, scores, np.nan)
+        if kind in ("term", "terms"):
+            field, value = next(iter(spec.items()))
+            if kind == "term" and isinstance(value, dict):
+                value = value["value"]
+            values = value if kind == "terms" else [value]
+            return np.where(self._keyword_mask(field, values), 1.0, np.nan)
+        if kind == "range":
+            return self._range(spec)
+        if kind == "bool":
+            return self._bool(spec)
+        if kind == "knn":
+            return self._knn(spec)
+        raise ValueError(f"Unsupported query type for the memory backend: {kind}")
+
+    def _range(self, spec: dict[str, Any]) -> np.ndarray:
+        field, bounds = next(iter(spec.items()))
+        distinct, column = self._sort_column(field)
+        if distinct is not None:
+            raise ValueError(f"range queries need a numeric field, not {field}")
+        mask = ~np.isinf(column)
+        for op, compare in _RANGE_OPS.items():
+            if bounds.get(op) is not None:
+                mask &= compare(column, float(bounds[op]))
+        return np.where(mask, 1.0, np.nan)
+
+    def _bool(self, spec: dict[str, Any]) -> np.ndarray:
+        n = len(self.docs)
+        scores = np.zeros(n)
+        mask = np.ones(n, dtype=bool)
+
+        def clauses(key: str) -> list[dict[str, Any]]:
+            value = spec.get(key, [])
+            return value if isinstance(value, list) else [value]
+
+        for clause in clauses("must"):
+            s = self._evaluate(clause)
+            mask &= ~np.isnan(s)
+            scores += np.nan_to_num(s, nan=0.0)
+        for clause in clauses("filter"):
+            mask &= ~np.isnan(self._evaluate(clause))
+        for clause in clauses("must_not"):
+            mask &= np.isnan(self._evaluate(clause))
+        should = clauses("should")
+        if should:
+            any_should = np.zeros(n, dtype=bool)
+            for clause in should:
+                s = self._evaluate(clause)
+                any_should |= ~np.isnan(s)
+                scores += np.nan_to_num(s, nan=0.0)
+            if not clauses("must") and not clauses("filter"):
+                mask &= any_should
+        return np.where(mask, scores, np.nan)
+
+    def _knn(self, spec: dict[str, Any]) -> np.ndarray:
+        """Exact k-nearest neighbours, scored like cosinesimil: (1 + cos) / 2."""
+        field, params = next(iter(spec.items()))
+        if field != VECTOR_FIELD or self.vectors is None:
+            raise ValueError(f"No vectors loaded for knn field '{field}'")
+        query = np.asarray(params["vector"], dtype=np.float64)
+        scores = (1 + self.vectors @ (query / np.linalg.norm(query))) / 2
+        if "filter" in params:
+            scores[np.isnan(self._evaluate(params["filter"]))] = np.nan
+        candidates = np.flatnonzero(~np.isnan(scores))
+        nearest = candidates[np.argsort(-scores[candidates], kind="stable")]
+        result = np.full(len(self.docs), np.nan)
+        keep = nearest[: params["k"]]
+        result[keep] = scores[keep]
+        return result
+
+    # -- search --------------------------------------------------------------
+
+    def search(self, body: dict[str, Any]) -> dict[str, Any]:
+        """Run a search body and return an OpenSearch-shaped response."""
+        scores = self._evaluate(body.get("query", {"match_all": {}}))
+        # Lucene scores are float32; ties break on index order like doc ids.
+        candidates = np.flatnonzero(~np.isnan(scores))
+        ranked = scores[candidates].astype(np.float32)
+        order = candidates[np.argsort(-ranked, kind="stable")]
+
+        sort_fields = _sort_fields(body["sort"]) if "sort" in body else []
+        if sort_fields:
+            after = body.get("search_after") or [None] * len(sort_fields)
+            columns, after_keys = [], []
+            for (field, desc), after_value in zip(sort_fields, after):
+                if field == "_score":
+                    keys = scores[order].astype(np.float32).astype(float)
+                    after_key = _after_key(None, after_value)
+                else:
+                    distinct, column = self._sort_column(field)
+                    keys = column[order]
+                    after_key = _after_key(distinct, after_value)
+                if desc:
+                    keys = np.where(np.isinf(keys), np.inf, -keys)
+                    after_key = after_key if np.isinf(after_key) else -after_key
+                columns.append(keys)
+                after_keys.append(after_key)
+            if "search_after" in body:
+                # Keep hits whose key tuple sorts strictly after search_after.
+                later = np.zeros(len(order), dtype=bool)
+                tied = np.ones(len(order), dtype=bool)
+                for keys, after_key in zip(columns, after_keys):
+                    later |= tied & (keys > after_key)
+                    tied &= keys == after_key
+                order, columns = order[later], [keys[later] for keys in columns]
+            order = order[np.lexsort(columns[::-1])]
+
+        size = body.get("size", 10)
+        collapse = body.get("collapse", {}).get("field")
+        if collapse is not None:
+            seen: set[Any] = set()
+            picked = []
+            for i in order:
+                key = self.docs[i].get(collapse)
+                if key in seen:
+                    continue
+                seen.add(key)
+                picked.append(i)
+                if len(picked) == size:
+                    break
+            order = np.asarray(picked, dtype=np.int64)
+        else:
+            order = order[:size]
+
+        source = body.get("_source")
+        highlighting = body.get("highlight")
+        if highlighting:
+            highlight_terms = {
+                field: _query_terms(
+                    options.get(
+                        "highlight_query",
+                        highlighting.get("highlight_query", body.get("query")),
+                    ),
+                    field,
+                )
+                for field, options in highlighting["fields"].items()
+            }
+        hits = []
+        for i in order:
+            doc = self.docs[i]
+            if isinstance(source, list):
+                doc = {k: doc[k] for k in source if k in doc}
+            hit: dict[str, Any] = {
+                "_index": "memory",
+                "_id": self.ids[i],
+                "_score": float(np.float32(scores[i])),
+                "_source": doc,
+            }
+            if sort_fields:
+                hit["sort"] = [
+                    (
+                        float(np.float32(scores[i]))
+                        if field == "_score"
+                        else self.docs[i].get(field)
+                    )
+                    for field, _ in sort_fields
+                ]
+            if highlighting:
+                fragments = {}
+                for field, options in highlighting["fields"].items():
+                    texts = self._highlight_field(
+                        self.docs[i].get(field),
+                        highlight_terms[field],
+                        {**highlighting, **options},
+                    )
+                    if texts:
+                        fragments[field] = texts
+                if fragments:
+                    hit["highlight"] = fragments
+            hits.append(hit)
+        response: dict[str, Any] = {
+            "timed_out": False,
+            "hits": {
+                "max_score": hits[0]["_score"] if hits else None,
+                "hits": hits,
+            },
+        }
+        if body.get("track_total_hits", True) is not False:
+            response["hits"]["total"] = {"value": len(candidates), "relation": "eq"}
+        aggs = body.get("aggs", body.get("aggregations"))
+        if aggs:
+            response["aggregations"] = self._aggregate(aggs, candidates)
+        return response
+
+    def _aggregate(self, aggs: dict[str, Any], matched: np.ndarray) -> dict[str, Any]:
+        """terms (with sub-aggregations) and cardinality over matched docs."""
+        in_matched = np.zeros(len(self.docs), dtype=bool)
+        in_matched[matched] = True
+        results: dict[str, Any] = {}
+        for name, spec in aggs.items():
+            sub_aggs = spec.get("aggs", spec.get("aggregations"))
+            if "terms" in spec:
+                terms = spec["terms"]
+                counts = [
+                    (key, docs[in_matched[docs]])
+                    for key, docs in self._keyword_postings(terms["field"]).items()
+                ]
+                # Most matching docs first, ties by key like OpenSearch.
+                counts = sorted(
+                    ((k, d) for k, d in counts if len(d)),
+                    key=lambda kd: (-len(kd[1]), kd[0]),
+                )
+                size = terms.get("size", 10)
+                buckets = []
+                for key, docs in counts[:size]:
+                    bucket: dict[str, Any] = {"key": key, "doc_count": len(docs)}
+                    if sub_aggs:
+                        bucket.update(self._aggregate(sub_aggs, docs))
+                    buckets.append(bucket)
+                results[name] = {
+                    "doc_count_error_upper_bound": 0,
+                    "sum_other_doc_count": sum(len(d) for _, d in counts[size:]),
+                    "buckets": buckets,
+                }
+            elif "cardinality" in spec:
+                postings = self._keyword_postings(spec["cardinality"]["field"])
+                value = sum(1 for docs in postings.values() if in_matched[docs].any())
+                results[name] = {"value": value}
+            else:
+                raise ValueError(f"Unsupported aggregation: {list(spec)}")
+        return results
+
+    @staticmethod
+    def _highlight_field(
+        value: Any, terms: set[str], options: dict[str, Any]
+    ) -> list[str]:
+        if not isinstance(value, str):
+            return []
+        return highlight(
+            value,
+            terms,
+            fragment_size=options.get("fragment_size", 100),
+            number_of_fragments=options.get("number_of_fragments", 5),
+            pre_tag=options.get("pre_tags", ["<em>"])[0],
+            post_tag=options.get("post_tags", ["</em>"])[0],
+            no_match_size=options.get("no_match_size", 0),
+        )
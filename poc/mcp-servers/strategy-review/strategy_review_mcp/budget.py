@@ -0,0 +1,148 @@
+"""Fit search results into a size budget before they reach the model.
+
+Tool results go verbatim into the chat model's context, and stay there for
+every later turn, so a few long chunk texts cost latency and tokens on each
+model call after them. A budget (``max_chars`` or ``max_tokens`` on the
+search tools) bounds the serialized results:
+
+  - Hits are taken in rank order while they fit, so the top hits survive.
+  - The first hit that does not fit whole has its text (chunk_text, then
+    the snippet) cut at a sentence boundary, where one is close enough, and
+    is marked ``"truncated": true``; packing stops after it.
+  - A hit is measured as FastMCP serializes it (indented JSON), so the
+    results never exceed the budget. Results sent inside a larger object
+    (a page with its cursor, a batch entry) are fitted so that the whole
+    object, as serialized, stays within it.
+
+Tokens are estimated at CHARS_PER_TOKEN characters each, close enough for
+English prose with Claude's tokenizer and cheap enough to run on every call.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+from typing import Any
+
+import pydantic_core
+
+CHARS_PER_TOKEN = 4
+
+# Shortened in this order when a hit does not fit.
+TEXT_FIELDS = ("chunk_text", "snippet")
+
+ELLIPSIS = " …"
+
+# A sentence end: punctuation, optional closing quotes / brackets, a space.
+_SENTENCE_END = re.compile(r"[.!?][\"'”’)\]]*\s")
+
+
+def budget_chars(max_chars: int | None, max_tokens: int | None) -> int | None:
+    """The tighter of the two budgets in characters (None: no budget)."""
+    budgets = []
+    if max_chars is not None:
+        if max_chars < 1:
+            raise ValueError("max_chars must be positive")
+        budgets.append(max_chars)
+    if max_tokens is not None:
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be positive")
+        budgets.append(max_tokens * CHARS_PER_TOKEN)
+    return min(budgets) if budgets else None
+
+
+def result_chars(result: dict[str, Any]) -> int:
+    """Characters of one result as FastMCP sends it (a JSON text block)."""
+    return len(pydantic_core.to_json(result, fallback=str, indent=2).decode())
+
+
+def truncate_text(text: str, limit: int) -> str:
+    """Cut ``text`` to at most ``limit`` characters, ending with ELLIPSIS.
+
+    The cut is made after the last sentence that fits, unless that would
+    drop more than half of the room; then after the last whole word.
+    """
+    if len(text) <= limit:
+        return text
+    room = limit - len(ELLIPSIS)
+    if room <= 0:
+        return ""
+    head = text[: room + 1]
+    ends = [m.end() for m in _SENTENCE_END.finditer(head)]
+    if ends and ends[-1] >= room // 2:
+        cut = ends[-1]
+    else:
+        cut = head.rfind(" ")
+        if cut <= 0:
+            cut = room
+    return text[:cut].rstrip() + ELLIPSIS
+
+
+def _shrink(result: dict[str, Any], limit: int) -> dict[str, Any] | None:
+    """A copy of ``result`` with its text cut to fit ``limit`` characters,
+    or None when it would keep no text."""
+    shrunk = {**result, "truncated": True}
+    for field in TEXT_FIELDS:
+        while shrunk.get(field):
+            excess = result_chars(shrunk) - limit
+            if excess <= 0:
+                return shrunk
+            shrunk[field] = truncate_text(shrunk[field], len(shrunk[field]) - excess)
+    if result_chars(shrunk) > limit or not any(shrunk.get(f) for f in TEXT_FIELDS):
+        return None
+    return shrunk
+
+
+def fit_field(result: dict[str, Any], field: str, limit: int) -> dict[str, Any]:
+    """A copy of ``result`` with the text of ``field`` cut until the whole
+    result fits ``limit`` characters (or the text is empty)."""
+    fitted = dict(result)
+    while fitted.get(field):
+        excess = result_chars(fitted) - limit
+        if excess <= 0:
+            break
+        fitted[field] = truncate_text(fitted[field], len(fitted[field]) - excess)
+    return fitted
+
+
+def fit_results(results: list[dict[str, Any]], budget: int) -> list[dict[str, Any]]:
+    """The leading results that fit in ``budget`` characters, the last one
+    possibly truncated. The input results are not modified."""
+    fitted = []
+    remaining = budget
+    for result in results:
+        size = result_chars(result)
+        if size <= remaining:
+            fitted.append(result)
+            remaining -= size
+            continue
+        shrunk = _shrink(result, remaining)
+        if shrunk is not None:
+            fitted.append(shrunk)
+        break
+    return fitted
+
+
+def fit_wrapped(
+    results: list[dict[str, Any]],
+    budget: int,
+    wrap: Callable[[list[dict[str, Any]]], dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """The leading results that fit when sent as ``wrap(results)``: the
+    serialized envelope, its other keys and the deeper-indented results
+    together take at most ``budget`` characters.
+
+    The results are fitted to the room the empty envelope leaves, then
+    refitted with less room by whatever the indentation (or a cursor that
+    depends on the results kept) still overshoots.
+    """
+    room = budget - result_chars(wrap([]))
+    while room > 0:
+        fitted = fit_results(results, room)
+        if not fitted:
+            break
+        excess = result_chars(wrap(fitted)) - budget
+        if excess <= 0:
+            return fitted
+        room -= excess
+    return []
@@ -0,0 +1,162 @@
+"""In-process result cache for the search tools.
+
+A size-bounded LRU with a per-entry TTL. Entries are tagged with an index
+generation (see ``server._index_generation``); when the generation moves —
+for example after a reseed recreates ``strategy-chunks`` — the whole cache is
+dropped, because every cached hit list may now be stale.
+
+A cache only helps the calls after the first has finished; SingleFlight
+covers the ones that arrive meanwhile (several chat sessions or parallel
+sub-agents asking the same thing at once) by letting them wait for the one
+outstanding call instead of making their own.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def normalize_query(query: str) -> str:
+    """Fold case and collapse whitespace so near-identical queries share a key."""
+    return " ".join(query.lower().split())
+
+
+class TTLCache:
+    """LRU cache with a maximum size, a TTL and hit/miss counters.
+
+    Cached values are returned by reference and must be treated as
+    read-only by callers.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._generation: Hashable | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def sync_generation(self, generation: Hashable | None) -> None:
+        """Drop every entry if the index generation has changed.
+
+        ``None`` means the generation could not be determined; the cache is
+        left untouched rather than flushed on a transient error.
+        """
+        if generation is None or generation == self._generation:
+            return
+        if self._generation is not None and self._entries:
+            self.invalidations += 1
+            self._entries.clear()
+        self._generation = generation
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value for ``key``, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if self._clock() >= expires_at:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "generation": repr(self._generation),
+        }
+
+
+class SingleFlight:
+    """Table of in-flight calls, so concurrent identical calls share one.
+
+    The first caller for a key (the leader) starts the call as a task;
+    callers with the same key arriving before it finishes wait for that task
+    and get its result, or its exception. Each caller waits through
+    ``asyncio.shield``, so one that is cancelled (its client went away) does
+    not cancel the call for the others. As with cached values, results are
+    shared by reference and must be treated as read-only.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._calls: dict[Hashable, asyncio.Future[Any]] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """Return ``await call()``, or the result of the same key's call
+        already in flight."""
+        if not self.enabled:
+            return await call()
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(functools.partial(self._done, key))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Future[Any]) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Retrieved here, unlogged, in case every waiter was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict[str, Any]:
+        calls = self.leaders + self.coalesced
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "coalesced_rate": round(self.coalesced / calls, 4) if calls else 0.0,
+        }
@@ -0,0 +1,190 @@
+"""CPU-only chunk embeddings: a TF-IDF / LSA projection fitted at seed time.
+
+Features are the analyzed words of a text plus the character 3-5-grams of
+each word, so inflections and spelling variants ("immunisation" and
+"immunization", "vaccines" and "vaccination") share dimensions. TF-IDF rows
+are projected onto the top singular vectors of the corpus matrix (latent
+semantic analysis), which also pulls together words that co-occur in the
+corpus, and L2-normalized for cosine similarity.
+
+The fitted model is a small .npz (vocabulary, idf, projection) that the
+server loads to embed queries. Fitting and writing chunk vectors (without
+--output only the model is written; strategy_review_mcp.ingest then embeds
+chunks as it indexes them):
+
+    python -m strategy_review_mcp.embeddings chunks.ndjson \\
+        --model lsa-model.npz --output chunks.vectors.ndjson
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from strategy_review_mcp.bm25 import VECTOR_FIELD, analyze
+
+# knn_vector dimension in create-index.sh; smaller corpora are zero-padded.
+EMBEDDING_DIMS = 64
+
+
+@lru_cache(maxsize=65536)
+def _word_grams(word: str) -> tuple[str, ...]:
+    padded = f"<{word}>"
+    return tuple(
+        f"#{padded[i : i + n]}" for n in (3, 4, 5) for i in range(len(padded) - n + 1)
+    )
+
+
+def _features(text: str) -> list[str]:
+    words = analyze(text)
+    grams = []
+    for word in words:
+        grams.extend(_word_grams(word))
+    return words + grams
+
+
+def _sparse_dot(
+    rows: np.ndarray, cols: np.ndarray, vals: np.ndarray, dense: np.ndarray, n: int
+) -> np.ndarray:
+    """(COO matrix with n rows) @ dense."""
+    # One bincount per output column over contiguous memory; much faster
+    # than np.add.at on (nnz, dims) products.
+    out = np.empty((dense.shape[1], n))
+    for j, column in enumerate(np.ascontiguousarray(dense.T)):
+        out[j] = np.bincount(rows, weights=vals * column[cols], minlength=n)
+    return out.T
+
+
+def embedding_text(doc: dict[str, Any]) -> str:
+    """The text of a chunk that gets embedded (the BM25-searched fields)."""
+    return f"{doc.get('doc_title', '')}\n{doc.get('chunk_text', '')}"
+
+
+class LsaEncoder:
+    """TF-IDF features projected onto a fitted LSA basis."""
+
+    def __init__(self, vocab: dict[str, int], idf: np.ndarray, components: np.ndarray):
+        self.vocab = vocab
+        self.idf = idf
+        self.components = components  # (len(vocab), dims)
+        self._word_ids = lru_cache(maxsize=65536)(self._known_features)
+
+    @property
+    def dims(self) -> int:
+        return self.components.shape[1]
+
+    def _known_features(self, word: str) -> tuple[int, ...]:
+        """Vocabulary ids of a word and its n-grams."""
+        return tuple(
+            self.vocab[f] for f in (word, *_word_grams(word)) if f in self.vocab
+        )
+
+    def _tfidf(self, texts: list[str]) -> tuple[np.ndarray, ...]:
+        """Row-normalized sublinear TF-IDF as COO (rows, cols, vals)."""
+        rows, cols, vals = [], [], []
+        for r, text in enumerate(texts):
+            ids = [i for word in analyze(text) for i in self._word_ids(word)]
+            if not ids:
+                continue
+            c, counts = np.unique(np.array(ids), return_counts=True)
+            v = (1 + np.log(counts)) * self.idf[c]
+            rows.append(np.full(len(c), r))
+            cols.append(c)
+            vals.append(v / np.linalg.norm(v))
+        if not rows:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0)
+        return np.concatenate(rows), np.concatenate(cols), np.concatenate(vals)
+
+    @classmethod
+    def fit(
+        cls, texts: list[str], dims: int = EMBEDDING_DIMS, seed: int = 0
+    ) -> LsaEncoder:
+        """Fit vocabulary, idf and a rank-``dims`` LSA basis on a corpus."""
+        df: Counter[str] = Counter()
+        for text in texts:
+            df.update(set(_features(text)))
+        vocab = {term: i for i, term in enumerate(sorted(df))}
+        n = len(texts)
+        idf = np.array([np.log((1 + n) / (1 + df[t])) + 1 for t in sorted(df)])
+        encoder = cls(vocab, idf, np.zeros((len(vocab), dims)))
+        rows, cols, vals = encoder._tfidf(texts)
+
+        # Randomized truncated SVD (Halko et al.) on the sparse matrix.
+        rank = min(dims, n, len(vocab))
+        rng = np.random.default_rng(seed)
+        basis = rng.standard_normal((len(vocab), rank + 10))
+        for _ in range(3):
+            q, _ = np.linalg.qr(_sparse_dot(rows, cols, vals, basis, n))
+            basis, _ = np.linalg.qr(_sparse_dot(cols, rows, vals, q, len(vocab)))
+        q, _ = np.linalg.qr(_sparse_dot(rows, cols, vals, basis, n))
+        small = _sparse_dot(cols, rows, vals, q, len(vocab)).T  # q.T @ X
+        _, _, vt = np.linalg.svd(small, full_matrices=False)
+        encoder.components[:, :rank] = vt[:rank].T
+        return encoder
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Unit-length float32 embeddings; rows with no known feature are zero."""
+        rows, cols, vals = self._tfidf(texts)
+        vectors = _sparse_dot(rows, cols, vals, self.components, len(texts))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(
+            vectors, norms, out=np.zeros_like(vectors), where=norms > 0
+        ).astype(np.float32)
+
+    def encode_query(self, text: str) -> list[float] | None:
+        """Embedding of a query, or None if none of its features are known."""
+        vector = self.encode([text])[0]
+        return vector.tolist() if vector.any() else None
+
+    def save(self, path: Path) -> None:
+        terms = np.array(sorted(self.vocab, key=self.vocab.__getitem__))
+        np.savez_compressed(path, terms=terms, idf=self.idf, components=self.components)
+
+    @classmethod
+    def load(cls, path: Path) -> LsaEncoder:
+        with np.load(path) as data:
+            vocab = {str(t): i for i, t in enumerate(data["terms"])}
+            return cls(vocab, data["idf"], data["components"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Fit the LSA encoder on bulk NDJSON and add chunk vectors."
+    )
+    parser.add_argument("chunks", type=Path, help="bulk-API NDJSON of chunks")
+    parser.add_argument("--model", type=Path, required=True, help="model .npz out")
+    parser.add_argument("--output", type=Path, help="NDJSON out (optional)")
+    parser.add_argument("--dims", type=int, default=EMBEDDING_DIMS)
+    args = parser.parse_args()
+
+    lines = [json.loads(line) for line in args.chunks.read_text().splitlines() if line]
+    docs = [obj for obj in lines if "chunk_text" in obj]
+    encoder = LsaEncoder.fit([embedding_text(d) for d in docs], dims=args.dims)
+    encoder.save(args.model)
+    if args.output is None:
+        print(
+            f"Fitted on {len(docs)} chunks ({len(encoder.vocab)} features, "
+            f"{args.dims} dims) -> {args.model}"
+        )
+        return
+    for doc, vector in zip(docs, encoder.encode([embedding_text(d) for d in docs])):
+        doc[VECTOR_FIELD] = [round(float(x), 6) for x in vector]
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        for obj in lines:
+            f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+    print(
+        f"Embedded {len(docs)} chunks ({len(encoder.vocab)} features, "
+        f"{args.dims} dims) -> {args.output}; model -> {args.model}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""In-memory summary of the Neo4j knowledge graph.
+
+The graph (seed/neo4j/seed.cypher) only changes on a reseed, so the facts
+agents ask for most — which themes a document covers, which indicators
+measure a theme, how funding is allocated, each country's priorities — are
+read once with four small Cypher queries and materialized into plain dicts
+that the server answers from without a round trip. ``fingerprint`` is a
+hash of the content, so a refresh can tell whether anything changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from neo4j import AsyncDriver
+
+SECTIONS = ("documents", "themes", "funding_areas", "countries")
+
+_QUERIES = {
+    "documents": """
+        MATCH (d:Document)
+        RETURN d.id AS id, d.title AS title, d.type AS type, d.year AS year,
+               d.organization AS organization,
+               [(d)-[r:COVERS_THEME]->(t:Theme) |
+                {theme: t.id, primary: r.primary, weight: r.weight}] AS themes
+    """,
+    "themes": """
+        MATCH (t:Theme)
+        RETURN t.id AS id, t.name AS name, t.priority AS priority,
+               [(t)-[m:MEASURED_BY]->(i:Indicator) |
+                {id: i.id, name: i.name, unit: i.unit, baseline: m.baseline,
+                 target: m.target, year: m.year}] AS indicators
+    """,
+    "funding_areas": """
+        MATCH (f:FundingArea)
+        RETURN f.id AS id, f.name AS name,
+               f.budget_usd_millions AS budget_usd_millions,
+               f.fiscal_year AS fiscal_year,
+               [(f)-[a:ALLOCATES_TO]->(t:Theme) |
+                {theme: t.id, amount_usd_millions: a.amount_usd_millions,
+                 percentage: a.percentage}] AS allocations
+    """,
+    "countries": """
+        MATCH (c:Country)
+        RETURN c.code AS id, c.name AS name, c.region AS region,
+               c.income_level AS income_level,
+               [(t:Theme)-[p:PRIORITY_IN]->(c) |
+                {theme: t.id, rank: p.rank, rationale: p.rationale}] AS priorities,
+               [(c)-[s:SUPPORTS_THEME]->(t:Theme) |
+                {theme: t.id, status: s.implementation_status,
+                 progress_pct: s.progress_pct}] AS programs
+    """,
+}
+
+
+@dataclass(frozen=True)
+class GraphSummary:
+    """Materialized graph facts, keyed by node id per section."""
+
+    documents: dict[str, dict[str, Any]]
+    themes: dict[str, dict[str, Any]]
+    funding_areas: dict[str, dict[str, Any]]
+    countries: dict[str, dict[str, Any]]
+    fingerprint: str
+    loaded_at: float = field(default_factory=time.time)
+
+    def section(self, name: str) -> dict[str, dict[str, Any]]:
+        return getattr(self, name)
+
+
+def build_summary(results: dict[str, list[dict[str, Any]]]) -> GraphSummary:
+    """Index the rows of each query by id and add the reverse relations
+    (theme -> documents, funding and priority countries)."""
+    sections = {
+        name: {row["id"]: {k: v for k, v in row.items() if k != "id"} for row in rows}
+        for name, rows in results.items()
+    }
+    documents, themes = sections["documents"], sections["themes"]
+    funding_areas, countries = sections["funding_areas"], sections["countries"]
+
+    for theme in themes.values():
+        theme.update(documents=[], funding_usd_millions=0, priority_countries=[])
+    for doc_id, doc in documents.items():
+        doc["themes"].sort(key=lambda t: (-(t["weight"] or 0), t["theme"]))
+        for t in doc["themes"]:
+            if t["theme"] in themes:
+                themes[t["theme"]]["documents"].append(doc_id)
+    for area in funding_areas.values():
+        area["allocations"].sort(key=lambda a: -(a["amount_usd_millions"] or 0))
+        area["allocated_usd_millions"] = sum(
+            a["amount_usd_millions"] or 0 for a in area["allocations"]
+        )
+        for a in area["allocations"]:
+            if a["theme"] in themes:
+                themes[a["theme"]]["funding_usd_millions"] += (
+                    a["amount_usd_millions"] or 0
+                )
+    for code, country in countries.items():
+        country["priorities"].sort(key=lambda p: (p["rank"], p["theme"]))
+        country["programs"].sort(key=lambda p: p["theme"])
+        for p in country["priorities"]:
+            if p["theme"] in themes:
+                themes[p["theme"]]["priority_countries"].append(
+                    {"country": code, "rank": p["rank"]}
+                )
+    for theme in themes.values():
+        theme["documents"].sort()
+        theme["indicators"].sort(key=lambda i: i["id"])
+        theme["priority_countries"].sort(key=lambda p: (p["rank"], p["country"]))
+
+    canonical = json.dumps(sections, sort_keys=True, default=str)
+    return GraphSummary(
+        **sections, fingerprint=hashlib.sha256(canonical.encode()).hexdigest()[:16]
+    )
+
+
+async def load_summary(driver: AsyncDriver, database: str) -> GraphSummary:
+    """Read every section in one read transaction and build the summary.
+
+    The transaction is not retried (unlike execute_read): callers refresh
+    periodically anyway, and a tool call should fail fast while Neo4j is
+    down rather than wait out the driver's retry budget.
+    """
+    from neo4j import READ_ACCESS
+
+    results = {}
+    async with driver.session(
+        database=database, default_access_mode=READ_ACCESS
+    ) as session:
+        async with await session.begin_transaction() as tx:
+            for name, query in _QUERIES.items():
+                result = await tx.run(query)
+                results[name] = [record.data() async for record in result]
+    return build_summary(results)
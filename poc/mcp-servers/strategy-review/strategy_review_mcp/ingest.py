@@ -0,0 +1,419 @@
+"""Streaming ingestion of strategy documents into the OpenSearch index.
+
+Reads NDJSON (or plain text) inputs line by line, chunks documents that are
+not chunked yet, and bulk-indexes the chunks with ``helpers.parallel_bulk``
+while the index's refresh is switched off. Inputs may mix:
+
+  - chunk records: objects with ``chunk_text`` (e.g. seed/opensearch/
+    chunks.ndjson), indexed as they are; bulk action lines are skipped.
+  - document records: objects with ``doc_id`` and either ``pages``
+    (``[{"page_number", "text", "section"?}]``) or ``text`` (pages separated
+    by form feeds), plus optional doc_title, doc_year, organization, section,
+    themes and countries copied onto every chunk.
+  - ``.txt`` files: one document each (doc_id from the file name, title
+    from the first line, pages separated by form feeds).
+
+Every chunk carries a ``content_hash`` of its fields (and of the embedding
+model, when one is used). Chunks whose hash is already in the index are
+skipped, and chunks left over from an earlier, longer version of a
+re-ingested document are deleted, so a re-run only touches what changed.
+
+    strategy-review-ingest chunks.ndjson --model lsa-model.npz
+    strategy-review-ingest docs/*.txt reports.ndjson --threads 8
+    strategy-review-ingest docs.ndjson --output chunks.ndjson  # no OpenSearch
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
+
+from opensearchpy import OpenSearch, helpers
+
+from strategy_review_mcp.bm25 import VECTOR_FIELD
+
+if TYPE_CHECKING:
+    from strategy_review_mcp.embeddings import LsaEncoder
+
+logger = logging.getLogger(__name__)
+
+HASH_FIELD = "content_hash"
+DEFAULT_CHUNK_CHARS = 1200
+
+_BULK_ACTIONS = {"index", "create", "update", "delete"}
+_PARAGRAPH = re.compile(r"\n\s*\n")
+_SENTENCE = re.compile(r"[^.!?]*(?:[.!?]+|$)\s*")
+_DOC_FIELDS = ("doc_title", "doc_year", "organization", "themes", "countries")
+
+
+# ---------------------------------------------------------------------------
+# Reading and chunking
+# ---------------------------------------------------------------------------
+
+
+def split_text(text: str, max_chars: int = DEFAULT_CHUNK_CHARS) -> list[str]:
+    """Pack paragraphs (or, for long ones, sentences) into chunks of at most
+    about ``max_chars`` characters."""
+    pieces: list[str] = []
+    for paragraph in _PARAGRAPH.split(text):
+        paragraph = " ".join(paragraph.split())
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+        else:
+            pieces.extend(s.strip() for s in _SENTENCE.findall(paragraph))
+
+    chunks: list[str] = []
+    current = ""
+    for piece in filter(None, pieces):
+        if current and len(current) + 1 + len(piece) > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def chunk_document(
+    doc: dict[str, Any], max_chars: int = DEFAULT_CHUNK_CHARS
+) -> Iterator[dict[str, Any]]:
+    """Chunk records for a document, numbered 1.. in reading order.
+
+    Chunks never span pages, so each one has the page it is on.
+    """
+    pages = doc.get("pages")
+    if pages is None:
+        pages = [
+            {"page_number": n, "text": text}
+            for n, text in enumerate(doc.get("text", "").split("\f"), start=1)
+        ]
+    order = 0
+    for page in pages:
+        for text in split_text(page.get("text", ""), max_chars):
+            order += 1
+            chunk = {
+                "chunk_id": f"{doc['doc_id']}_{order:03d}",
+                "doc_id": doc["doc_id"],
+                **{f: doc[f] for f in _DOC_FIELDS if f in doc},
+                "chunk_text": text,
+                "section": page.get("section", doc.get("section", "")),
+                "page_number": page.get("page_number"),
+                "chunk_order": order,
+            }
+            yield chunk
+
+
+def _read_text_document(path: Path) -> dict[str, Any]:
+    text = path.read_text(encoding="utf-8")
+    title = next((line.strip() for line in text.splitlines() if line.strip()), "")
+    return {"doc_id": path.stem, "doc_title": title, "text": text}
+
+
+def _read_records(stream: TextIO) -> Iterator[dict[str, Any]]:
+    for line in stream:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if len(record) == 1 and next(iter(record)) in _BULK_ACTIONS:
+            continue
+        yield record
+
+
+def iter_chunks(
+    paths: Iterable[str], max_chars: int = DEFAULT_CHUNK_CHARS
+) -> Iterator[dict[str, Any]]:
+    """Stream chunk records from NDJSON / text inputs ("-" is stdin)."""
+    for name in paths:
+        if name == "-":
+            yield from _record_chunks(_read_records(sys.stdin), max_chars)
+        elif name.endswith(".txt"):
+            yield from _record_chunks([_read_text_document(Path(name))], max_chars)
+        else:
+            with open(name, encoding="utf-8") as f:
+                yield from _record_chunks(_read_records(f), max_chars)
+
+
+def _record_chunks(
+    records: Iterable[dict[str, Any]], max_chars: int
+) -> Iterator[dict[str, Any]]:
+    for record in records:
+        if "chunk_text" in record:
+            yield record
+        else:
+            yield from chunk_document(record, max_chars)
+
+
+def content_hash(chunk: dict[str, Any], salt: bytes = b"") -> str:
+    """Hash of a chunk's fields (not its vector), salted with the model."""
+    fields = {k: v for k, v in chunk.items() if k not in (VECTOR_FIELD, HASH_FIELD)}
+    digest = hashlib.sha256(salt)
+    digest.update(json.dumps(fields, sort_keys=True, ensure_ascii=False).encode())
+    return digest.hexdigest()[:32]
+
+
+# ---------------------------------------------------------------------------
+# Indexing
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class IngestStats:
+    read: int = 0
+    unchanged: int = 0
+    indexed: int = 0
+    deleted: int = 0
+    failed: int = 0
+
+
+def existing_hashes(client: OpenSearch, index: str) -> dict[str, tuple[str, str]]:
+    """chunk_id -> (doc_id, content_hash) of every chunk in the index."""
+    return {
+        hit["_id"]: (hit["_source"].get("doc_id"), hit["_source"].get(HASH_FIELD))
+        for hit in helpers.scan(
+            client,
+            index=index,
+            query={"_source": ["doc_id", HASH_FIELD]},
+            size=5000,
+        )
+    }
+
+
+def _changed_chunks(
+    chunks: Iterable[dict[str, Any]],
+    existing: dict[str, tuple[str, str]],
+    encoder: LsaEncoder | None,
+    salt: bytes,
+    batch_size: int,
+    stats: IngestStats,
+    seen: dict[str, set[str]],
+) -> Iterator[dict[str, Any]]:
+    """Hash chunks, drop unchanged ones and embed the rest in batches.
+
+    Records every chunk id per document in ``seen`` for stale deletion.
+    """
+    from strategy_review_mcp.embeddings import embedding_text
+
+    batch: list[dict[str, Any]] = []
+
+    def flush() -> Iterator[dict[str, Any]]:
+        missing = [c for c in batch if VECTOR_FIELD not in c]
+        if encoder is not None and missing:
+            vectors = encoder.encode([embedding_text(c) for c in missing])
+            for chunk, vector in zip(missing, vectors):
+                chunk[VECTOR_FIELD] = [round(float(x), 6) for x in vector]
+        yield from batch
+        batch.clear()
+
+    for chunk in chunks:
+        stats.read += 1
+        chunk[HASH_FIELD] = content_hash(chunk, salt)
+        seen.setdefault(chunk["doc_id"], set()).add(chunk["chunk_id"])
+        if existing.get(chunk["chunk_id"], (None, None))[1] == chunk[HASH_FIELD]:
+            stats.unchanged += 1
+            continue
+        batch.append(chunk)
+        if len(batch) >= batch_size:
+            yield from flush()
+    yield from flush()
+
+
+def _bulk(
+    client: OpenSearch,
+    actions: Iterable[dict[str, Any]],
+    threads: int,
+    chunk_size: int,
+    stats: IngestStats,
+    counter: str,
+) -> None:
+    for ok, item in helpers.parallel_bulk(
+        client,
+        actions,
+        thread_count=threads,
+        chunk_size=chunk_size,
+        raise_on_error=False,
+    ):
+        if ok:
+            setattr(stats, counter, getattr(stats, counter) + 1)
+        else:
+            stats.failed += 1
+            if stats.failed <= 5:
+                logger.error("Bulk item failed: %s", item)
+
+
+def ingest(
+    client: OpenSearch,
+    index: str,
+    chunks: Iterable[dict[str, Any]],
+    *,
+    encoder: LsaEncoder | None = None,
+    salt: bytes = b"",
+    full: bool = False,
+    threads: int = 4,
+    chunk_size: int = 500,
+) -> IngestStats:
+    """Index new and changed chunks and delete stale ones of re-ingested docs.
+
+    The index's refresh_interval is set to -1 for the load and restored
+    afterwards (followed by one refresh), so segments are not rebuilt every
+    second while bulk requests stream in.
+    """
+    stats = IngestStats()
+    existing = existing_hashes(client, index)
+    seen: dict[str, set[str]] = {}
+
+    settings = client.indices.get_settings(index=index, name="index.refresh_interval")
+    original = next(iter(settings.values()), {}).get("settings", {})
+    refresh_interval = original.get("index", {}).get("refresh_interval")
+    client.indices.put_settings(index=index, body={"index": {"refresh_interval": "-1"}})
+    try:
+        changed = _changed_chunks(
+            chunks, {} if full else existing, encoder, salt, chunk_size, stats, seen
+        )
+        _bulk(
+            client,
+            ({"_index": index, "_id": c["chunk_id"], "_source": c} for c in changed),
+            threads,
+            chunk_size,
+            stats,
+            "indexed",
+        )
+        stale = [
+            chunk_id
+            for chunk_id, (doc_id, _) in existing.items()
+            if doc_id in seen and chunk_id not in seen[doc_id]
+        ]
+        _bulk(
+            client,
+            ({"_op_type": "delete", "_index": index, "_id": i} for i in stale),
+            threads,
+            chunk_size,
+            stats,
+            "deleted",
+        )
+    finally:
+        # None resets the setting to the index default.
+        client.indices.put_settings(
+            index=index, body={"index": {"refresh_interval": refresh_interval}}
+        )
+        client.indices.refresh(index=index)
+    return stats
+
+
+def write_bulk_file(
+    path: Path,
+    chunks: Iterable[dict[str, Any]],
+    index: str,
+    *,
+    encoder: LsaEncoder | None = None,
+    salt: bytes = b"",
+    batch_size: int = 500,
+) -> IngestStats:
+    """Write chunks as bulk-API NDJSON (e.g. for SEARCH_BACKEND=memory)."""
+    stats = IngestStats()
+    changed = _changed_chunks(chunks, {}, encoder, salt, batch_size, stats, {})
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in changed:
+            action = {"index": {"_index": index, "_id": chunk["chunk_id"]}}
+            f.write(json.dumps(action) + "\n")
+            f.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+            stats.indexed += 1
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Chunk and bulk-index strategy documents into OpenSearch."
+    )
+    parser.add_argument("inputs", nargs="+", help="NDJSON / .txt files, - for stdin")
+    parser.add_argument(
+        "--url", default=os.environ.get("OPENSEARCH_URL", "http://localhost:9200")
+    )
+    parser.add_argument(
+        "--index", default=os.environ.get("OPENSEARCH_INDEX", "strategy-chunks")
+    )
+    parser.add_argument(
+        "--model", type=Path, help="LSA model .npz to embed chunks for hybrid search"
+    )
+    parser.add_argument("--chunk-chars", type=int, default=DEFAULT_CHUNK_CHARS)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument(
+        "--full", action="store_true", help="re-index unchanged chunks too"
+    )
+    parser.add_argument(
+        "--output", type=Path, help="write bulk NDJSON here instead of indexing"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    encoder, salt = None, b""
+    if args.model is not None:
+        from strategy_review_mcp.embeddings import LsaEncoder
+
+        encoder = LsaEncoder.load(args.model)
+        salt = hashlib.sha256(args.model.read_bytes()).digest()
+    chunks = iter_chunks(args.inputs, args.chunk_chars)
+
+    start = time.perf_counter()
+    if args.output is not None:
+        stats = write_bulk_file(
+            args.output, chunks, args.index, encoder=encoder, salt=salt
+        )
+        target = str(args.output)
+    else:
+        user = os.environ.get("OPENSEARCH_USER", "admin")
+        client = OpenSearch(
+            hosts=[args.url],
+            http_auth=(
+                (user, os.environ.get("OPENSEARCH_PASSWORD", "admin")) if user else None
+            ),
+            use_ssl=args.url.startswith("https"),
+            verify_certs=False,
+            timeout=120,
+            pool_maxsize=args.threads,
+        )
+        if not client.indices.exists(index=args.index):
+            raise SystemExit(
+                f"Index {args.index!r} does not exist; create it with "
+                "seed/opensearch/create-index.sh"
+            )
+        stats = ingest(
+            client,
+            args.index,
+            chunks,
+            encoder=encoder,
+            salt=salt,
+            full=args.full,
+            threads=args.threads,
+            chunk_size=args.batch_size,
+        )
+        target = f"{args.url}/{args.index}"
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{stats.read} chunks read, {stats.indexed} indexed, "
+        f"{stats.unchanged} unchanged, {stats.deleted} stale deleted, "
+        f"{stats.failed} failed -> {target} in {elapsed:.1f}s "
+        f"({stats.read / elapsed if elapsed else 0:.0f} chunks/s)"
+    )
+    if stats.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
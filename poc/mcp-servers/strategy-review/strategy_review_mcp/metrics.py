@@ -0,0 +1,265 @@
+"""Per-tool latency, stage timing and response size metrics.
+
+Every tool call is timed end to end ("total") and split into stages timed
+where the work happens: the search backend round trip ("backend") and the
+engine time OpenSearch reports ("took"), hit formatting ("format"), hybrid
+rank fusion ("fuse"), query encoding ("encode"), fitting results into a
+size budget ("budget"), Neo4j queries ("neo4j"), blob downloads ("blob"),
+rendition rendering ("render"), base64 encoding ("base64") and
+serialization of the result ("serialize"). Stages find the
+tool they belong to through a context variable, so helpers need no extra
+arguments and concurrent calls do not mix.
+
+Observations go into fixed-bucket histograms (cheap to record, mergeable,
+and what Prometheus expects); percentiles are interpolated within a bucket.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import math
+import time
+from collections.abc import Iterator, Mapping
+from contextvars import ContextVar
+from typing import Any
+
+# Upper bounds in seconds (1-2.5-5 steps from 100 us to 60 s) and in bytes.
+LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+SIZE_BUCKETS = tuple(float(2**n) for n in range(8, 25, 2))  # 256 B .. 16 MiB
+
+# Stage observations outside any tool call (e.g. the graph summary refresh).
+BACKGROUND = "background"
+
+_current_tool: ContextVar[str] = ContextVar("current_tool", default=BACKGROUND)
+
+
+def current_tool() -> str:
+    """The tool whose call is running in this context (or BACKGROUND)."""
+    return _current_tool.get()
+
+
+class Histogram:
+    """Per-bucket (not cumulative) counts with sum, count and max."""
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile by linear interpolation within its bucket."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / n, self.max)
+            seen += n
+        return self.max
+
+    def summary(self, scale: float = 1.0, digits: int = 3) -> dict[str, Any]:
+        """count, mean, p50/p90/p99 and max, multiplied by ``scale``."""
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": round(self.sum / self.count * scale, digits),
+            "p50": round(self.quantile(0.5) * scale, digits),
+            "p90": round(self.quantile(0.9) * scale, digits),
+            "p99": round(self.quantile(0.99) * scale, digits),
+            "max": round(self.max * scale, digits),
+        }
+
+
+class ToolMetrics:
+    """What is recorded for one tool."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.stages: dict[str, Histogram] = {}
+        self.response_bytes = Histogram(SIZE_BUCKETS)
+
+    def stage(self, name: str) -> Histogram:
+        histogram = self.stages.get(name)
+        if histogram is None:
+            histogram = self.stages[name] = Histogram(LATENCY_BUCKETS)
+        return histogram
+
+
+class Metrics:
+    """Registry of per-tool metrics.
+
+    Recording is plain attribute updates on the event loop thread; worker
+    threads must not record (time around ``asyncio.to_thread`` instead).
+    """
+
+    def __init__(self) -> None:
+        self.tools: dict[str, ToolMetrics] = {}
+        self.started_at = time.time()
+
+    def _tool(self, name: str) -> ToolMetrics:
+        tool = self.tools.get(name)
+        if tool is None:
+            tool = self.tools[name] = ToolMetrics()
+        return tool
+
+    @contextlib.contextmanager
+    def call(self, tool: str) -> Iterator[None]:
+        """Attribute the stages timed inside to ``tool`` and time the call."""
+        token = _current_tool.set(tool)
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self._tool(tool).errors += 1
+            raise
+        finally:
+            metrics = self._tool(tool)
+            metrics.calls += 1
+            metrics.stage("total").observe(time.perf_counter() - start)
+            _current_tool.reset(token)
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a stage of the current tool call (also on error)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Record a stage duration measured elsewhere (e.g. OpenSearch took)."""
+        self._tool(_current_tool.get()).stage(stage).observe(seconds)
+
+    def record_response(self, tool: str, size: int, error: bool) -> None:
+        metrics = self._tool(tool)
+        metrics.response_bytes.observe(size)
+        if error:
+            metrics.errors += 1
+
+    def reset(self) -> None:
+        self.tools.clear()
+        self.started_at = time.time()
+
+    def snapshot(self, tool: str | None = None) -> dict[str, Any]:
+        """Per-tool counts with latency (ms) and response size summaries."""
+        tools = {}
+        for name in sorted(self.tools):
+            if tool is not None and name != tool:
+                continue
+            metrics = self.tools[name]
+            stages = {
+                stage: histogram.summary(scale=1000)
+                for stage, histogram in sorted(metrics.stages.items())
+            }
+            tools[name] = {
+                "calls": metrics.calls,
+                "errors": metrics.errors,
+                "latency_ms": stages.pop("total", {"count": 0}),
+                "stages_ms": stages,
+                "response_bytes": metrics.response_bytes.summary(digits=0),
+            }
+        return {
+            "since": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.started_at)),
+            "tools": tools,
+        }
+
+    def prometheus_text(
+        self,
+        caches: Mapping[str, Mapping[str, Any]],
+        flights: Mapping[str, Mapping[str, Any]],
+    ) -> str:
+        """Render the metrics (and cache hit/miss and coalesced call counters)
+        in the Prometheus text exposition format."""
+        lines: list[str] = []
+
+        def histogram(
+            name: str, help_: str, series: list[tuple[str, Histogram]]
+        ) -> None:
+            lines.append(f"# HELP {name} {help_}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, h in series:
+                cumulative = 0
+                for bound, n in zip((*h.buckets, math.inf), h.counts):
+                    cumulative += n
+                    le = "+Inf" if bound == math.inf else repr(bound)
+                    lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {h.sum!r}")
+                lines.append(f"{name}_count{{{labels}}} {h.count}")
+
+        def counter(name: str, help_: str, series: list[tuple[str, float]]) -> None:
+            lines.append(f"# HELP {name} {help_}")
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(f"{name}{{{labels}}} {value}" for labels, value in series)
+
+        tools = sorted(self.tools.items())
+        histogram(
+            "strategy_review_tool_duration_seconds",
+            "Tool call and stage durations.",
+            [
+                (f'tool="{name}",stage="{stage}"', h)
+                for name, m in tools
+                for stage, h in sorted(m.stages.items())
+            ],
+        )
+        histogram(
+            "strategy_review_tool_response_bytes",
+            "Serialized tool result sizes.",
+            [(f'tool="{name}"', m.response_bytes) for name, m in tools],
+        )
+        counter(
+            "strategy_review_tool_calls_total",
+            "Tool calls.",
+            [(f'tool="{name}"', m.calls) for name, m in tools],
+        )
+        counter(
+            "strategy_review_tool_errors_total",
+            "Tool calls that returned or raised an error.",
+            [(f'tool="{name}"', m.errors) for name, m in tools],
+        )
+        for field in ("hits", "misses"):
+            counter(
+                f"strategy_review_cache_{field}_total",
+                f"Cache {field}.",
+                [(f'cache="{name}"', s[field]) for name, s in caches.items()],
+            )
+        counter(
+            "strategy_review_coalesced_calls_total",
+            "Calls that shared an identical call already in flight.",
+            [(f'flight="{name}"', s["coalesced"]) for name, s in flights.items()],
+        )
+        return "\n".join(lines) + "\n"
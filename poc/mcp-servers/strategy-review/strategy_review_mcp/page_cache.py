@@ -0,0 +1,211 @@
+"""Local on-disk cache for page images.
+
+Each cached page is stored as ``{root}/{blob_name}@{quoted etag}``, so a file's name
+says exactly which version of which blob it holds and a changed blob can never
+be confused with its predecessor. The cache is bounded by a byte budget and
+evicts least-recently-used files first. An in-memory index is built from a
+directory scan on first use, so the cache survives server restarts.
+
+Entries younger than ``max_age`` seconds are served without contacting blob
+storage; older ones are revalidated with a conditional (If-None-Match) request,
+so an unchanged page costs a round trip but no transfer.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote, unquote
+
+logger = logging.getLogger(__name__)
+
+# download(etag) -> (etag, data), or None when the blob still matches ``etag``
+Downloader = Callable[[str | None], Awaitable[tuple[str, bytes] | None]]
+
+
+@dataclass
+class CachedPage:
+    """Index entry for one cached blob version."""
+
+    key: str
+    etag: str
+    path: Path
+    size: int
+    validated_at: float = float("-inf")
+
+
+class PageImageCache:
+    """Byte-bounded LRU cache of blob contents on local disk."""
+
+    def __init__(self, root: Path, max_bytes: int, max_age: float) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._entries: OrderedDict[str, CachedPage] = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    async def fetch(self, key: str, download: Downloader) -> tuple[str, bytes]:
+        """Return ``(etag, data)`` for ``key``, from disk when possible.
+
+        A fresh entry is read straight from disk. A stale entry is revalidated
+        by calling ``download`` with its ETag; anything else is a full
+        download that is then written to the cache.
+        """
+        entry = self.lookup(key)
+        if entry is not None and self._is_fresh(entry):
+            data = self._read(entry)
+            if data is not None:
+                self.hits += 1
+                return entry.etag, data
+            entry = None
+
+        result = await download(entry.etag if entry is not None else None)
+        if result is None and entry is not None:
+            data = self._read(entry)
+            if data is not None:
+                entry.validated_at = time.monotonic()
+                self.revalidated += 1
+                return entry.etag, data
+            # The file vanished between the lookup and the 304 — refetch.
+            result = await download(None)
+        assert result is not None
+        etag, data = result
+        self.misses += 1
+        self.put(key, etag, data)
+        return etag, data
+
+    def get_version(self, key: str, etag: str) -> bytes | None:
+        """Return the bytes cached for ``key`` only if they are version ``etag``.
+
+        Used for derived content (renditions) whose validity follows the ETag
+        of the blob it was derived from rather than its own.
+        """
+        entry = self.lookup(key)
+        if entry is None or entry.etag != etag:
+            self.misses += 1
+            return None
+        data = self._read(entry)
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def lookup(self, key: str) -> CachedPage | None:
+        """Return the cached entry for ``key`` (fresh or not), if any."""
+        if not self.enabled:
+            return None
+        self._load()
+        return self._entries.get(key)
+
+    def put(self, key: str, etag: str, data: bytes) -> CachedPage | None:
+        """Store ``data`` as the current version of ``key``."""
+        if not self.enabled or len(data) > self.max_bytes:
+            return None
+        self._load()
+        path = self._path_for(key, etag)
+        if path is None:
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        previous = self._entries.get(key)
+        if previous is not None and previous.path != path:
+            self._drop(key, unlink=True)
+        elif previous is not None:
+            self._drop(key)
+        entry = CachedPage(key, etag, path, len(data), time.monotonic())
+        self._entries[key] = entry
+        self._total_bytes += entry.size
+        self._evict()
+        return entry
+
+    def _is_fresh(self, entry: CachedPage) -> bool:
+        return time.monotonic() - entry.validated_at < self.max_age
+
+    def _read(self, entry: CachedPage) -> bytes | None:
+        """Read an entry's bytes, or None if its file has disappeared."""
+        try:
+            data = entry.path.read_bytes()
+        except FileNotFoundError:
+            self._drop(entry.key)
+            return None
+        self._entries.move_to_end(entry.key)
+        return data
+
+    def _path_for(self, key: str, etag: str) -> Path | None:
+        path = (self.root / f"{key}@{quote(etag, safe='')}").resolve()
+        if self.root.resolve() not in path.parents:
+            logger.warning("Refusing to cache key outside cache root: %r", key)
+            return None
+        return path
+
+    def _drop(self, key: str, unlink: bool = False) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._total_bytes -= entry.size
+        if unlink:
+            entry.path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest, unlink=True)
+            self.evictions += 1
+
+    def _load(self) -> None:
+        """Rebuild the index from disk, oldest-modified first."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.root.is_dir():
+            return
+        files = sorted(
+            (p for p in self.root.rglob("*@*") if p.is_file()),
+            key=lambda p: p.stat().st_mtime,
+        )
+        for path in files:
+            key, _, etag = path.relative_to(self.root).as_posix().rpartition("@")
+            if key in self._entries:
+                # An older version left behind — the newer file wins.
+                self._drop(key, unlink=True)
+            entry = CachedPage(key, unquote(etag), path, path.stat().st_size)
+            self._entries[key] = entry
+            self._total_bytes += entry.size
+        self._evict()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.revalidated + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "max_age_seconds": self.max_age,
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "hit_rate": (
+                round((self.hits + self.revalidated) / lookups, 4) if lookups else 0.0
+            ),
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,87 @@
+"""Resized / re-encoded page image renditions.
+
+A rendition is a page image scaled down to at most ``max_width`` pixels wide
+and encoded as PNG, JPEG or WebP. Standard renditions can be pre-generated
+at seed time (see ``seed/azurite/seed.py --renditions``) and are stored next
+to the originals as ``{doc_id}/renditions/page_{n:03d}_w{width}_q{quality}.{ext}``;
+anything else is rendered on demand and cached locally.
+
+Pillow is imported by the first ``render`` call (in a worker thread), not
+with this module, so a server that only serves stored images never loads it.
+"""
+
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+
+FORMATS = {"png": "PNG", "jpeg": "JPEG", "webp": "WEBP"}
+
+# Pre-generated by seed/azurite/seed.py --renditions, which imports them from here
+STANDARD_RENDITIONS = (
+    ("webp", 1024, 80),
+    ("webp", 512, 75),
+)
+
+
+@dataclass(frozen=True)
+class RenditionSpec:
+    """Requested output format, maximum width and encoder quality."""
+
+    format: str
+    max_width: int | None
+    quality: int
+
+    @classmethod
+    def parse(
+        cls, format: str | None, max_width: int | None, quality: int | None
+    ) -> RenditionSpec | None:
+        """Validate tool arguments; None means "the original image"."""
+        fmt = (format or "png").lower()
+        if fmt not in FORMATS:
+            raise ValueError(
+                f"Unsupported format '{format}'; use one of {', '.join(FORMATS)}"
+            )
+        if max_width is not None and max_width < 16:
+            raise ValueError("max_width must be at least 16 pixels")
+        quality = 80 if quality is None else quality
+        if not 1 <= quality <= 100:
+            raise ValueError("quality must be between 1 and 100")
+        if fmt == "png" and max_width is None:
+            return None
+        return cls(fmt, max_width, quality)
+
+    @property
+    def content_type(self) -> str:
+        return f"image/{self.format}"
+
+    @property
+    def is_standard(self) -> bool:
+        return (self.format, self.max_width, self.quality) in STANDARD_RENDITIONS
+
+    def suffix(self) -> str:
+        width = self.max_width if self.max_width is not None else "full"
+        return f"w{width}_q{self.quality}.{self.format}"
+
+    def blob_name(self, doc_id: str, page_num: int) -> str:
+        """Blob name of the pre-generated rendition (standard specs only)."""
+        return f"{doc_id}/renditions/page_{page_num:03d}_{self.suffix()}"
+
+
+def render(data: bytes, spec: RenditionSpec) -> bytes:
+    """Downscale (never upscale) and re-encode an image. CPU-bound."""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as img:
+        img.load()
+        if spec.max_width is not None and img.width > spec.max_width:
+            height = max(1, round(img.height * spec.max_width / img.width))
+            img = img.resize((spec.max_width, height), Image.Resampling.LANCZOS)
+        if spec.format == "jpeg" and img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        out = io.BytesIO()
+        if spec.format == "png":
+            img.save(out, format="PNG")
+        else:
+            img.save(out, format=FORMATS[spec.format], quality=spec.quality)
+        return out.getvalue()
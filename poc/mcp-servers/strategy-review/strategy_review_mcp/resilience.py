@@ -0,0 +1,144 @@
+"""Failure handling for calls to replicated services (see OpenSearchBackend).
+
+Three pieces, each aimed at the tail latency of a tool call rather than
+its median:
+
+  - CircuitBreaker: per node; after ``failures`` consecutive failures the
+    node is skipped for ``reset_after`` seconds, then one probe is let
+    through. A node that is down costs nothing instead of an attempt (and
+    a timeout) per request.
+  - backoff_delay: full-jitter exponential backoff between retries, so the
+    retries of many concurrent calls do not arrive at the same moment.
+  - hedged: start an attempt, and if it has not finished after a delay,
+    start the next one (on another node) as well; the first success wins
+    and the others are cancelled. One node's GC pause then costs the hedge
+    delay, not the pause.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class CircuitOpen(Exception):
+    """Every node's circuit breaker is open; the call was not attempted."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one node.
+
+    closed: calls pass; ``failures`` consecutive failures open it.
+    open: calls are refused until ``reset_after`` seconds have passed, then
+    one call at a time is let through as a probe (once per ``reset_after``)
+    until one succeeds and closes it again. ``failures=0`` disables it.
+    A call that is abandoned (``release``) counts neither way.
+    """
+
+    def __init__(
+        self,
+        failures: int,
+        reset_after: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failures = failures
+        self.reset_after = reset_after
+        self._clock = clock
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self.opened = 0  # times it has opened
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._clock() - self.opened_at >= self.reset_after:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go to the node (claims the probe if half open)."""
+        state = self.state
+        if state == "half_open":
+            self.opened_at = self._clock()  # the next probe waits another period
+            self._probing = True
+        return state != "open"
+
+    def release(self) -> None:
+        """Abandon an allowed call without an outcome (e.g. a lost hedge);
+        a probe it held may be claimed again at once."""
+        if self._probing and self.opened_at is not None:
+            self.opened_at = self._clock() - self.reset_after
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._probing = False
+        self.consecutive_failures += 1
+        if self.failures and (
+            self.opened_at is not None or self.consecutive_failures >= self.failures
+        ):
+            if self.opened_at is None:
+                self.opened += 1
+            self.opened_at = self._clock()
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Seconds to wait before retry number ``attempt`` (1-based): uniform
+    between 0 and ``base * 2 ** (attempt - 1)``, at most ``cap``."""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+async def hedged(
+    attempts: Sequence[Callable[[], Awaitable[T]]],
+    delay: float,
+    is_final: Callable[[BaseException], bool] = lambda e: False,
+) -> tuple[T, int]:
+    """Run ``attempts[0]``, starting each next one when nothing has
+    succeeded ``delay`` seconds after the previous start (or at once when
+    one fails). Returns the first result and the index of the attempt that
+    produced it; the attempts still running are cancelled.
+
+    Errors for which ``is_final`` is true (e.g. a malformed query, which
+    every node would reject) are raised at once; otherwise the last error
+    is raised when every attempt has failed.
+    """
+    running: dict[asyncio.Future[Any], int] = {}
+    error: BaseException | None = None
+    started = 0
+    try:
+        while True:
+            # First pass, or nothing succeeded within the delay, or a failure.
+            if started < len(attempts):
+                running[asyncio.ensure_future(attempts[started]())] = started
+                started += 1
+            if not running:
+                assert error is not None
+                raise error
+            done, _ = await asyncio.wait(
+                running,
+                timeout=delay if started < len(attempts) else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                index = running.pop(task)
+                error = task.exception()
+                if error is None:
+                    return task.result(), index
+                if is_final(error):
+                    raise error
+    finally:
+        for task in running:
+            task.cancel()
+            # Retrieve a failure that raced the cancellation, unlogged.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
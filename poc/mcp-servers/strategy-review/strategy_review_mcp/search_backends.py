@@ -0,0 +1,555 @@
+"""Search backends behind search_documents / search_chunks.
+
+The tools build OpenSearch query bodies and format OpenSearch-shaped hits;
+a backend only has to execute them:
+
+  - OpenSearchBackend: AsyncOpenSearch clients against one index, on one or
+                       more nodes, with timeouts, retries, hedging and
+                       circuit breakers (see resilience.py).
+  - MemoryBackend:     an in-process BM25Index loaded from NDJSON, for dev
+                       containers, tests and small deployments that should
+                       not need a JVM service.
+
+Either is wrapped in a TimedBackend that records each round trip as a stage
+of the current tool call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import re
+import secrets
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol, TypeVar
+
+from strategy_review_mcp.metrics import current_tool
+from strategy_review_mcp.resilience import (
+    CircuitBreaker,
+    CircuitOpen,
+    backoff_delay,
+    hedged,
+)
+
+if TYPE_CHECKING:
+    from opensearchpy import AsyncOpenSearch
+
+    from strategy_review_mcp.bm25 import BM25Index
+    from strategy_review_mcp.metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class PointInTimeExpired(Exception):
+    """A search referenced a point in time that has expired or been closed."""
+
+
+class SearchBackend(Protocol):
+    """What the search tools need from a search engine."""
+
+    name: str
+
+    async def search(self, body: dict[str, Any]) -> dict[str, Any]:
+        """Run one search body and return the raw response."""
+        ...
+
+    async def msearch(self, bodies: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Run several bodies; one response (or {"error": ...}) per body."""
+        ...
+
+    async def generation(self) -> tuple[Any, ...] | None:
+        """Identifier that changes whenever the searchable data changes."""
+        ...
+
+    async def open_point_in_time(self, keep_alive: str) -> str:
+        """Pin the current data for paging; bodies reference it as "pit"."""
+        ...
+
+    async def close_point_in_time(self, pit_id: str) -> None:
+        """Release a point in time before its keep-alive runs out."""
+        ...
+
+    async def close(self) -> None:
+        """Release connections and other resources."""
+        ...
+
+    def stats(self) -> dict[str, Any]:
+        """Counters and state for server_stats."""
+        ...
+
+
+# ---------------------------------------------------------------------------
+# OpenSearch
+# ---------------------------------------------------------------------------
+
+
+# Statuses worth another node: overloaded (429) or unavailable (502-504).
+_TRANSIENT_STATUSES = frozenset({429, 502, 503, 504})
+
+
+def _is_transient(error: BaseException) -> bool:
+    """Whether another attempt (on another node) might succeed."""
+    from opensearchpy import ConnectionError, TransportError
+
+    if isinstance(error, ConnectionError):  # incl. timeouts
+        return True
+    return (
+        isinstance(error, TransportError) and error.status_code in _TRANSIENT_STATUSES
+    )
+
+
+def _retryable(error: BaseException) -> bool:
+    """Transient, or a node whose probe was taken between pick and start."""
+    return isinstance(error, CircuitOpen) or _is_transient(error)
+
+
+class _Node:
+    """One OpenSearch node: its own client (connection pool) and breaker."""
+
+    def __init__(self, url: str, breaker: CircuitBreaker):
+        self.url = url
+        self.breaker = breaker
+        self.client: AsyncOpenSearch | None = None
+
+
+class OpenSearchBackend:
+    """Searches one OpenSearch index through lazily created async clients.
+
+    ``url`` may list several nodes, comma-separated. Each node gets its own
+    client with up to ``pool_maxsize`` pooled connections; requests go to
+    the nodes round robin, and the failure handling is done here rather
+    than by opensearch-py's transport (see resilience.py):
+
+      - every call must finish within the running tool's timeout
+        (``tool_timeouts``, else ``timeout``), retries and hedges included;
+        each attempt may take an equal share of the time left;
+      - transient failures (connection errors, timeouts, 429 and 502-504)
+        are retried up to ``retries`` times on the next node after a
+        jittered exponential backoff starting at ``backoff`` seconds;
+      - with ``hedge_after`` set, a read still unanswered after that many
+        seconds (or failed sooner) is also sent to another node and the
+        first answer wins;
+      - a node with ``breaker_failures`` consecutive failures (errors and
+        timeouts; a lost hedge does not count) is skipped for
+        ``breaker_reset`` seconds; when every node is skipped, calls fail
+        at once with CircuitOpen.
+
+    opensearch-py is imported with the first client, so a server on the
+    memory backend never loads it.
+    """
+
+    name = "opensearch"
+
+    def __init__(
+        self,
+        url: str,
+        user: str,
+        password: str,
+        index: str,
+        *,
+        pool_maxsize: int = 10,
+        timeout: float = 30,
+        tool_timeouts: Mapping[str, float] | None = None,
+        retries: int = 0,
+        backoff: float = 0.05,
+        hedge_after: float | None = None,
+        breaker_failures: int = 0,
+        breaker_reset: float = 10,
+    ):
+        self.user = user
+        self.password = password
+        self.index = index
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.tool_timeouts = dict(tool_timeouts or {})
+        self.retries = retries
+        self.backoff = backoff
+        self.hedge_after = hedge_after
+        self.nodes = [
+            _Node(u.strip(), CircuitBreaker(breaker_failures, breaker_reset))
+            for u in url.split(",")
+            if u.strip()
+        ]
+        self._next_node = 0
+        self.retries_sent = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.failed_fast = 0
+
+    def _client(self, node: _Node) -> AsyncOpenSearch:
+        if node.client is None:
+            from opensearchpy import AsyncOpenSearch
+
+            node.client = AsyncOpenSearch(
+                hosts=[node.url],
+                http_auth=(self.user, self.password) if self.user else None,
+                use_ssl=node.url.startswith("https"),
+                verify_certs=False,
+                timeout=self.timeout,
+                pool_maxsize=self.pool_maxsize,
+                max_retries=0,  # retried across nodes by _request
+            )
+        return node.client
+
+    def _pick_nodes(self, count: int) -> list[_Node]:
+        """Up to ``count`` nodes whose breakers are not open, round robin.
+
+        Nothing is claimed here: a hedge candidate may never be sent, so a
+        half-open node's probe is only taken when its attempt starts.
+        """
+        picked: list[_Node] = []
+        start = self._next_node
+        self._next_node = (start + 1) % len(self.nodes)
+        for i in range(len(self.nodes)):
+            node = self.nodes[(start + i) % len(self.nodes)]
+            if node.breaker.state != "open":
+                picked.append(node)
+                if len(picked) == count:
+                    break
+        return picked
+
+    async def _on_node(
+        self,
+        node: _Node,
+        call: Callable[[AsyncOpenSearch, float], Awaitable[T]],
+        deadline: float,
+        hedge: bool = False,
+    ) -> T:
+        if hedge:
+            self.hedges_sent += 1
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            from opensearchpy import ConnectionTimeout
+
+            raise ConnectionTimeout("TIMEOUT", "Tool timeout exceeded", None)
+        if not node.breaker.allow():
+            # Another call took the half-open node's probe since the pick.
+            raise CircuitOpen(f"OpenSearch node {node.url} is failing")
+        try:
+            result = await call(self._client(node), remaining)
+        except asyncio.CancelledError:
+            # A lost hedge or a cancelled tool call says nothing about the
+            # node, which may well be healthy and just slower.
+            node.breaker.release()
+            raise
+        except Exception as e:
+            if _is_transient(e):
+                node.breaker.record_failure()
+            else:
+                node.breaker.record_success()  # the node answered
+            raise
+        node.breaker.record_success()
+        return result
+
+    async def _request(
+        self,
+        call: Callable[[AsyncOpenSearch, float], Awaitable[T]],
+        hedge: bool = True,
+    ) -> T:
+        """Run ``call(client, timeout)`` with the retry, hedging and
+        breaker policy above. Only idempotent reads may be hedged."""
+        timeout = self.tool_timeouts.get(current_tool(), self.timeout)
+        deadline = time.monotonic() + timeout
+        hedge_after = self.hedge_after if hedge else None
+        error: Exception | None = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                delay = backoff_delay(attempt, self.backoff, cap=1.0)
+                if time.monotonic() + delay >= deadline:
+                    break
+                self.retries_sent += 1
+                await asyncio.sleep(delay)
+            nodes = self._pick_nodes(2 if hedge_after is not None else 1)
+            if not nodes:
+                self.failed_fast += 1
+                raise CircuitOpen(
+                    f"All {len(self.nodes)} OpenSearch node(s) are failing; "
+                    "retry shortly"
+                )
+            # An equal share of the time left, so a hung node leaves time
+            # for the retries.
+            now = time.monotonic()
+            attempt_deadline = now + (deadline - now) / (self.retries + 1 - attempt)
+            attempts = [
+                functools.partial(
+                    self._on_node, node, call, attempt_deadline, hedge=i > 0
+                )
+                for i, node in enumerate(nodes)
+            ]
+            try:
+                result, index = await hedged(
+                    attempts, hedge_after or 0.0, is_final=lambda e: not _retryable(e)
+                )
+            except Exception as e:
+                if not _retryable(e):
+                    raise
+                error = e
+                continue
+            if index > 0:
+                self.hedges_won += 1
+            return result
+        assert error is not None
+        raise error
+
+    def stats(self) -> dict[str, Any]:
+        """Breaker state per node, and how often the policy stepped in."""
+        return {
+            "nodes": {
+                node.url: {
+                    "breaker": node.breaker.state,
+                    "opened": node.breaker.opened,
+                }
+                for node in self.nodes
+            },
+            "retries_sent": self.retries_sent,
+            "hedges_sent": self.hedges_sent,
+            "hedges_won": self.hedges_won,
+            "failed_fast": self.failed_fast,
+        }
+
+    async def search(self, body: dict[str, Any]) -> dict[str, Any]:
+        if "pit" not in body:
+            return await self._request(
+                lambda client, timeout: client.search(
+                    index=self.index, body=body, request_timeout=timeout
+                )
+            )
+        from opensearchpy import NotFoundError
+
+        # A point in time already names its indices.
+        try:
+            return await self._request(
+                lambda client, timeout: client.search(
+                    body=body, request_timeout=timeout
+                )
+            )
+        except NotFoundError as e:
+            raise PointInTimeExpired(str(e)) from e
+
+    async def msearch(self, bodies: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        lines: list[dict[str, Any]] = []
+        for body in bodies:
+            lines.append({"index": self.index})
+            lines.append(body)
+        response = await self._request(
+            lambda client, timeout: client.msearch(body=lines, request_timeout=timeout)
+        )
+        return response.get("responses", [])
+
+    async def generation(self) -> tuple[Any, ...] | None:
+        # The concrete indices behind the name (so an alias swap or a
+        # delete-and-recreate changes it) together with their doc counts.
+        rows = await self._request(
+            lambda client, timeout: client.cat.indices(
+                index=self.index,
+                format="json",
+                h="index,uuid,docs.count",
+                request_timeout=timeout,
+            )
+        )
+        return tuple(sorted((r["index"], r["uuid"], r["docs.count"]) for r in rows))
+
+    async def open_point_in_time(self, keep_alive: str) -> str:
+        # Not hedged: each attempt that gets through opens a point in time.
+        response = await self._request(
+            lambda client, timeout: client.create_pit(
+                index=self.index,
+                params={"keep_alive": keep_alive},
+                request_timeout=timeout,
+            ),
+            hedge=False,
+        )
+        return response["pit_id"]
+
+    async def close_point_in_time(self, pit_id: str) -> None:
+        await self._request(
+            lambda client, timeout: client.delete_pit(
+                body={"pit_id": [pit_id]}, request_timeout=timeout
+            ),
+            hedge=False,
+        )
+
+    async def close(self) -> None:
+        for node in self.nodes:
+            if node.client is not None:
+                await node.client.close()
+                node.client = None
+
+
+# ---------------------------------------------------------------------------
+# In-memory BM25
+# ---------------------------------------------------------------------------
+
+_TIME_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def _time_value_seconds(value: str) -> float:
+    """Seconds in an OpenSearch time value such as "30s" or "5m"."""
+    match = re.fullmatch(r"(\d+)(ms|s|m|h|d)", value.strip())
+    if match is None:
+        raise ValueError(f"Invalid time value: {value!r}")
+    return int(match[1]) * _TIME_UNITS[match[2]]
+
+
+class MemoryBackend:
+    """Searches chunks held in process by a NumPy BM25 index.
+
+    The NDJSON file is loaded on the first search (in a worker thread, so
+    the event loop keeps serving other tools) and reloaded when its
+    modification time changes, which also bumps the generation and so
+    flushes the search result cache. Chunks without stored vectors are
+    embedded at load time with the encoder at ``model_path``, if present.
+
+    A point in time keeps a reference to the index it was opened on, so
+    pages keep coming from that snapshot after a reload.
+    """
+
+    name = "memory"
+
+    def __init__(self, path: Path, model_path: Path | None = None):
+        self.path = path
+        self.model_path = model_path
+        self._index: BM25Index | None = None
+        self._loaded_mtime: int | None = None
+        self._lock = asyncio.Lock()
+        # pit id -> (pinned index, expiry on the monotonic clock)
+        self._snapshots: dict[str, tuple[BM25Index, float]] = {}
+
+    async def _get_index(self) -> BM25Index:
+        mtime = self.path.stat().st_mtime_ns
+        if self._index is not None and mtime == self._loaded_mtime:
+            return self._index
+        async with self._lock:
+            if self._index is None or mtime != self._loaded_mtime:
+                self._index = await asyncio.to_thread(self._load)
+                self._loaded_mtime = mtime
+                logger.info(
+                    "Loaded %d chunks into the memory backend from %s",
+                    len(self._index),
+                    self.path,
+                )
+        return self._index
+
+    def _load(self) -> BM25Index:
+        from strategy_review_mcp.bm25 import BM25Index
+
+        index = BM25Index.from_ndjson(self.path)
+        if index.vectors is None and self.model_path and self.model_path.exists():
+            from strategy_review_mcp.embeddings import LsaEncoder, embedding_text
+
+            encoder = LsaEncoder.load(self.model_path)
+            index.set_vectors(encoder.encode([embedding_text(d) for d in index.docs]))
+        return index
+
+    async def search(self, body: dict[str, Any]) -> dict[str, Any]:
+        if "pit" not in body:
+            return (await self._get_index()).search(body)
+        pit = body["pit"]
+        self._expire_snapshots()
+        if pit["id"] not in self._snapshots:
+            raise PointInTimeExpired(f"No point in time {pit['id']!r}")
+        index, expiry = self._snapshots[pit["id"]]
+        if "keep_alive" in pit:
+            expiry = time.monotonic() + _time_value_seconds(pit["keep_alive"])
+            self._snapshots[pit["id"]] = (index, expiry)
+        response = index.search(body)
+        response["pit_id"] = pit["id"]
+        return response
+
+    async def msearch(self, bodies: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        index = await self._get_index()
+        responses: list[dict[str, Any]] = []
+        for body in bodies:
+            try:
+                responses.append(index.search(body))
+            except ValueError as e:
+                responses.append({"error": {"type": "query_error", "reason": str(e)}})
+        return responses
+
+    async def generation(self) -> tuple[Any, ...] | None:
+        index = await self._get_index()
+        return (str(self.path), self._loaded_mtime, len(index))
+
+    def _expire_snapshots(self) -> None:
+        now = time.monotonic()
+        for pit_id in [p for p, (_, exp) in self._snapshots.items() if exp <= now]:
+            del self._snapshots[pit_id]
+
+    async def open_point_in_time(self, keep_alive: str) -> str:
+        index = await self._get_index()
+        self._expire_snapshots()
+        pit_id = secrets.token_urlsafe(16)
+        expiry = time.monotonic() + _time_value_seconds(keep_alive)
+        self._snapshots[pit_id] = (index, expiry)
+        return pit_id
+
+    async def close_point_in_time(self, pit_id: str) -> None:
+        self._snapshots.pop(pit_id, None)
+
+    async def close(self) -> None:
+        self._index = None
+        self._loaded_mtime = None
+        self._snapshots.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "chunks": len(self._index) if self._index is not None else None,
+            "points_in_time": len(self._snapshots),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Instrumentation
+# ---------------------------------------------------------------------------
+
+
+class TimedBackend:
+    """Times every call of another backend as the "backend" stage.
+
+    Search responses that report OpenSearch's own ``took`` also record it as
+    the "took" stage, so engine time can be told apart from client, HTTP and
+    deserialization time. For msearch this is the slowest response's took.
+    """
+
+    def __init__(self, backend: SearchBackend, metrics: Metrics):
+        self.backend = backend
+        self.metrics = metrics
+        self.name = backend.name
+
+    async def search(self, body: dict[str, Any]) -> dict[str, Any]:
+        with self.metrics.stage("backend"):
+            response = await self.backend.search(body)
+        if "took" in response:
+            self.metrics.observe("took", response["took"] / 1000)
+        return response
+
+    async def msearch(self, bodies: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        with self.metrics.stage("backend"):
+            responses = await self.backend.msearch(bodies)
+        took = [r["took"] for r in responses if "took" in r]
+        if took:
+            self.metrics.observe("took", max(took) / 1000)
+        return responses
+
+    async def generation(self) -> tuple[Any, ...] | None:
+        with self.metrics.stage("backend"):
+            return await self.backend.generation()
+
+    async def open_point_in_time(self, keep_alive: str) -> str:
+        with self.metrics.stage("backend"):
+            return await self.backend.open_point_in_time(keep_alive)
+
+    async def close_point_in_time(self, pit_id: str) -> None:
+        with self.metrics.stage("backend"):
+            await self.backend.close_point_in_time(pit_id)
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def stats(self) -> dict[str, Any]:
+        return {"name": self.name, **self.backend.stats()}
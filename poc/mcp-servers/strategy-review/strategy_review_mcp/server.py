@@ -1,31 +1,157 @@
 """Strategy Review MCP Server.
 
-Exposes three tools via FastMCP (stdio transport):
-  - search_documents: BM25 document-level search on OpenSearch
-  - search_chunks: Granular chunk-level search with optional doc_id filter
-  - get_page_image: Retrieve a page image from Azurite blob storage (base64)
+Exposes twelve tools via FastMCP, over stdio (one client per process) or
+Streamable HTTP (one shared process for many clients, see main):
+  - search_documents: BM25 (or hybrid BM25 + kNN) document-level search
+  - search_chunks: Granular chunk-level search with optional doc_id filter,
+    paged with opaque cursors (point in time + search_after)
+  - search_documents_batch / search_chunks_batch: Many queries in one _msearch
+  - get_chunk_context: The chunks before and after a hit, by chunk_order
+  - facet_counts: Chunk and document counts per theme, country, organization,
+    year and document for a query, in one aggregation request
+  - graph_search: Resolve a theme / country / funding area in the Neo4j
+    knowledge graph and search the chunks of the linked documents
+  - get_graph_summary: Document themes, theme indicators and funding,
+    funding allocations and country priorities, answered from memory
+  - get_page_image: Retrieve a page image from Azurite blob storage
+  - get_page_images: Several pages of one document, downloaded concurrently
+  - cache_stats: Hit/miss counters for the search, chunk context and page
+    image caches, and counts of coalesced calls
+  - server_stats: Per-tool latency percentiles split by stage, result sizes,
+    error counts and cache hit rates (see metrics.py)
+
+Searches run on a pluggable backend chosen by SEARCH_BACKEND: OpenSearch
+(the default; one or more nodes, with per-tool timeouts, jittered retries,
+optional hedged requests and circuit breakers, see resilience.py) or an
+embedded NumPy BM25 index loaded from the seed NDJSON, which needs no JVM
+service. With mode="hybrid" the lexical query and a kNN
+query over TF-IDF/LSA chunk vectors (fitted at seed time, see embeddings.py)
+run in one msearch and are fused with reciprocal rank fusion.
+
+search_documents and search_chunks take an optional max_chars / max_tokens
+budget; results beyond it are dropped or cut at a sentence (see budget.py),
+so long chunk texts do not swell every later model call in the chat.
+
+All tools are async and share lazily created async clients (the search
+backend and azure.storage.blob.aio), so concurrent tool calls from one chat
+turn overlap instead of queueing behind each other on the event loop.
+
+Search results are cached in-process (LRU + TTL) and the cache is flushed
+whenever the index generation changes, e.g. after a reseed; concurrent
+identical searches and page fetches wait for the one already in flight
+rather than making their own (see cache.SingleFlight). Page images are
+cached on local disk and revalidated against blob storage by ETag; resized
+JPEG/WebP renditions are served from pre-generated blobs when seeded and are
+otherwise rendered on demand and cached alongside the originals. Images are
+returned as native MCP image content blocks.
 """
 
 from __future__ import annotations
 
+import argparse
+import asyncio
 import base64
+import contextlib
+import functools
+import importlib
+import json
 import logging
+import mimetypes
 import os
-from typing import Any
+import re
+import time
+from collections.abc import AsyncIterator, Callable, Hashable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
 
-from azure.core.credentials import AzureNamedKeyCredential
-from azure.storage.blob import BlobServiceClient
+import pydantic_core
 from mcp.server.fastmcp import FastMCP
-from opensearchpy import OpenSearch
+from mcp.types import ContentBlock, ImageContent, TextContent
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from typing_extensions import NotRequired, TypedDict
+
+from strategy_review_mcp.budget import (
+    budget_chars,
+    fit_field,
+    fit_results,
+    fit_wrapped,
+    result_chars,
+)
+from strategy_review_mcp.cache import SingleFlight, TTLCache, normalize_query
+from strategy_review_mcp.graph_summary import SECTIONS, GraphSummary, load_summary
+from strategy_review_mcp.metrics import Metrics
+from strategy_review_mcp.page_cache import PageImageCache
+from strategy_review_mcp.renditions import RenditionSpec, render
+from strategy_review_mcp.search_backends import (
+    MemoryBackend,
+    OpenSearchBackend,
+    PointInTimeExpired,
+    SearchBackend,
+    TimedBackend,
+)
+
+# The Azure Storage and Neo4j SDKs (and opensearch-py, see search_backends)
+# and NumPy (query encoding) are imported on first use, or in the background
+# by _prewarm: eagerly, they made up about half of the import time spent
+# before the server could answer.
+if TYPE_CHECKING:
+    from azure.storage.blob.aio import BlobServiceClient
+    from neo4j import AsyncDriver
+
+    from strategy_review_mcp.embeddings import LsaEncoder
 
 # ---------------------------------------------------------------------------
 # Configuration — read from environment with sensible defaults
 # ---------------------------------------------------------------------------
 
+# One node, or several comma-separated (requests go round robin)
 OPENSEARCH_URL = os.environ.get("OPENSEARCH_URL", "http://localhost:9200")
 OPENSEARCH_USER = os.environ.get("OPENSEARCH_USER", "admin")
 OPENSEARCH_PASSWORD = os.environ.get("OPENSEARCH_PASSWORD", "admin")
 OPENSEARCH_INDEX = os.environ.get("OPENSEARCH_INDEX", "strategy-chunks")
+# Pooled connections per node; keep near MAX_CONCURRENT_CALLS so bursts
+# do not queue for a connection
+OPENSEARCH_POOL_MAXSIZE = int(os.environ.get("OPENSEARCH_POOL_MAXSIZE", "32"))
+# Time a tool's search request may take, retries and hedges included, with
+# per-tool overrides as "tool=seconds,..." (e.g. "facet_counts=5")
+OPENSEARCH_TIMEOUT_SECONDS = float(os.environ.get("OPENSEARCH_TIMEOUT_SECONDS", "10"))
+OPENSEARCH_TOOL_TIMEOUTS = {
+    tool.strip(): float(seconds)
+    for tool, _, seconds in (
+        item.partition("=")
+        for item in os.environ.get("OPENSEARCH_TOOL_TIMEOUTS", "").split(",")
+        if item.strip()
+    )
+}
+# Retries of connection errors, timeouts, 429 and 502-504 on the next node,
+# after a full-jitter exponential backoff starting at OPENSEARCH_BACKOFF_MS
+OPENSEARCH_RETRIES = int(os.environ.get("OPENSEARCH_RETRIES", "2"))
+OPENSEARCH_BACKOFF_MS = float(os.environ.get("OPENSEARCH_BACKOFF_MS", "50"))
+# Also send a read to a second node when the first has not answered after
+# this long (0 = off; set it near the healthy p95 search latency)
+OPENSEARCH_HEDGE_AFTER_MS = float(os.environ.get("OPENSEARCH_HEDGE_AFTER_MS", "0"))
+# Skip a node for OPENSEARCH_BREAKER_RESET_SECONDS after this many
+# consecutive failures (0 = off); with every node skipped, fail at once
+OPENSEARCH_BREAKER_FAILURES = int(os.environ.get("OPENSEARCH_BREAKER_FAILURES", "5"))
+OPENSEARCH_BREAKER_RESET_SECONDS = float(
+    os.environ.get("OPENSEARCH_BREAKER_RESET_SECONDS", "10")
+)
+
+_SEED_DIR = Path(__file__).resolve().parents[3] / "seed" / "opensearch"
+
+# "opensearch" or "memory" (in-process BM25 over MEMORY_INDEX_PATH)
+SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", "opensearch").lower()
+MEMORY_INDEX_PATH = Path(
+    os.environ.get("MEMORY_INDEX_PATH", _SEED_DIR / "chunks.ndjson")
+)
+
+# Query encoder for mode="hybrid", written by seed/opensearch/seed.sh
+EMBEDDING_MODEL_PATH = Path(
+    os.environ.get("EMBEDDING_MODEL_PATH", _SEED_DIR / "lsa-model.npz")
+)
 
 # Azurite well-known dev credentials (constant — only endpoint varies by environment)
 _AZURITE_ACCOUNT_NAME = "devstoreaccount1"
@@ -38,48 +164,123 @@ AZURE_BLOB_ENDPOINT = os.environ.get(
 )
 AZURE_STORAGE_CONTAINER = os.environ.get("AZURE_STORAGE_CONTAINER", "strategy-pages")
 
-logger = logging.getLogger(__name__)
+# Neo4j knowledge graph, joined with the index by graph_search
+NEO4J_URI = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
+NEO4J_USER = os.environ.get("NEO4J_USER", "neo4j")
+NEO4J_PASSWORD = os.environ.get("NEO4J_PASSWORD", "password")
+NEO4J_DATABASE = os.environ.get("NEO4J_DATABASE", "neo4j")
+NEO4J_POOL_SIZE = int(os.environ.get("NEO4J_POOL_SIZE", "10"))
+# The in-memory graph summary is loaded on first use and re-read on the first
+# use after it is older than GRAPH_SUMMARY_MAX_AGE_SECONDS
+GRAPH_SUMMARY_MAX_AGE_SECONDS = float(
+    os.environ.get("GRAPH_SUMMARY_MAX_AGE_SECONDS", "300")
+)
+# Also re-read it in the background this often (0 = never; opt-in, because it
+# connects to Neo4j as soon as the server starts)
+GRAPH_SUMMARY_REFRESH_SECONDS = float(
+    os.environ.get("GRAPH_SUMMARY_REFRESH_SECONDS", "0")
+)
 
-# ---------------------------------------------------------------------------
-# FastMCP server instance
-# ---------------------------------------------------------------------------
+# Search result cache — set QUERY_CACHE_SIZE=0 to disable
+QUERY_CACHE_SIZE = int(os.environ.get("QUERY_CACHE_SIZE", "256"))
+QUERY_CACHE_TTL_SECONDS = float(os.environ.get("QUERY_CACHE_TTL_SECONDS", "300"))
+# Concurrent identical searches and page fetches share one backend call —
+# set COALESCE_CALLS=0 to disable
+COALESCE_CALLS = os.environ.get("COALESCE_CALLS", "1") == "1"
+# How often (at most) the index generation is re-read from OpenSearch
+INDEX_GENERATION_CHECK_SECONDS = float(
+    os.environ.get("INDEX_GENERATION_CHECK_SECONDS", "15")
+)
 
-mcp = FastMCP(
-    "Strategy Review",
-    instructions=(
-        "Search strategy documents and retrieve page images. "
-        "Backed by OpenSearch (BM25) and Azure Blob Storage (Azurite)."
-    ),
+# Highlighted snippets in search results (characters per fragment, fragments)
+SNIPPET_FRAGMENT_SIZE = int(os.environ.get("SNIPPET_FRAGMENT_SIZE", "150"))
+SNIPPET_FRAGMENTS = int(os.environ.get("SNIPPET_FRAGMENTS", "2"))
+
+# Documents whose fetched chunk ranges are kept for get_chunk_context
+CHUNK_CONTEXT_CACHE_DOCS = int(os.environ.get("CHUNK_CONTEXT_CACHE_DOCS", "64"))
+
+# How long a search_chunks cursor stays valid after each page
+PAGINATION_KEEP_ALIVE = os.environ.get("PAGINATION_KEEP_ALIVE", "5m")
+
+# Local page image cache — set PAGE_CACHE_MAX_BYTES=0 to disable
+PAGE_CACHE_DIR = Path(
+    os.environ.get(
+        "PAGE_CACHE_DIR",
+        Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+        / "strategy-review-mcp"
+        / "pages",
+    )
 )
+PAGE_CACHE_MAX_BYTES = int(os.environ.get("PAGE_CACHE_MAX_BYTES", str(256 * 2**20)))
+# Cached pages younger than this are served without an ETag revalidation
+PAGE_CACHE_MAX_AGE_SECONDS = float(os.environ.get("PAGE_CACHE_MAX_AGE_SECONDS", "60"))
+# Concurrent blob downloads per get_page_images call
+PAGE_FETCH_CONCURRENCY = int(os.environ.get("PAGE_FETCH_CONCURRENCY", "8"))
+
+# Tool metrics in the Prometheus text format (e.g. for node_exporter's
+# textfile collector), rewritten every METRICS_WRITE_SECONDS; unset = off
+METRICS_PROMETHEUS_PATH = os.environ.get("METRICS_PROMETHEUS_PATH")
+METRICS_WRITE_SECONDS = float(os.environ.get("METRICS_WRITE_SECONDS", "15"))
+
+# Transport used by main() (overridable on the command line): "stdio", or
+# "http" for Streamable HTTP at http://MCP_HTTP_HOST:MCP_HTTP_PORT/mcp
+MCP_TRANSPORT = os.environ.get("MCP_TRANSPORT", "stdio")
+MCP_HTTP_HOST = os.environ.get("MCP_HTTP_HOST", "127.0.0.1")
+MCP_HTTP_PORT = int(os.environ.get("MCP_HTTP_PORT", "8765"))
+# Tool calls run at once; further calls wait for a slot (0 = unlimited)
+MAX_CONCURRENT_CALLS = int(os.environ.get("MAX_CONCURRENT_CALLS", "64"))
+# Import the backend SDKs and open the search, blob and Neo4j connections in
+# the background at startup, so the first tool call does not pay for them
+PREWARM_CLIENTS = os.environ.get("PREWARM_CLIENTS", "0") == "1"
+
+logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Lazy client singletons (created on first use, not at import time)
 # ---------------------------------------------------------------------------
 
-_opensearch_client: OpenSearch | None = None
+_search_backend: SearchBackend | None = None
 _blob_service_client: BlobServiceClient | None = None
+_neo4j_driver: AsyncDriver | None = None
 
 
-def _get_opensearch_client() -> OpenSearch:
-    """Return a singleton OpenSearch client, creating it on first call."""
-    global _opensearch_client
-    if _opensearch_client is None:
-        _opensearch_client = OpenSearch(
-            hosts=[OPENSEARCH_URL],
-            http_auth=(OPENSEARCH_USER, OPENSEARCH_PASSWORD)
-            if OPENSEARCH_USER
-            else None,
-            use_ssl=OPENSEARCH_URL.startswith("https"),
-            verify_certs=False,
-            timeout=30,
-        )
-    return _opensearch_client
+def _get_search_backend() -> SearchBackend:
+    """Return the singleton search backend selected by SEARCH_BACKEND."""
+    global _search_backend
+    if _search_backend is None:
+        backend: SearchBackend
+        if SEARCH_BACKEND == "opensearch":
+            backend = OpenSearchBackend(
+                OPENSEARCH_URL,
+                OPENSEARCH_USER,
+                OPENSEARCH_PASSWORD,
+                OPENSEARCH_INDEX,
+                pool_maxsize=OPENSEARCH_POOL_MAXSIZE,
+                timeout=OPENSEARCH_TIMEOUT_SECONDS,
+                tool_timeouts=OPENSEARCH_TOOL_TIMEOUTS,
+                retries=OPENSEARCH_RETRIES,
+                backoff=OPENSEARCH_BACKOFF_MS / 1000,
+                hedge_after=OPENSEARCH_HEDGE_AFTER_MS / 1000 or None,
+                breaker_failures=OPENSEARCH_BREAKER_FAILURES,
+                breaker_reset=OPENSEARCH_BREAKER_RESET_SECONDS,
+            )
+        elif SEARCH_BACKEND == "memory":
+            backend = MemoryBackend(MEMORY_INDEX_PATH, EMBEDDING_MODEL_PATH)
+        else:
+            raise ValueError(
+                f"Unknown SEARCH_BACKEND '{SEARCH_BACKEND}'; use opensearch or memory"
+            )
+        _search_backend = TimedBackend(backend, _metrics)
+    return _search_backend
 
 
 def _get_blob_service_client() -> BlobServiceClient:
-    """Return a singleton BlobServiceClient, creating it on first call."""
+    """Return a singleton async BlobServiceClient, creating it on first call."""
     global _blob_service_client
     if _blob_service_client is None:
+        from azure.core.credentials import AzureNamedKeyCredential
+        from azure.storage.blob.aio import BlobServiceClient
+
         _blob_service_client = BlobServiceClient(
             account_url=AZURE_BLOB_ENDPOINT,
             credential=AzureNamedKeyCredential(
@@ -90,243 +291,2184 @@ def _get_blob_service_client() -> BlobServiceClient:
     return _blob_service_client
 
 
+def _get_neo4j_driver() -> AsyncDriver:
+    """Return a singleton async Neo4j driver (one connection pool) on first call."""
+    global _neo4j_driver
+    if _neo4j_driver is None:
+        from neo4j import AsyncGraphDatabase
+
+        _neo4j_driver = AsyncGraphDatabase.driver(
+            NEO4J_URI,
+            auth=(NEO4J_USER, NEO4J_PASSWORD),
+            max_connection_pool_size=NEO4J_POOL_SIZE,
+        )
+    return _neo4j_driver
+
+
+async def _close_clients() -> None:
+    """Close the shared async clients so their HTTP sessions are released."""
+    global _search_backend, _blob_service_client, _neo4j_driver
+    if _search_backend is not None:
+        await _search_backend.close()
+        _search_backend = None
+    if _blob_service_client is not None:
+        await _blob_service_client.close()
+        _blob_service_client = None
+    if _neo4j_driver is not None:
+        await _neo4j_driver.close()
+        _neo4j_driver = None
+
+
 # ---------------------------------------------------------------------------
-# Tool: search_documents
+# Search result cache
 # ---------------------------------------------------------------------------
 
+_query_cache = TTLCache(maxsize=QUERY_CACHE_SIZE, ttl=QUERY_CACHE_TTL_SECONDS)
+# Searches in flight, by cache key (see cache.SingleFlight)
+_search_flight = SingleFlight(enabled=COALESCE_CALLS)
+_index_generation: tuple[Any, ...] | None = None
+_index_generation_checked_at = float("-inf")
 
-@mcp.tool()
-def search_documents(query: str, top_k: int = 5) -> list[dict[str, Any]]:
-    """Search strategy documents by keyword query.
 
-    Performs a BM25 multi_match search across document titles and chunk text,
-    then aggregates results at the document level. Returns the top-scoring
-    documents with their best matching chunk as a preview snippet.
+async def _get_index_generation() -> tuple[Any, ...] | None:
+    """Return an identifier for the current contents of the search backend.
 
-    Args:
-        query: The search query string (e.g. "maternal health", "TB elimination").
-        top_k: Maximum number of documents to return. Defaults to 5.
+    For OpenSearch this is the set of concrete indices behind OPENSEARCH_INDEX
+    with their doc counts; for the memory backend, the loaded file version.
+    It is re-read at most every INDEX_GENERATION_CHECK_SECONDS; None means it
+    could not be determined.
+    """
+    global _index_generation, _index_generation_checked_at
+    now = time.monotonic()
+    if now - _index_generation_checked_at < INDEX_GENERATION_CHECK_SECONDS:
+        return _index_generation
+    _index_generation_checked_at = now
+    try:
+        _index_generation = await _get_search_backend().generation()
+    except Exception:
+        logger.warning("Could not read index generation", exc_info=True)
+        _index_generation = None
+    return _index_generation
 
-    Returns:
-        A list of document results, each containing doc_id, doc_title,
-        doc_year, organization, score, snippet, section, page_number,
-        and themes.
+
+async def _cache_get(key: Hashable, cache: TTLCache = _query_cache) -> Any | None:
+    """Look up a cached search result, flushing the cache on a reseed."""
+    if not cache.enabled:
+        return None
+    cache.sync_generation(await _get_index_generation())
+    return cache.get(key)
+
+
+# ---------------------------------------------------------------------------
+# Page image cache
+# ---------------------------------------------------------------------------
+
+_page_cache = PageImageCache(
+    root=PAGE_CACHE_DIR,
+    max_bytes=PAGE_CACHE_MAX_BYTES,
+    max_age=PAGE_CACHE_MAX_AGE_SECONDS,
+)
+# Page fetches in flight, by (doc_id, page_num, rendition spec)
+_page_flight = SingleFlight(enabled=COALESCE_CALLS)
+# Pre-generated rendition blobs known not to exist (re-checked after the TTL)
+_missing_renditions = TTLCache(maxsize=4096, ttl=PAGE_CACHE_MAX_AGE_SECONDS)
+
+
+async def _download_blob(blob_name: str, etag: str | None) -> tuple[str, bytes] | None:
+    """Download a blob, or return None if it still matches ``etag``.
+
+    With an ETag the request carries If-None-Match, so an unchanged blob is
+    answered with a bodiless 304.
     """
+    from azure.core import MatchConditions
+    from azure.core.exceptions import HttpResponseError
+
+    blob_client = _get_blob_service_client().get_blob_client(
+        AZURE_STORAGE_CONTAINER, blob_name
+    )
+    kwargs: dict[str, Any] = {}
+    if etag is not None:
+        kwargs = {"etag": etag, "match_condition": MatchConditions.IfModified}
     try:
-        client = _get_opensearch_client()
-
-        body: dict[str, Any] = {
-            "size": top_k * 5,
-            "query": {
-                "multi_match": {
-                    "query": query,
-                    "fields": ["doc_title^2", "chunk_text"],
-                    "type": "best_fields",
-                }
-            },
-            "_source": [
-                "doc_id",
-                "doc_title",
-                "doc_year",
-                "organization",
-                "chunk_text",
-                "section",
-                "page_number",
-                "themes",
-            ],
-        }
+        with _metrics.stage("blob"):
+            download = await blob_client.download_blob(**kwargs)
+            data = await download.readall()
+    except HttpResponseError as e:
+        # The storage SDK re-wraps 304 as a plain HttpResponseError.
+        if e.status_code == 304:
+            return None
+        raise
+    return download.properties.etag, data
 
-        response = client.search(index=OPENSEARCH_INDEX, body=body)
-        hits = response.get("hits", {}).get("hits", [])
-
-        # Aggregate: keep only the top-scoring chunk per doc_id
-        docs: dict[str, dict[str, Any]] = {}
-        for hit in hits:
-            src = hit["_source"]
-            did = src["doc_id"]
-            score = hit["_score"]
-            if did not in docs or score > docs[did]["score"]:
-                docs[did] = {
-                    "doc_id": did,
-                    "doc_title": src.get("doc_title", ""),
-                    "doc_year": src.get("doc_year"),
-                    "organization": src.get("organization", ""),
-                    "score": score,
-                    "snippet": src.get("chunk_text", "")[:500],
-                    "section": src.get("section", ""),
-                    "page_number": src.get("page_number"),
-                    "themes": src.get("themes", []),
-                }
 
-        results = sorted(docs.values(), key=lambda d: d["score"], reverse=True)
-        return results[:top_k]
+# ---------------------------------------------------------------------------
+# Tool metrics (see metrics.py)
+# ---------------------------------------------------------------------------
 
-    except Exception as e:
-        logger.exception("search_documents failed")
-        return [{"error": f"Search failed: {e}"}]
+_metrics = Metrics()
+
+
+def _is_error(result: Any) -> bool:
+    """Whether a tool result is an error dict (possibly the only list item or
+    the only JSON text block)."""
+    if isinstance(result, list) and len(result) == 1:
+        result = result[0]
+        if isinstance(result, TextContent):
+            return result.text.startswith('{"error"')
+    return isinstance(result, dict) and "error" in result
+
+
+# Bounds concurrent tool calls; set by main() from MAX_CONCURRENT_CALLS.
+_call_slots: asyncio.Semaphore | None = None
+
+
+@asynccontextmanager
+async def _call_slot() -> AsyncIterator[None]:
+    """Hold one of the MAX_CONCURRENT_CALLS slots, timing the wait as the
+    "queue" stage."""
+    if _call_slots is None:
+        yield
+        return
+    with _metrics.stage("queue"):
+        await _call_slots.acquire()
+    try:
+        yield
+    finally:
+        _call_slots.release()
+
+
+def _instrumented(tool: Callable[..., Any]) -> Callable[..., Any]:
+    """Run a tool in a call slot and record its latency, stage timings,
+    result size and errors.
+
+    The result size is that of its JSON text content, serialized the way
+    FastMCP does it (pydantic_core, indented) and timed as the "serialize"
+    stage; image content blocks are measured without re-serializing their
+    base64 data.
+    """
+    name = tool.__name__
+
+    @functools.wraps(tool)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with _metrics.call(name):
+            async with _call_slot():
+                result = await tool(*args, **kwargs)
+            if (
+                isinstance(result, list)
+                and result
+                and isinstance(result[0], (TextContent, ImageContent))
+            ):
+                size = sum(
+                    len(b.text if isinstance(b, TextContent) else b.data)
+                    for b in result
+                )
+            else:
+                with _metrics.stage("serialize"):
+                    size = len(pydantic_core.to_json(result, fallback=str, indent=2))
+        _metrics.record_response(name, size, _is_error(result))
+        return result
+
+    return wrapper
+
+
+def _prometheus_text() -> str:
+    caches = _cache_stats()
+    return _metrics.prometheus_text(
+        {name: caches[name] for name in ("search", "chunk_context", "page_images")},
+        caches["coalescing"],
+    )
+
+
+async def _write_prometheus_forever() -> None:
+    """Rewrite METRICS_PROMETHEUS_PATH every METRICS_WRITE_SECONDS.
+
+    The file is replaced atomically, so a scraper never reads half of it.
+    """
+    path = Path(METRICS_PROMETHEUS_PATH)
+    tmp = path.with_name(path.name + ".tmp")
+    while True:
+        try:
+            tmp.write_text(_prometheus_text())
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("Could not write metrics to %s: %s", path, e)
+        await asyncio.sleep(METRICS_WRITE_SECONDS)
 
 
 # ---------------------------------------------------------------------------
-# Tool: search_chunks
+# FastMCP server instance
 # ---------------------------------------------------------------------------
 
 
-@mcp.tool()
-def search_chunks(
-    query: str, doc_id: str | None = None, top_k: int = 5
-) -> list[dict[str, Any]]:
-    """Search within strategy document chunks at a granular level.
+async def _import_in_thread(*modules: str) -> None:
+    """Import modules in a worker thread: the event loop keeps getting the
+    GIL every switch interval instead of stalling for the whole import."""
+    await asyncio.to_thread(lambda: [importlib.import_module(m) for m in modules])
 
-    Performs a BM25 match on chunk_text with an optional doc_id filter
-    to restrict results to a specific document.
 
-    Args:
-        query: The search query string.
-        doc_id: Optional document ID to filter chunks (e.g. "GH_2024").
-            If None, searches across all documents.
-        top_k: Maximum number of chunks to return. Defaults to 5.
+async def _prewarm() -> None:
+    """Import the backend SDKs (and Pillow, for renditions) and open a
+    connection to each data store.
 
-    Returns:
-        A list of chunk results, each containing chunk_id, doc_id,
-        doc_title, score, chunk_text, section, page_number, themes,
-        countries, and chunk_order.
+    Each store gets one cheap request: the index generation (which also
+    loads the memory backend's index and saves the first search its own
+    generation check), the container's properties and a Bolt connectivity
+    check. Failures are only logged; the tools report them when called.
+    """
+    start = time.perf_counter()
+    with _metrics.stage("prewarm"):
+        modules = ["azure.storage.blob.aio", "neo4j", "PIL.Image"]
+        if SEARCH_BACKEND == "opensearch":
+            modules.append("opensearchpy")
+        if EMBEDDING_MODEL_PATH.exists():
+            modules.append("strategy_review_mcp.embeddings")
+        await _import_in_thread(*modules)
+
+        container = _get_blob_service_client().get_container_client(
+            AZURE_STORAGE_CONTAINER
+        )
+        checks = {
+            "search backend": _get_index_generation(),
+            "blob storage": container.get_container_properties(),
+            "Neo4j": _get_neo4j_driver().verify_connectivity(),
+        }
+        results = await asyncio.gather(*checks.values(), return_exceptions=True)
+    for name, result in zip(checks, results):
+        if isinstance(result, Exception):
+            logger.warning("Could not pre-warm the %s connection: %s", name, result)
+    logger.info(
+        "Pre-warmed the clients in %.0f ms", (time.perf_counter() - start) * 1000
+    )
+
+
+@asynccontextmanager
+async def _server_lifespan(prewarm: bool = PREWARM_CLIENTS) -> AsyncIterator[None]:
+    """Pre-warm the clients and refresh the graph summary (both optional),
+    write the metrics file in the background while the server runs, and
+    release the shared clients when it shuts down.
+
+    This wraps the transport in main() rather than being FastMCP's
+    lifespan, which is entered once per MCP session: over HTTP, sessions
+    come and go while the clients and caches are shared.
     """
+    tasks = []
+    if prewarm:
+        tasks.append(asyncio.create_task(_prewarm()))
+    if GRAPH_SUMMARY_REFRESH_SECONDS > 0:
+        tasks.append(asyncio.create_task(_refresh_graph_summary_forever()))
+    if METRICS_PROMETHEUS_PATH:
+        tasks.append(asyncio.create_task(_write_prometheus_forever()))
     try:
-        client = _get_opensearch_client()
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await _close_clients()
+
+
+mcp = FastMCP(
+    "Strategy Review",
+    instructions=(
+        "Search strategy documents and retrieve page images. "
+        "Backed by OpenSearch or an embedded index (BM25) and Azure Blob "
+        "Storage (Azurite)."
+    ),
+    # Streamable HTTP address (main --transport http); FastMCP turns on DNS
+    # rebinding protection when it is a loopback host.
+    host=MCP_HTTP_HOST,
+    port=MCP_HTTP_PORT,
+    # Answer each HTTP request with one JSON body instead of an SSE stream:
+    # the tools send no progress notifications, and the stream framing costs
+    # ~2 ms of server CPU per call (benchmarks/bench_load.py --transport http).
+    json_response=True,
+)
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def _metrics_endpoint(_request: Request) -> PlainTextResponse:
+    """Prometheus scrape endpoint (Streamable HTTP transport only)."""
+    return PlainTextResponse(_prometheus_text(), media_type="text/plain; version=0.0.4")
+
+
+# ---------------------------------------------------------------------------
+# Query bodies and hit formatting (shared by the single and batch tools)
+# ---------------------------------------------------------------------------
+
+
+# Result fields per tool. "score" and "snippet" (highlighted fragments of
+# chunk_text) are computed; the rest are read from _source, which is limited
+# to the requested fields. Ids are always returned.
+DOCUMENT_FIELDS = (
+    "doc_id",
+    "doc_title",
+    "doc_year",
+    "organization",
+    "score",
+    "snippet",
+    "section",
+    "page_number",
+    "themes",
+)
+CHUNK_FIELDS = (
+    "chunk_id",
+    "doc_id",
+    "doc_title",
+    "score",
+    "snippet",
+    "chunk_text",
+    "section",
+    "page_number",
+    "themes",
+    "countries",
+    "chunk_order",
+)
+# Full chunk text only on request — the snippet carries the matching passage.
+_DEFAULT_CHUNK_FIELDS = tuple(f for f in CHUNK_FIELDS if f != "chunk_text")
+_COMPUTED_FIELDS = ("score", "snippet")
+_DEFAULT_FIELDS = {
+    "search_documents": DOCUMENT_FIELDS,
+    "search_chunks": _DEFAULT_CHUNK_FIELDS,
+}
+_FIELD_DEFAULTS: dict[str, Any] = {
+    "chunk_id": "",
+    "doc_id": "",
+    "doc_title": "",
+    "organization": "",
+    "chunk_text": "",
+    "section": "",
+    "themes": [],
+    "countries": [],
+}
+
 
-        must_clauses: list[dict[str, Any]] = [{"match": {"chunk_text": query}}]
-        filter_clauses: list[dict[str, Any]] = []
+class SearchFilters(TypedDict, total=False):
+    """Structured filters shared by the search tools (all optional, ANDed).
+
+    List values match chunks having any of the values.
+    """
+
+    themes: list[str]
+    countries: list[str]
+    organization: list[str]
+    doc_year_min: int
+    doc_year_max: int
+
+
+_KEYWORD_FILTERS = ("themes", "countries", "organization")
+
+
+def _filter_clauses(
+    doc_id: str | list[str] | None, filters: SearchFilters | None
+) -> list[dict[str, Any]]:
+    """Bool filter clauses (not scored, cached by OpenSearch) for a search.
+
+    ``doc_id`` may be a list of ids, e.g. the documents graph_search found.
+    """
+    clauses: list[dict[str, Any]] = []
+    if isinstance(doc_id, list):
+        clauses.append({"terms": {"doc_id": sorted(doc_id)}})
+    elif doc_id is not None:
+        clauses.append({"term": {"doc_id": doc_id}})
+    filters = filters or {}
+    for field in _KEYWORD_FILTERS:
+        if filters.get(field):
+            clauses.append({"terms": {field: sorted(filters[field])}})
+    years = {
+        op: filters[key]
+        for op, key in (("gte", "doc_year_min"), ("lte", "doc_year_max"))
+        if filters.get(key) is not None
+    }
+    if years:
+        clauses.append({"range": {"doc_year": years}})
+    return clauses
+
+
+def _search_cache_key(
+    tool: str,
+    mode: str,
+    query: str,
+    doc_id: str | None,
+    top_k: int,
+    fields: tuple[str, ...],
+    filters: SearchFilters | None,
+) -> tuple[Any, ...]:
+    # Filters by their clauses, so equivalent filter dicts share entries.
+    filter_key = json.dumps(_filter_clauses(None, filters), sort_keys=True)
+    return (tool, mode, normalize_query(query), doc_id, top_k, fields, filter_key)
+
+
+# Results per search (or page), so no call returns an unbounded list.
+MAX_TOP_K = 50
+
+
+def _check_top_k(top_k: int) -> None:
+    if not 1 <= top_k <= MAX_TOP_K:
+        raise ValueError(f"top_k must be between 1 and {MAX_TOP_K}")
 
-        if doc_id is not None:
-            filter_clauses.append({"term": {"doc_id": doc_id}})
 
-        body: dict[str, Any] = {
-            "size": top_k,
-            "query": {
-                "bool": {
-                    "must": must_clauses,
-                    "filter": filter_clauses,
+def _select_fields(
+    requested: list[str] | None, available: tuple[str, ...], default: tuple[str, ...]
+) -> tuple[str, ...]:
+    """Resolve a ``fields`` argument to result fields in canonical order."""
+    if requested is None:
+        return default
+    unknown = set(requested) - set(available)
+    if unknown:
+        raise ValueError(
+            f"Unknown fields {sorted(unknown)}; choose from {', '.join(available)}"
+        )
+    wanted = set(requested) | {"doc_id", "chunk_id"}
+    return tuple(f for f in available if f in wanted)
+
+
+def _apply_fields(body: dict[str, Any], query: str, fields: tuple[str, ...]) -> None:
+    """Set _source and, when a snippet is wanted, highlighting on a body."""
+    body["_source"] = [f for f in fields if f not in _COMPUTED_FIELDS]
+    if "snippet" in fields:
+        body["highlight"] = {
+            "pre_tags": ["**"],
+            "post_tags": ["**"],
+            # Also highlights kNN hits, whose own query has no terms.
+            "highlight_query": {"match": {"chunk_text": query}},
+            "fields": {
+                "chunk_text": {
+                    "fragment_size": SNIPPET_FRAGMENT_SIZE,
+                    "number_of_fragments": SNIPPET_FRAGMENTS,
+                    "no_match_size": SNIPPET_FRAGMENT_SIZE,
                 }
             },
-            "_source": [
-                "chunk_id",
-                "doc_id",
-                "doc_title",
-                "chunk_text",
-                "section",
-                "page_number",
-                "themes",
-                "countries",
-                "chunk_order",
-            ],
         }
 
-        response = client.search(index=OPENSEARCH_INDEX, body=body)
-        hits = response.get("hits", {}).get("hits", [])
 
-        return [
-            {
-                "chunk_id": hit["_source"].get("chunk_id", ""),
-                "doc_id": hit["_source"].get("doc_id", ""),
-                "doc_title": hit["_source"].get("doc_title", ""),
-                "score": hit["_score"],
-                "chunk_text": hit["_source"].get("chunk_text", ""),
-                "section": hit["_source"].get("section", ""),
-                "page_number": hit["_source"].get("page_number"),
-                "themes": hit["_source"].get("themes", []),
-                "countries": hit["_source"].get("countries", []),
-                "chunk_order": hit["_source"].get("chunk_order"),
+def _documents_query(
+    query: str,
+    top_k: int,
+    fields: tuple[str, ...] = DOCUMENT_FIELDS,
+    filters: SearchFilters | None = None,
+) -> dict[str, Any]:
+    """Build the document-level search body for ``search_documents``."""
+    match: dict[str, Any] = {
+        "multi_match": {
+            "query": query,
+            "fields": ["doc_title^2", "chunk_text"],
+            "type": "best_fields",
+        }
+    }
+    filter_clauses = _filter_clauses(None, filters)
+    # Field collapsing returns exactly top_k distinct documents however
+    # many of the top chunks a single long document owns.
+    body: dict[str, Any] = {
+        "size": top_k,
+        "collapse": {"field": "doc_id"},
+        "track_total_hits": False,
+        "query": (
+            {"bool": {"must": [match], "filter": filter_clauses}}
+            if filter_clauses
+            else match
+        ),
+    }
+    _apply_fields(body, query, fields)
+    return body
+
+
+def _chunks_query(
+    query: str,
+    doc_id: str | list[str] | None,
+    top_k: int,
+    fields: tuple[str, ...] = _DEFAULT_CHUNK_FIELDS,
+    filters: SearchFilters | None = None,
+) -> dict[str, Any]:
+    """Build the chunk-level search body for ``search_chunks``."""
+    must_clauses: list[dict[str, Any]] = [{"match": {"chunk_text": query}}]
+    filter_clauses = _filter_clauses(doc_id, filters)
+
+    body: dict[str, Any] = {
+        "size": top_k,
+        "query": {
+            "bool": {
+                "must": must_clauses,
+                "filter": filter_clauses,
             }
-            for hit in hits
-        ]
+        },
+    }
+    _apply_fields(body, query, fields)
+    return body
 
-    except Exception as e:
-        logger.exception("search_chunks failed")
-        return [{"error": f"Chunk search failed: {e}"}]
+
+def _knn_query(
+    query: str,
+    vector: list[float],
+    doc_id: str | list[str] | None,
+    k: int,
+    fields: tuple[str, ...],
+    collapse: bool,
+    filters: SearchFilters | None = None,
+) -> dict[str, Any]:
+    """Build the kNN half of a hybrid search (documents when ``collapse``)."""
+    from strategy_review_mcp.embeddings import VECTOR_FIELD
+
+    knn: dict[str, Any] = {"vector": vector, "k": k}
+    filter_clauses = _filter_clauses(doc_id, filters)
+    if filter_clauses:
+        # Efficient k-NN filtering: the k nearest among matching chunks.
+        knn["filter"] = {"bool": {"filter": filter_clauses}}
+    body: dict[str, Any] = {"size": k, "query": {"knn": {VECTOR_FIELD: knn}}}
+    if collapse:
+        body["collapse"] = {"field": "doc_id"}
+        body["track_total_hits"] = False
+    _apply_fields(body, query, fields)
+    return body
+
+
+def _snippet(hit: dict[str, Any]) -> str:
+    fragments = hit.get("highlight", {}).get("chunk_text")
+    if fragments:
+        return " … ".join(fragments)
+    return hit["_source"].get("chunk_text", "")[:SNIPPET_FRAGMENT_SIZE]
+
+
+def _format_hits(
+    response: dict[str, Any], fields: tuple[str, ...]
+) -> list[dict[str, Any]]:
+    results = []
+    with _metrics.stage("format"):
+        for hit in response.get("hits", {}).get("hits", []):
+            source = hit["_source"]
+            result: dict[str, Any] = {}
+            for field in fields:
+                if field == "score":
+                    result[field] = hit["_score"]
+                elif field == "snippet":
+                    result[field] = _snippet(hit)
+                else:
+                    result[field] = source.get(field, _FIELD_DEFAULTS.get(field))
+            results.append(result)
+    return results
+
+
+def _document_results(
+    response: dict[str, Any], fields: tuple[str, ...] = DOCUMENT_FIELDS
+) -> list[dict[str, Any]]:
+    return _format_hits(response, fields)
+
+
+def _chunk_results(
+    response: dict[str, Any], fields: tuple[str, ...] = _DEFAULT_CHUNK_FIELDS
+) -> list[dict[str, Any]]:
+    return _format_hits(response, fields)
+
+
+def _fit_results(
+    results: list[dict[str, Any]],
+    budget: int | None,
+    wrap: Callable[[list[dict[str, Any]]], dict[str, Any]] | None = None,
+) -> list[dict[str, Any]]:
+    """Apply a max_chars / max_tokens budget (see budget.py) to results,
+    sent as a list or, with ``wrap``, inside the object it builds."""
+    if budget is None:
+        return results
+    with _metrics.stage("budget"):
+        if wrap is None:
+            fitted = fit_results(results, budget)
+        else:
+            fitted = fit_wrapped(results, budget, wrap)
+    if results and not fitted:
+        raise ValueError(
+            f"A budget of {budget} characters does not fit even one result; "
+            "raise it or request fewer fields"
+        )
+    return fitted
 
 
 # ---------------------------------------------------------------------------
-# Tool: get_page_image
+# Hybrid retrieval (BM25 + kNN, reciprocal rank fusion)
 # ---------------------------------------------------------------------------
 
+SearchMode = Literal["bm25", "hybrid"]
 
-@mcp.tool()
-def get_page_image(doc_id: str, page_num: int) -> dict[str, Any]:
-    """Retrieve a page image from Azure Blob Storage (Azurite).
+# Candidates taken from each ranked list, and the RRF rank constant.
+HYBRID_RANK_WINDOW = 50
+RRF_K = 60
 
-    Fetches the PNG image for a specific page of a strategy document.
-    The blob naming convention is: {doc_id}/page_{page_num:03d}.png
+_encoder: LsaEncoder | None = None
 
-    Args:
-        doc_id: Document identifier (e.g. "GH_2024").
-        page_num: Page number to retrieve (1-indexed).
 
-    Returns:
-        A dict containing doc_id, page_num, image_base64, and content_type.
-        Returns an error dict if the blob is not found.
+def _get_encoder() -> LsaEncoder:
+    """Return the query encoder, loading EMBEDDING_MODEL_PATH on first call."""
+    global _encoder
+    if _encoder is None:
+        if not EMBEDDING_MODEL_PATH.exists():
+            raise FileNotFoundError(
+                f"Embedding model not found at {EMBEDDING_MODEL_PATH}; "
+                "run seed/opensearch/seed.sh to fit it"
+            )
+        from strategy_review_mcp.embeddings import LsaEncoder
+
+        _encoder = LsaEncoder.load(EMBEDDING_MODEL_PATH)
+    return _encoder
+
+
+async def _hybrid_search(
+    lexical: dict[str, Any],
+    semantic: dict[str, Any] | None,
+    key: Callable[[dict[str, Any]], str],
+    top_k: int,
+) -> dict[str, Any]:
+    """Run both halves in one msearch and fuse their ranks with RRF.
+
+    Each hit scores sum(1 / (RRF_K + rank)) over the lists it appears in;
+    ``key`` identifies the same result across lists (doc_id or chunk _id).
+    Returns an OpenSearch-shaped response whose hits carry the fused score.
+    ``semantic`` is None when the query has no known features, in which
+    case the lexical ranking is returned as is.
     """
-    blob_name = f"{doc_id}/page_{page_num:03d}.png"
+    bodies = [lexical] if semantic is None else [lexical, semantic]
+    responses = await _get_search_backend().msearch(bodies)
+
+    fused: dict[str, float] = {}
+    hits: dict[str, dict[str, Any]] = {}
+    with _metrics.stage("fuse"):
+        for response in responses:
+            if "error" in response:
+                error = response["error"]
+                raise RuntimeError(
+                    error.get("reason") if isinstance(error, dict) else error
+                )
+            for rank, hit in enumerate(response["hits"]["hits"], start=1):
+                k = key(hit)
+                fused[k] = fused.get(k, 0.0) + 1.0 / (RRF_K + rank)
+                hits.setdefault(k, hit)  # prefer the lexical hit (best BM25 chunk)
+
+        ranked = sorted(fused, key=fused.__getitem__, reverse=True)[:top_k]
+    return {"hits": {"hits": [{**hits[k], "_score": fused[k]} for k in ranked]}}
+
+
+# ---------------------------------------------------------------------------
+# Cursor pagination for search_chunks (point in time + search_after)
+# ---------------------------------------------------------------------------
+
+# A total order, so search_after resumes exactly after the previous page.
+_PAGE_SORT = [{"_score": "desc"}, {"chunk_id": "asc"}]
+
+
+def _encode_cursor(state: dict[str, Any]) -> str:
+    raw = json.dumps(state, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> dict[str, Any]:
     try:
-        blob_service = _get_blob_service_client()
-        container_client = blob_service.get_container_client(
-            AZURE_STORAGE_CONTAINER
-        )
-        blob_client = container_client.get_blob_client(blob_name)
+        state = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(state, dict) or not {"pit", "after", "key"} <= state.keys():
+            raise ValueError
+    except ValueError:
+        raise ValueError("Invalid cursor") from None
+    return state
 
-        download = blob_client.download_blob()
-        image_bytes = download.readall()
-        content_type = (
-            download.properties.content_settings.content_type or "image/png"
-        )
 
-        return {
-            "doc_id": doc_id,
-            "page_num": page_num,
-            "image_base64": base64.b64encode(image_bytes).decode("utf-8"),
-            "content_type": content_type,
-        }
+def _chunks_page_query(
+    query: str,
+    doc_id: str | None,
+    page_size: int,
+    fields: tuple[str, ...],
+    pit_id: str,
+    after: list[Any] | None,
+    filters: SearchFilters | None = None,
+) -> dict[str, Any]:
+    """``_chunks_query`` against a point in time, resuming after a sort key."""
+    body = _chunks_query(query, doc_id, page_size, fields, filters)
+    body["pit"] = {"id": pit_id, "keep_alive": PAGINATION_KEEP_ALIVE}
+    body["sort"] = _PAGE_SORT
+    body["track_total_hits"] = False
+    if after is not None:
+        body["search_after"] = after
+    return body
 
-    except Exception as e:
-        error_str = str(e)
-        error_name = type(e).__name__
-
-        if "ResourceNotFoundError" in error_name or "BlobNotFound" in error_str:
-            return {
-                "error": (
-                    f"Page image not found: blob '{blob_name}' does not exist "
-                    f"in container '{AZURE_STORAGE_CONTAINER}'. "
-                    f"Page images may not have been seeded yet."
-                ),
-                "doc_id": doc_id,
-                "page_num": page_num,
-            }
 
-        if "ContainerNotFound" in error_str:
-            return {
-                "error": (
-                    f"Container '{AZURE_STORAGE_CONTAINER}' does not exist. "
-                    f"Azurite blob storage may not have been seeded."
+async def _search_chunks_page(
+    query: str,
+    doc_id: str | None,
+    page_size: int,
+    fields: tuple[str, ...],
+    cursor: str | None,
+    filters: SearchFilters | None = None,
+    budget: int | None = None,
+) -> dict[str, Any]:
+    """One page of chunk results and the cursor for the next (None at the end).
+
+    The first page opens a point in time, so every later page is read from
+    the same snapshot of the index however the index changes meanwhile, and
+    each page costs one search of ``page_size`` hits however deep it is.
+    Hits dropped to fit ``budget`` characters start the next page; the
+    budget covers the whole page, cursor included.
+    """
+    backend = _get_search_backend()
+    key = [normalize_query(query), doc_id, _filter_clauses(None, filters)]
+    if cursor is None:
+        pit_id = await backend.open_point_in_time(PAGINATION_KEEP_ALIVE)
+        after = None
+    else:
+        state = _decode_cursor(cursor)
+        if state["key"] != key:
+            raise ValueError("Cursor belongs to a different query or filters")
+        pit_id, after = state["pit"], state["after"]
+
+    response = await backend.search(
+        _chunks_page_query(query, doc_id, page_size, fields, pit_id, after, filters)
+    )
+    pit_id = response.get("pit_id", pit_id)
+    hits = response.get("hits", {}).get("hits", [])
+    last_page = len(hits) < page_size
+
+    def page(results: list[dict[str, Any]]) -> dict[str, Any]:
+        if last_page and len(results) == len(hits):
+            return {"results": results, "next_cursor": None}
+        # Resume after the last hit returned, not the last one fetched.
+        resume = hits[len(results) - 1]["sort"] if results else after
+        next_cursor = _encode_cursor({"pit": pit_id, "after": resume, "key": key})
+        return {"results": results, "next_cursor": next_cursor}
+
+    result = page(_fit_results(_chunk_results(response, fields), budget, page))
+    if result["next_cursor"] is None:
+        # Last page: release the snapshot now rather than at keep-alive.
+        try:
+            await backend.close_point_in_time(pit_id)
+        except Exception:
+            logger.warning("Failed to close point in time", exc_info=True)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Tool: search_documents
+# ---------------------------------------------------------------------------
+
+
+@mcp.tool(structured_output=False)
+@_instrumented
+async def search_documents(
+    query: str,
+    top_k: int = 5,
+    mode: SearchMode = "bm25",
+    fields: list[str] | None = None,
+    filters: SearchFilters | None = None,
+    max_chars: int | None = None,
+    max_tokens: int | None = None,
+) -> list[dict[str, Any]]:
+    """Search strategy documents by keyword query.
+
+    Performs a BM25 multi_match search across document titles and chunk text,
+    collapsed on doc_id so OpenSearch returns one hit (the best chunk) per
+    document. Returns the top-scoring documents with the highlighted
+    passages of their best matching chunk as the snippet.
+
+    Args:
+        query: The search query string (e.g. "maternal health", "TB elimination").
+        top_k: Maximum number of documents to return (1-50). Defaults to 5.
+        mode: "bm25" for keyword matching, or "hybrid" to also match by
+            meaning (e.g. "mothers dying in childbirth" finds "maternal
+            mortality"); hybrid scores are fused ranks, not BM25 scores.
+        fields: Optional subset of result fields to return (doc_id is always
+            included), e.g. ["doc_title", "snippet"]. Defaults to all.
+        filters: Optional structured filters, e.g. {"themes": ["MNH"],
+            "countries": ["NGA"], "organization": ["Global Fund"],
+            "doc_year_min": 2024, "doc_year_max": 2025}. List values match
+            any of the values; all given filters must match.
+        max_chars: Optional size budget for the results, in characters of
+            JSON. Results are kept in rank order while they fit; the first
+            one that does not fit has its snippet cut at a sentence and is
+            marked "truncated", and the rest are dropped.
+        max_tokens: The same budget in tokens (about 4 characters each);
+            with both, the smaller one applies.
+
+    Returns:
+        A list of document results, each containing doc_id, doc_title,
+        doc_year, organization, score, snippet, section, page_number,
+        and themes (or just the requested fields), plus "truncated": true
+        on a result shortened to fit the budget.
+    """
+    try:
+        _check_top_k(top_k)
+        selected = _select_fields(fields, DOCUMENT_FIELDS, DOCUMENT_FIELDS)
+        budget = budget_chars(max_chars, max_tokens)
+    except ValueError as e:
+        return [{"error": str(e)}]
+    cache_key = _search_cache_key(
+        "search_documents", mode, query, None, top_k, selected, filters
+    )
+
+    async def search() -> list[dict[str, Any]]:
+        if mode == "hybrid":
+            with _metrics.stage("encode"):
+                vector = _get_encoder().encode_query(query)
+            response = await _hybrid_search(
+                _documents_query(query, HYBRID_RANK_WINDOW, selected, filters),
+                (
+                    _knn_query(
+                        query,
+                        vector,
+                        None,
+                        HYBRID_RANK_WINDOW,
+                        selected,
+                        True,
+                        filters,
+                    )
+                    if vector is not None
+                    else None
                 ),
-                "doc_id": doc_id,
-                "page_num": page_num,
-            }
+                lambda hit: hit["_source"]["doc_id"],
+                top_k,
+            )
+        else:
+            response = await _get_search_backend().search(
+                _documents_query(query, top_k, selected, filters)
+            )
+        return _document_results(response, selected)
 
-        logger.exception("get_page_image failed")
-        return {
-            "error": f"Failed to retrieve page image: {e}",
-            "doc_id": doc_id,
-            "page_num": page_num,
-        }
+    results = await _cache_get(cache_key)
+    if results is None:
+        try:
+            results = await _search_flight.do(cache_key, search)
+            _query_cache.set(cache_key, results)
+        except Exception as e:
+            logger.exception("search_documents failed")
+            return [{"error": f"Search failed: {e}"}]
+    try:
+        return _fit_results(results, budget)
+    except ValueError as e:
+        return [{"error": str(e)}]
 
 
 # ---------------------------------------------------------------------------
-# Entry point
+# Tool: search_chunks
 # ---------------------------------------------------------------------------
 
 
-def main() -> None:
-    """Start the Strategy Review MCP server (stdio transport)."""
-    mcp.run(transport="stdio")
+@mcp.tool(structured_output=False)
+@_instrumented
+async def search_chunks(
+    query: str,
+    doc_id: str | None = None,
+    top_k: int = 5,
+    mode: SearchMode = "bm25",
+    fields: list[str] | None = None,
+    filters: SearchFilters | None = None,
+    paginate: bool = False,
+    cursor: str | None = None,
+    max_chars: int | None = None,
+    max_tokens: int | None = None,
+) -> list[dict[str, Any]] | dict[str, Any]:
+    """Search within strategy document chunks at a granular level.
+
+    Performs a BM25 match on chunk_text with an optional doc_id filter
+    to restrict results to a specific document. Each result carries the
+    highlighted matching passages as its snippet; the full chunk text is
+    only returned when "chunk_text" is requested in fields.
+
+    To page through results, pass paginate=True: the response is then
+    {"results": [...], "next_cursor": str | None}. Call again with the same
+    query, doc_id and filters and cursor=next_cursor for the next top_k results,
+    until next_cursor is None. Pages come from a snapshot taken on the
+    first page, so they neither repeat nor skip results if the index is
+    reseeded meanwhile. Cursors expire after a few idle minutes.
+
+    Args:
+        query: The search query string.
+        doc_id: Optional document ID to filter chunks (e.g. "GH_2024").
+            If None, searches across all documents.
+        top_k: Maximum number of chunks to return (1-50). Defaults to 5.
+        mode: "bm25" for keyword matching, or "hybrid" to also match by
+            meaning; hybrid scores are fused ranks, not BM25 scores.
+        fields: Optional subset of result fields to return (chunk_id and
+            doc_id are always included), e.g. ["snippet", "page_number"].
+            Defaults to every field except chunk_text; add "chunk_text"
+            to get the full text of each chunk.
+        filters: Optional structured filters on themes, countries,
+            organization and doc_year_min / doc_year_max, as for
+            search_documents.
+        paginate: Return the first page with a cursor for the next one
+            (bm25 mode only).
+        cursor: The next_cursor of the previous page; implies paginate.
+        max_chars: Optional size budget for the results, in characters of
+            JSON. Results are kept in rank order while they fit; the first
+            one that does not fit has its chunk_text (then snippet) cut at
+            a sentence and is marked "truncated", and the rest are dropped
+            (when paginating, they start the next page).
+        max_tokens: The same budget in tokens (about 4 characters each);
+            with both, the smaller one applies.
+
+    Returns:
+        A list of chunk results, each containing chunk_id, doc_id,
+        doc_title, score, snippet, section, page_number, themes,
+        countries, and chunk_order (or just the requested fields), plus
+        "truncated": true on a result shortened to fit the budget; when
+        paginating, {"results": <that list>, "next_cursor": ...}.
+    """
+    try:
+        _check_top_k(top_k)
+        selected = _select_fields(fields, CHUNK_FIELDS, _DEFAULT_CHUNK_FIELDS)
+        budget = budget_chars(max_chars, max_tokens)
+    except ValueError as e:
+        return [{"error": str(e)}]
+
+    if paginate or cursor is not None:
+        if mode != "bm25":
+            return {"error": "Pagination is only supported with mode='bm25'"}
+        try:
+            return await _search_chunks_page(
+                query, doc_id, top_k, selected, cursor, filters, budget
+            )
+        except PointInTimeExpired:
+            return {"error": "Cursor expired; run the search again without one"}
+        except ValueError as e:
+            return {"error": str(e)}
+        except Exception as e:
+            logger.exception("search_chunks page failed")
+            return {"error": f"Chunk search failed: {e}"}
+    cache_key = _search_cache_key(
+        "search_chunks", mode, query, doc_id, top_k, selected, filters
+    )
+    results = await _cache_get(cache_key)
+    if results is None:
+        try:
+            results = await _search_flight.do(
+                cache_key,
+                lambda: _chunk_search(query, doc_id, top_k, mode, selected, filters),
+            )
+            _query_cache.set(cache_key, results)
+        except Exception as e:
+            logger.exception("search_chunks failed")
+            return [{"error": f"Chunk search failed: {e}"}]
+    try:
+        return _fit_results(results, budget)
+    except ValueError as e:
+        return [{"error": str(e)}]
+
+
+async def _chunk_search(
+    query: str,
+    doc_id: str | list[str] | None,
+    top_k: int,
+    mode: SearchMode,
+    fields: tuple[str, ...],
+    filters: SearchFilters | None,
+) -> list[dict[str, Any]]:
+    """Run a BM25 or hybrid chunk search (uncached)."""
+    if mode == "hybrid":
+        with _metrics.stage("encode"):
+            vector = _get_encoder().encode_query(query)
+        response = await _hybrid_search(
+            _chunks_query(query, doc_id, HYBRID_RANK_WINDOW, fields, filters),
+            (
+                _knn_query(
+                    query, vector, doc_id, HYBRID_RANK_WINDOW, fields, False, filters
+                )
+                if vector is not None
+                else None
+            ),
+            lambda hit: hit["_id"],
+            top_k,
+        )
+    else:
+        response = await _get_search_backend().search(
+            _chunks_query(query, doc_id, top_k, fields, filters)
+        )
+    return _chunk_results(response, fields)
+
+
+# ---------------------------------------------------------------------------
+# Batch tools: search_documents_batch / search_chunks_batch (one _msearch)
+# ---------------------------------------------------------------------------
+
+MAX_BATCH_QUERIES = 25
+
+
+class DocumentQuery(TypedDict):
+    """One query in a search_documents_batch call."""
+
+    query: str
+    top_k: NotRequired[int]
+
+
+class ChunkQuery(TypedDict):
+    """One query in a search_chunks_batch call."""
+
+    query: str
+    doc_id: NotRequired[str | None]
+    top_k: NotRequired[int]
+
+
+async def _run_batch(
+    tool: str,
+    specs: list[tuple[str, str | None, int]],
+    build_body: Callable[[str, str | None, int], dict[str, Any]],
+    format_response: Callable[[dict[str, Any]], list[dict[str, Any]]],
+) -> list[dict[str, Any]]:
+    """Answer (query, doc_id, top_k) specs from the cache plus one _msearch.
+
+    Cached specs are answered directly; the rest go to the search backend in
+    a single msearch (one _msearch request on OpenSearch). Results keep the
+    input order and a failing query only produces an error entry for itself.
+    """
+    results: list[dict[str, Any] | None] = [None] * len(specs)
+    pending: list[tuple[int, tuple[Any, ...]]] = []
+
+    for i, (query, doc_id, top_k) in enumerate(specs):
+        cache_key = _search_cache_key(
+            tool, "bm25", query, doc_id, top_k, _DEFAULT_FIELDS[tool], None
+        )
+        cached = await _cache_get(cache_key)
+        if cached is not None:
+            results[i] = {"query": query, "results": cached}
+        else:
+            pending.append((i, cache_key))
+
+    if pending:
+        responses = await _get_search_backend().msearch(
+            [build_body(*specs[i]) for i, _ in pending]
+        )
+
+        for (i, cache_key), item in zip(pending, responses):
+            query = specs[i][0]
+            if "error" in item:
+                error = item["error"]
+                reason = error.get("reason") if isinstance(error, dict) else error
+                results[i] = {"query": query, "error": f"Search failed: {reason}"}
+                continue
+            hits = format_response(item)
+            _query_cache.set(cache_key, hits)
+            results[i] = {"query": query, "results": hits}
+
+    return [
+        r if r is not None else {"query": specs[i][0], "error": "No response"}
+        for i, r in enumerate(results)
+    ]
+
+
+def _fit_batch(
+    entries: list[dict[str, Any]], budget: int | None
+) -> list[dict[str, Any]]:
+    """Apply a budget to a whole batch response.
+
+    Entries are fitted in input order, each to an equal share of the room
+    the earlier ones left, so a query with few or short results passes its
+    unused share on to the ones after it. An entry that cannot fit even one
+    result becomes an error entry, and error messages are cut to their
+    share like results. When even that does not fit, the whole batch is
+    one error.
+    """
+    if budget is None:
+        return entries
+    fitted = []
+    remaining = budget
+    for i, entry in enumerate(entries):
+        share = max(remaining, 0) // (len(entries) - i)
+        if "results" in entry:
+            try:
+                entry = {
+                    **entry,
+                    "results": _fit_results(
+                        entry["results"],
+                        share,
+                        lambda results: {**entry, "results": results},
+                    ),
+                }
+            except ValueError:
+                entry = {
+                    "query": entry["query"],
+                    "error": f"{share} characters of the budget do not fit "
+                    "one result; raise it or send fewer queries",
+                }
+        if "error" in entry:
+            entry = fit_field(entry, "error", share)
+        remaining -= result_chars(entry)
+        fitted.append(entry)
+    if remaining < 0:
+        return [
+            {
+                "error": f"A budget of {budget} characters does not fit "
+                f"{len(entries)} queries; raise it or send fewer queries"
+            }
+        ]
+    return fitted
+
+
+@mcp.tool(structured_output=False)
+@_instrumented
+async def search_documents_batch(
+    queries: list[DocumentQuery],
+    max_chars: int | None = None,
+    max_tokens: int | None = None,
+) -> list[dict[str, Any]]:
+    """Run several document-level searches in one round trip.
+
+    Each query behaves exactly like search_documents; all of them are sent
+    to OpenSearch as a single _msearch request. Prefer this over repeated
+    search_documents calls when covering several themes or countries.
+
+    Args:
+        queries: Up to 25 query specs, each {"query": str, "top_k": int}
+            (top_k 1-50, default 5).
+        max_chars: Optional size budget for the whole batch, in characters
+            of JSON, shared between the queries in order: each gets an
+            equal share of what the earlier ones left, fitted as for
+            search_documents.
+        max_tokens: The same budget in tokens (about 4 characters each);
+            with both, the smaller one applies.
+
+    Returns:
+        One entry per query, in input order: {"query", "results"} on success
+        (results as returned by search_documents) or {"query", "error"}.
+    """
+    if len(queries) > MAX_BATCH_QUERIES:
+        return [{"error": f"At most {MAX_BATCH_QUERIES} queries per batch"}]
+    try:
+        for q in queries:
+            _check_top_k(q.get("top_k", 5))
+        budget = budget_chars(max_chars, max_tokens)
+    except ValueError as e:
+        return [{"error": str(e)}]
+    try:
+        entries = await _run_batch(
+            "search_documents",
+            [(q["query"], None, q.get("top_k", 5)) for q in queries],
+            lambda query, _doc_id, top_k: _documents_query(query, top_k),
+            _document_results,
+        )
+    except Exception as e:
+        logger.exception("search_documents_batch failed")
+        return [{"error": f"Batch search failed: {e}"}]
+    return _fit_batch(entries, budget)
+
+
+@mcp.tool(structured_output=False)
+@_instrumented
+async def search_chunks_batch(
+    queries: list[ChunkQuery],
+    max_chars: int | None = None,
+    max_tokens: int | None = None,
+) -> list[dict[str, Any]]:
+    """Run several chunk-level searches in one round trip.
+
+    Each query behaves exactly like search_chunks; all of them are sent to
+    OpenSearch as a single _msearch request. Prefer this over repeated
+    search_chunks calls when covering several themes or countries.
+
+    Args:
+        queries: Up to 25 query specs, each {"query": str, "doc_id": str,
+            "top_k": int} (doc_id optional, top_k 1-50, default 5).
+        max_chars: Optional size budget for the whole batch, shared between
+            the queries as for search_documents_batch.
+        max_tokens: The same budget in tokens (about 4 characters each);
+            with both, the smaller one applies.
+
+    Returns:
+        One entry per query, in input order: {"query", "results"} on success
+        (results as returned by search_chunks) or {"query", "error"}.
+    """
+    if len(queries) > MAX_BATCH_QUERIES:
+        return [{"error": f"At most {MAX_BATCH_QUERIES} queries per batch"}]
+    try:
+        for q in queries:
+            _check_top_k(q.get("top_k", 5))
+        budget = budget_chars(max_chars, max_tokens)
+    except ValueError as e:
+        return [{"error": str(e)}]
+    try:
+        entries = await _run_batch(
+            "search_chunks",
+            [(q["query"], q.get("doc_id"), q.get("top_k", 5)) for q in queries],
+            _chunks_query,
+            _chunk_results,
+        )
+    except Exception as e:
+        logger.exception("search_chunks_batch failed")
+        return [{"error": f"Batch chunk search failed: {e}"}]
+    return _fit_batch(entries, budget)
+
+
+# ---------------------------------------------------------------------------
+# Tool: facet_counts
+# ---------------------------------------------------------------------------
+
+FACET_FIELDS = ("themes", "countries", "organization", "doc_year", "doc_id")
+MAX_FACET_BUCKETS = 50
+
+
+def _facets_query(
+    query: str | None,
+    doc_id: str | None,
+    filters: SearchFilters | None,
+    facets: tuple[str, ...],
+    size: int,
+) -> dict[str, Any]:
+    """Build the aggregation-only body for ``facet_counts``."""
+    documents = {"cardinality": {"field": "doc_id"}}
+    aggs: dict[str, Any] = {"documents": documents}
+    for field in facets:
+        aggs[field] = {
+            "terms": {"field": field, "size": size},
+            "aggs": {"documents": documents},
+        }
+    return {
+        "size": 0,
+        "track_total_hits": True,
+        "query": {
+            "bool": {
+                "must": [{"match": {"chunk_text": query}}] if query else [],
+                "filter": _filter_clauses(doc_id, filters),
+            }
+        },
+        "aggs": aggs,
+    }
+
+
+@mcp.tool(structured_output=False)
+@_instrumented
+async def facet_counts(
+    query: str | None = None,
+    doc_id: str | None = None,
+    filters: SearchFilters | None = None,
+    facets: list[str] | None = None,
+    size: int = 10,
+) -> dict[str, Any]:
+    """Count matching chunks and documents per facet value in one request.
+
+    Use this for "which / how many / how heavily" questions (e.g. "Which
+    themes does GE_2023 cover and how heavily?" is facet_counts(doc_id=
+    "GE_2023", facets=["themes"])) and to discover valid filter values,
+    instead of running many searches and counting results.
+
+    Args:
+        query: Optional text query on chunk_text; counts all chunks if None.
+        doc_id: Optional document ID to restrict the counts to.
+        filters: Optional structured filters, as for search_chunks.
+        facets: Which of themes, countries, organization, doc_year and
+            doc_id to count. Defaults to all of them.
+        size: Maximum values per facet, most frequent first (1-50).
+
+    Returns:
+        {"chunks": matching chunk count, "documents": matching document
+        count, "facets": {facet: [{"value", "chunks", "documents"}, ...]}},
+        plus "other_chunks": {facet: count} for facets cut off by size.
+    """
+    selected = tuple(facets) if facets else FACET_FIELDS
+    unknown = set(selected) - set(FACET_FIELDS)
+    if unknown:
+        return {
+            "error": f"Unknown facets {sorted(unknown)}; "
+            f"choose from {', '.join(FACET_FIELDS)}"
+        }
+    if not 1 <= size <= MAX_FACET_BUCKETS:
+        return {"error": f"size must be between 1 and {MAX_FACET_BUCKETS}"}
+
+    cache_key = _search_cache_key(
+        "facet_counts", "bm25", query or "", doc_id, size, selected, filters
+    )
+    cached = await _cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    async def count() -> dict[str, Any]:
+        response = await _get_search_backend().search(
+            _facets_query(query, doc_id, filters, selected, size)
+        )
+        aggs = response["aggregations"]
+        result: dict[str, Any] = {
+            "chunks": response["hits"]["total"]["value"],
+            "documents": aggs["documents"]["value"],
+            "facets": {},
+        }
+        with _metrics.stage("format"):
+            for field in selected:
+                agg = aggs[field]
+                result["facets"][field] = [
+                    {
+                        "value": bucket["key"],
+                        "chunks": bucket["doc_count"],
+                        "documents": bucket["documents"]["value"],
+                    }
+                    for bucket in agg["buckets"]
+                ]
+                if agg.get("sum_other_doc_count"):
+                    result.setdefault("other_chunks", {})[field] = agg[
+                        "sum_other_doc_count"
+                    ]
+        return result
+
+    try:
+        result = await _search_flight.do(cache_key, count)
+        _query_cache.set(cache_key, result)
+        return result
+
+    except Exception as e:
+        logger.exception("facet_counts failed")
+        return {"error": f"Facet count failed: {e}"}
+
+
+# ---------------------------------------------------------------------------
+# Tool: graph_search
+# ---------------------------------------------------------------------------
+
+# Themes related to every given entity (a country's priority and supported
+# themes, a funding area's allocated themes), with the documents covering
+# them. Entities match by id / code or by a case-insensitive name substring.
+_GRAPH_QUERY = """
+OPTIONAL MATCH (c:Country)
+WHERE $country IS NOT NULL
+  AND (toLower(c.code) = toLower($country)
+       OR toLower(c.name) CONTAINS toLower($country))
+WITH collect(c.code) AS countries
+MATCH (t:Theme)
+WHERE ($theme IS NULL
+       OR toLower(t.id) = toLower($theme)
+       OR toLower(t.name) CONTAINS toLower($theme))
+  AND ($country IS NULL
+       OR EXISTS {
+         MATCH (t)-[:PRIORITY_IN|SUPPORTS_THEME]-(c:Country)
+         WHERE c.code IN countries
+       })
+  AND ($funding_area IS NULL
+       OR EXISTS {
+         MATCH (f:FundingArea)-[:ALLOCATES_TO]->(t)
+         WHERE toLower(f.id) = toLower($funding_area)
+            OR toLower(f.name) CONTAINS toLower($funding_area)
+       })
+OPTIONAL MATCH (d:Document)-[:COVERS_THEME]->(t)
+RETURN countries, t.id AS id, t.name AS name, collect(DISTINCT d.id) AS doc_ids
+ORDER BY id
+"""
+
+
+async def _resolve_graph(
+    theme: str | None, country: str | None, funding_area: str | None
+) -> dict[str, Any]:
+    """Themes, country codes and document ids the entities resolve to."""
+    from neo4j import RoutingControl
+
+    with _metrics.stage("neo4j"):
+        records, _, _ = await _get_neo4j_driver().execute_query(
+            _GRAPH_QUERY,
+            {"theme": theme, "country": country, "funding_area": funding_area},
+            database_=NEO4J_DATABASE,
+            routing_=RoutingControl.READ,
+        )
+    return {
+        "themes": [{"id": r["id"], "name": r["name"]} for r in records],
+        "countries": records[0]["countries"] if records else [],
+        "doc_ids": sorted({d for r in records for d in r["doc_ids"]}),
+    }
+
+
+@mcp.tool(structured_output=False)
+@_instrumented
+async def graph_search(
+    query: str,
+    theme: str | None = None,
+    country: str | None = None,
+    funding_area: str | None = None,
+    top_k: int = 5,
+    mode: SearchMode = "bm25",
+    fields: list[str] | None = None,
+    max_chars: int | None = None,
+    max_tokens: int | None = None,
+) -> dict[str, Any]:
+    """Search the chunks linked to a theme, country or funding area in the
+    knowledge graph, in one call.
+
+    Resolves the given entities in the Neo4j graph to the themes they share
+    (a country's priority and supported themes, a funding area's allocated
+    themes) and the documents covering those themes, then runs one chunk
+    search restricted to those documents and themes — and to chunks about
+    the country, when one is given. Use it instead of a graph query followed
+    by a search_chunks call per document.
+
+    Args:
+        query: The search query string.
+        theme: Theme id or name, e.g. "TB" or "maternal".
+        country: ISO3 country code or name, e.g. "NGA" or "Nigeria".
+        funding_area: Funding area id or name, e.g. "PREV" or "prevention".
+            At least one of theme, country and funding_area is required;
+            given together, they must all relate to a theme.
+        top_k: Maximum number of chunks to return (1-50). Defaults to 5.
+        mode: "bm25" or "hybrid", as for search_chunks.
+        fields: Optional subset of chunk result fields, as for search_chunks.
+        max_chars: Optional size budget for the whole response, in
+            characters of JSON; the chunk results are fitted as for
+            search_chunks in the room the themes, countries and doc_ids
+            leave.
+        max_tokens: The same budget in tokens (about 4 characters each);
+            with both, the smaller one applies.
+
+    Returns:
+        {"themes": [{"id", "name"}], "countries": [ISO3 codes],
+        "doc_ids": [...], "results": [chunk results as from search_chunks]}.
+    """
+    if theme is None and country is None and funding_area is None:
+        return {"error": "Give at least one of theme, country or funding_area"}
+    try:
+        _check_top_k(top_k)
+        selected = _select_fields(fields, CHUNK_FIELDS, _DEFAULT_CHUNK_FIELDS)
+        budget = budget_chars(max_chars, max_tokens)
+    except ValueError as e:
+        return {"error": str(e)}
+    entities = tuple(normalize_query(e or "") for e in (theme, country, funding_area))
+    cache_key = (
+        "graph_search",
+        mode,
+        normalize_query(query),
+        entities,
+        top_k,
+        selected,
+    )
+    result = await _cache_get(cache_key)
+    if result is None:
+        result = await _graph_search(
+            query, theme, country, funding_area, top_k, mode, selected
+        )
+        if "error" in result:
+            return result
+        _query_cache.set(cache_key, result)
+    try:
+        return {
+            **result,
+            "results": _fit_results(
+                result["results"],
+                budget,
+                lambda results: {**result, "results": results},
+            ),
+        }
+    except ValueError as e:
+        return {"error": str(e)}
+
+
+async def _graph_search(
+    query: str,
+    theme: str | None,
+    country: str | None,
+    funding_area: str | None,
+    top_k: int,
+    mode: SearchMode,
+    fields: tuple[str, ...],
+) -> dict[str, Any]:
+    """Resolve the entities and run the chunk search (uncached)."""
+    try:
+        graph = await _resolve_graph(theme, country, funding_area)
+    except Exception as e:
+        logger.exception("graph_search graph lookup failed")
+        return {"error": f"Knowledge graph lookup failed: {e}"}
+    if not graph["themes"]:
+        given = {"theme": theme, "country": country, "funding_area": funding_area}
+        matched = ", ".join(f"{k}={v!r}" for k, v in given.items() if v is not None)
+        return {"error": f"No theme in the knowledge graph matches {matched}"}
+
+    filters: SearchFilters = {"themes": [t["id"] for t in graph["themes"]]}
+    if country is not None:
+        filters["countries"] = graph["countries"]
+    try:
+        results = (
+            await _chunk_search(query, graph["doc_ids"], top_k, mode, fields, filters)
+            if graph["doc_ids"]
+            else []
+        )
+    except Exception as e:
+        logger.exception("graph_search failed")
+        return {"error": f"Chunk search failed: {e}"}
+    return {**graph, "results": results}
+
+
+# ---------------------------------------------------------------------------
+# Tool: get_graph_summary (materialized graph, loaded on first use)
+# ---------------------------------------------------------------------------
+
+_graph_summary: GraphSummary | None = None
+_graph_summary_lock = asyncio.Lock()
+
+
+async def _load_graph_summary() -> GraphSummary:
+    """Re-read the graph summary from Neo4j and swap it in."""
+    global _graph_summary
+    with _metrics.stage("neo4j"):
+        summary = await load_summary(_get_neo4j_driver(), NEO4J_DATABASE)
+    if _graph_summary is None or summary.fingerprint != _graph_summary.fingerprint:
+        logger.info("Graph summary loaded (fingerprint %s)", summary.fingerprint)
+    _graph_summary = summary
+    return summary
+
+
+def _fresh_graph_summary() -> GraphSummary | None:
+    summary = _graph_summary
+    if summary is None:
+        return None
+    age = time.time() - summary.loaded_at
+    return summary if age < GRAPH_SUMMARY_MAX_AGE_SECONDS else None
+
+
+async def _get_graph_summary() -> GraphSummary:
+    """The current summary, (re)loaded when missing or older than
+    GRAPH_SUMMARY_MAX_AGE_SECONDS.
+
+    If a reload fails, the previous summary is served (with a warning)
+    rather than failing the call.
+    """
+    summary = _fresh_graph_summary()
+    if summary is not None:
+        return summary
+    async with _graph_summary_lock:
+        summary = _fresh_graph_summary()
+        if summary is not None:
+            return summary
+        try:
+            return await _load_graph_summary()
+        except Exception as e:
+            if _graph_summary is None:
+                raise
+            logger.warning("Serving a stale graph summary: %s", e)
+            return _graph_summary
+
+
+async def _refresh_graph_summary_forever() -> None:
+    """Load the summary at startup, then every GRAPH_SUMMARY_REFRESH_SECONDS
+    (opt-in; otherwise it is loaded on first use)."""
+    # Not on the event loop: this starts with the server, and its first
+    # requests should not wait behind the driver import.
+    await _import_in_thread("neo4j")
+    while True:
+        try:
+            async with _graph_summary_lock:
+                await _load_graph_summary()
+        except Exception as e:
+            logger.warning("Could not refresh the graph summary: %s", e)
+        await asyncio.sleep(GRAPH_SUMMARY_REFRESH_SECONDS)
+
+
+@mcp.tool(structured_output=False)
+@_instrumented
+async def get_graph_summary(
+    section: Literal["documents", "themes", "funding_areas", "countries"] | None = None,
+    key: str | None = None,
+) -> dict[str, Any]:
+    """Look up knowledge graph facts without a Cypher query.
+
+    Answers from an in-memory copy of the graph, re-read every few minutes:
+    the themes each document covers (with weights), each theme's indicators
+    (baseline, target), documents, total funding and priority countries,
+    each funding area's budget and allocations per theme, and each
+    country's priority themes (rank, rationale) and programs. Use
+    neo4j Cypher only for questions these do not cover.
+
+    Args:
+        section: "documents", "themes", "funding_areas" or "countries";
+            None returns all four.
+        key: Optional id within the section, e.g. "GH_2024", "TB", "PREV"
+            or "NGA"; requires section.
+
+    Returns:
+        {<section>: {<id>: facts}} for the requested section(s) or key,
+        plus "as_of" (when the summary was read from the graph).
+    """
+    if key is not None and section is None:
+        return {"error": "key requires a section"}
+    try:
+        summary = await _get_graph_summary()
+    except Exception as e:
+        logger.exception("get_graph_summary failed")
+        return {"error": f"Knowledge graph lookup failed: {e}"}
+
+    as_of = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(summary.loaded_at))
+    if section is None:
+        return {**{name: summary.section(name) for name in SECTIONS}, "as_of": as_of}
+    entries = summary.section(section)
+    if key is None:
+        return {section: entries, "as_of": as_of}
+    item_key = key if key in entries else key.upper()
+    if item_key not in entries:
+        return {
+            "error": f"Unknown {section} key {key!r}; "
+            f"choose from {', '.join(sorted(entries))}"
+        }
+    return {section: {item_key: entries[item_key]}, "as_of": as_of}
+
+
+# ---------------------------------------------------------------------------
+# Tool: get_chunk_context
+# ---------------------------------------------------------------------------
+
+MAX_CHUNK_CONTEXT = 10
+_CONTEXT_FIELDS = (
+    "chunk_id",
+    "doc_id",
+    "doc_title",
+    "chunk_text",
+    "section",
+    "page_number",
+    "chunk_order",
+)
+# Seed chunk ids are "<doc_id>_<chunk_order>", e.g. "GH_2024_003".
+_CHUNK_ID = re.compile(r"(?P<doc_id>.+)_(?P<order>\d+)")
+
+
+@dataclass(frozen=True)
+class _DocChunks:
+    """What is known about one document's chunk sequence.
+
+    ``covered`` holds every chunk_order a range query has already asked
+    for, including orders past either end of the document, so windows
+    inside it are served without a round trip.
+    """
+
+    chunks: dict[int, dict[str, Any]]  # chunk_order -> chunk
+    orders: dict[str, int]  # chunk_id -> chunk_order
+    covered: frozenset[int]
+
+
+_chunk_context_cache = TTLCache(
+    maxsize=CHUNK_CONTEXT_CACHE_DOCS, ttl=QUERY_CACHE_TTL_SECONDS
+)
+
+
+def _context_range(doc_id: str, first: int, last: int) -> dict[str, Any]:
+    """Bool clause for chunk_order first..last of one document."""
+    return {
+        "bool": {
+            "filter": [
+                {"term": {"doc_id": doc_id}},
+                {"range": {"chunk_order": {"gte": first, "lte": last}}},
+            ]
+        }
+    }
+
+
+def _context_query(query: dict[str, Any], size: int) -> dict[str, Any]:
+    return {
+        "size": size,
+        "query": query,
+        "sort": [{"chunk_order": "asc"}],
+        "track_total_hits": False,
+        "_source": list(_CONTEXT_FIELDS),
+    }
+
+
+def _merge_chunks(
+    known: _DocChunks | None,
+    hits: list[dict[str, Any]],
+    doc_id: str,
+    covered: range,
+) -> _DocChunks:
+    chunks = dict(known.chunks) if known else {}
+    orders = dict(known.orders) if known else {}
+    for chunk in _format_hits({"hits": {"hits": hits}}, _CONTEXT_FIELDS):
+        if chunk["doc_id"] == doc_id and chunk["chunk_order"] is not None:
+            chunks[chunk["chunk_order"]] = chunk
+            orders[chunk["chunk_id"]] = chunk["chunk_order"]
+    return _DocChunks(
+        chunks, orders, (known.covered if known else frozenset()) | set(covered)
+    )
+
+
+async def _fetch_context(
+    known: _DocChunks | None, doc_id: str, first: int, last: int
+) -> _DocChunks:
+    """Fetch chunk_order first..last of a document into its cache entry."""
+    response = await _get_search_backend().search(
+        _context_query(_context_range(doc_id, first, last), last - first + 1)
+    )
+    entry = _merge_chunks(
+        known, response["hits"]["hits"], doc_id, range(first, last + 1)
+    )
+    _chunk_context_cache.set(doc_id, entry)
+    return entry
+
+
+async def _locate_chunk(
+    chunk_id: str, before: int, after: int, guessed: _DocChunks | None
+) -> tuple[str, int, _DocChunks] | None:
+    """Find a chunk's (doc_id, chunk_order) and fetch its window with it.
+
+    The window is guessed from the chunk id and fetched in the same search
+    as the chunk itself. A chunk whose id does not follow the seed
+    convention costs a second search, and is located again on every call.
+    ``guessed`` is the cache entry of the document named by the chunk id.
+    """
+    guess = _CHUNK_ID.fullmatch(chunk_id)
+    anchor_clause = {"term": {"chunk_id": chunk_id}}
+    if guess is None:
+        query, size, window = anchor_clause, 1, range(0)
+    else:
+        order = int(guess["order"])
+        window = range(max(order - before, 0), order + after + 1)
+        query = {
+            "bool": {
+                "should": [
+                    anchor_clause,
+                    _context_range(guess["doc_id"], window.start, window.stop - 1),
+                ],
+                "minimum_should_match": 1,
+            }
+        }
+        size = len(window) + 1
+    response = await _get_search_backend().search(_context_query(query, size))
+    hits = response["hits"]["hits"]
+    anchor = next((h for h in hits if h["_source"].get("chunk_id") == chunk_id), None)
+    if anchor is None:
+        return None
+    doc_id = anchor["_source"]["doc_id"]
+    order = anchor["_source"]["chunk_order"]
+    if guess is not None and (guess["doc_id"], int(guess["order"])) == (doc_id, order):
+        entry = _merge_chunks(guessed, hits, doc_id, window)
+    else:
+        known = (
+            guessed
+            if guess is not None and guess["doc_id"] == doc_id
+            else await _cache_get(doc_id, _chunk_context_cache)
+        )
+        entry = _merge_chunks(known, [anchor], doc_id, range(0))
+    _chunk_context_cache.set(doc_id, entry)
+    return doc_id, order, entry
+
+
+@mcp.tool(structured_output=False)
+@_instrumented
+async def get_chunk_context(
+    chunk_id: str, before: int = 1, after: int = 1
+) -> dict[str, Any]:
+    """Get the chunks immediately before and after a chunk in its document.
+
+    Use this to read the surrounding text of a search hit (e.g. the start
+    of a list or the paragraph a figure refers to) instead of guessing
+    follow-up searches. Windows in a document already read are served from
+    memory.
+
+    Args:
+        chunk_id: A chunk_id from search results (e.g. "GH_2024_003").
+        before: Number of preceding chunks (0-10). Defaults to 1.
+        after: Number of following chunks (0-10). Defaults to 1.
+
+    Returns:
+        {"doc_id", "doc_title", "chunk_id", "chunks"}, where chunks are in
+        document order (the requested chunk included), each with chunk_id,
+        chunk_order, section, page_number and the full chunk_text. Fewer
+        chunks come back at the start or end of a document.
+    """
+    if not (0 <= before <= MAX_CHUNK_CONTEXT and 0 <= after <= MAX_CHUNK_CONTEXT):
+        return {"error": f"before and after must be between 0 and {MAX_CHUNK_CONTEXT}"}
+
+    try:
+        doc_id = order = entry = None
+        guess = _CHUNK_ID.fullmatch(chunk_id)
+        if guess is not None:
+            entry = await _cache_get(guess["doc_id"], _chunk_context_cache)
+            if entry is not None and chunk_id in entry.orders:
+                doc_id, order = guess["doc_id"], entry.orders[chunk_id]
+        if order is None:
+            located = await _locate_chunk(chunk_id, before, after, entry)
+            if located is None:
+                return {"error": f"Chunk {chunk_id} not found"}
+            doc_id, order, entry = located
+
+        first, last = max(order - before, 0), order + after
+        missing = [o for o in range(first, last + 1) if o not in entry.covered]
+        if missing:
+            entry = await _fetch_context(entry, doc_id, missing[0], missing[-1])
+
+        chunks = [entry.chunks[o] for o in range(first, last + 1) if o in entry.chunks]
+        return {
+            "doc_id": doc_id,
+            "doc_title": entry.chunks[order]["doc_title"],
+            "chunk_id": chunk_id,
+            "chunks": [
+                {k: v for k, v in c.items() if k not in ("doc_id", "doc_title")}
+                for c in chunks
+            ],
+        }
+
+    except Exception as e:
+        logger.exception("get_chunk_context failed")
+        return {"error": f"Chunk context lookup failed: {e}"}
+
+
+# ---------------------------------------------------------------------------
+# Page images: shared fetch and error reporting
+# ---------------------------------------------------------------------------
+
+
+def _page_blob_name(doc_id: str, page_num: int) -> str:
+    return f"{doc_id}/page_{page_num:03d}.png"
+
+
+def _is_not_found(e: Exception) -> bool:
+    return "ResourceNotFoundError" in type(e).__name__ or "BlobNotFound" in str(e)
+
+
+async def _fetch_blob(blob_name: str) -> tuple[str, bytes]:
+    """Fetch ``(etag, data)`` for a blob through the disk cache."""
+    return await _page_cache.fetch(
+        blob_name, lambda etag: _download_blob(blob_name, etag)
+    )
+
+
+async def _fetch_rendition(doc_id: str, page_num: int, spec: RenditionSpec) -> bytes:
+    """Return a page rendition, pre-generated if available, else rendered here."""
+    if spec.is_standard:
+        rendition_name = spec.blob_name(doc_id, page_num)
+        if _missing_renditions.get(rendition_name) is None:
+            try:
+                return (await _fetch_blob(rendition_name))[1]
+            except Exception as e:
+                if not _is_not_found(e):
+                    raise
+                _missing_renditions.set(rendition_name, True)
+
+    # Local renditions are cached under the original's ETag, so they are
+    # re-rendered exactly when the original changes.
+    source_name = _page_blob_name(doc_id, page_num)
+    etag, original = await _fetch_blob(source_name)
+    cache_key = f"{source_name}.{spec.suffix()}"
+    data = _page_cache.get_version(cache_key, etag)
+    if data is None:
+        with _metrics.stage("render"):
+            data = await asyncio.to_thread(render, original, spec)
+        _page_cache.put(cache_key, etag, data)
+    return data
+
+
+async def _fetch_page(
+    doc_id: str, page_num: int, spec: RenditionSpec | None = None
+) -> list[ContentBlock]:
+    """Fetch one page (through the disk cache) as content blocks; raises on error.
+
+    The page is returned as a small JSON metadata text block followed by a
+    native MCP image block, so the image bytes are base64-encoded exactly
+    once by the protocol rather than embedded in a JSON string. Concurrent
+    fetches of the same page and rendition share one download.
+    """
+    return await _page_flight.do(
+        (doc_id, page_num, spec), lambda: _load_page(doc_id, page_num, spec)
+    )
+
+
+async def _load_page(
+    doc_id: str, page_num: int, spec: RenditionSpec | None
+) -> list[ContentBlock]:
+    if spec is None:
+        blob_name = _page_blob_name(doc_id, page_num)
+        image_bytes = (await _fetch_blob(blob_name))[1]
+        content_type = mimetypes.guess_type(blob_name)[0] or "image/png"
+    else:
+        image_bytes = await _fetch_rendition(doc_id, page_num, spec)
+        content_type = spec.content_type
+
+    metadata = {
+        "doc_id": doc_id,
+        "page_num": page_num,
+        "content_type": content_type,
+        "bytes": len(image_bytes),
+    }
+    with _metrics.stage("base64"):
+        data = base64.b64encode(image_bytes).decode("ascii")
+    return [
+        _json_block(metadata),
+        ImageContent(type="image", data=data, mimeType=content_type),
+    ]
+
+
+def _json_block(value: Any) -> TextContent:
+    return TextContent(type="text", text=json.dumps(value))
+
+
+def _page_error(e: Exception, doc_id: str, page_num: int) -> dict[str, Any]:
+    """Translate a page fetch failure into the tool's error dict."""
+    blob_name = _page_blob_name(doc_id, page_num)
+    error_str = str(e)
+
+    if _is_not_found(e):
+        return {
+            "error": (
+                f"Page image not found: blob '{blob_name}' does not exist "
+                f"in container '{AZURE_STORAGE_CONTAINER}'. "
+                f"Page images may not have been seeded yet."
+            ),
+            "doc_id": doc_id,
+            "page_num": page_num,
+        }
+
+    if "ContainerNotFound" in error_str:
+        return {
+            "error": (
+                f"Container '{AZURE_STORAGE_CONTAINER}' does not exist. "
+                f"Azurite blob storage may not have been seeded."
+            ),
+            "doc_id": doc_id,
+            "page_num": page_num,
+        }
+
+    logger.error("Page fetch failed for %s", blob_name, exc_info=e)
+    return {
+        "error": f"Failed to retrieve page image: {e}",
+        "doc_id": doc_id,
+        "page_num": page_num,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Tool: get_page_image
+# ---------------------------------------------------------------------------
+
+
+@mcp.tool(structured_output=False)
+@_instrumented
+async def get_page_image(
+    doc_id: str,
+    page_num: int,
+    max_width: int | None = None,
+    format: Literal["png", "jpeg", "webp"] | None = None,
+    quality: int | None = None,
+) -> list[ContentBlock]:
+    """Retrieve a page image from Azure Blob Storage (Azurite).
+
+    Fetches the PNG image for a specific page of a strategy document.
+    The blob naming convention is: {doc_id}/page_{page_num:03d}.png
+    Recently viewed pages are served from a local disk cache.
+
+    Pass max_width and/or format to get a smaller rendition instead of the
+    full-resolution PNG — e.g. max_width=1024, format="webp" is enough to
+    read a page and costs far fewer tokens.
+
+    Args:
+        doc_id: Document identifier (e.g. "GH_2024").
+        page_num: Page number to retrieve (1-indexed).
+        max_width: Optional maximum width in pixels; larger pages are scaled
+            down, preserving aspect ratio.
+        format: Optional output format: "png" (default), "jpeg" or "webp".
+        quality: Encoder quality 1-100 for jpeg/webp. Defaults to 80.
+
+    Returns:
+        A text block with JSON metadata (doc_id, page_num, content_type,
+        bytes) followed by the page as an image block. Returns a single
+        text block with an error dict if the blob is not found.
+    """
+    try:
+        spec = RenditionSpec.parse(format, max_width, quality)
+    except ValueError as e:
+        return [_json_block({"error": str(e), "doc_id": doc_id, "page_num": page_num})]
+    try:
+        return await _fetch_page(doc_id, page_num, spec)
+    except Exception as e:
+        return [_json_block(_page_error(e, doc_id, page_num))]
+
+
+# ---------------------------------------------------------------------------
+# Tool: get_page_images
+# ---------------------------------------------------------------------------
+
+MAX_PAGES_PER_CALL = 20
+
+
+@mcp.tool(structured_output=False)
+@_instrumented
+async def get_page_images(
+    doc_id: str,
+    pages: list[int] | None = None,
+    start_page: int | None = None,
+    end_page: int | None = None,
+    max_width: int | None = None,
+    format: Literal["png", "jpeg", "webp"] | None = None,
+    quality: int | None = None,
+) -> list[ContentBlock]:
+    """Retrieve several page images of one document in a single call.
+
+    Pages are downloaded concurrently (at most PAGE_FETCH_CONCURRENCY at a
+    time, over the shared blob client's connection pool). Missing pages do
+    not fail the call — they are listed under "missing".
+
+    Args:
+        doc_id: Document identifier (e.g. "GH_2024").
+        pages: Explicit page numbers to retrieve (1-indexed).
+        start_page: First page of an inclusive range (used when pages is
+            not given).
+        end_page: Last page of the inclusive range.
+        max_width: Optional maximum width in pixels (see get_page_image).
+        format: Optional output format: "png" (default), "jpeg" or "webp".
+        quality: Encoder quality 1-100 for jpeg/webp. Defaults to 80.
+
+    Returns:
+        A summary text block (JSON with doc_id, "pages" found, "missing"
+        page numbers and "errors" for any other per-page failures), then a
+        metadata text block and an image block per page found, in page order.
+    """
+    if pages is None:
+        if start_page is None or end_page is None:
+            return [_json_block({"error": "Provide pages or start_page/end_page"})]
+        pages = list(range(start_page, end_page + 1))
+    page_nums = sorted(set(pages))
+    if len(page_nums) > MAX_PAGES_PER_CALL:
+        return [_json_block({"error": f"At most {MAX_PAGES_PER_CALL} pages per call"})]
+    try:
+        spec = RenditionSpec.parse(format, max_width, quality)
+    except ValueError as e:
+        return [_json_block({"error": str(e)})]
+
+    semaphore = asyncio.Semaphore(PAGE_FETCH_CONCURRENCY)
+
+    async def fetch(page_num: int) -> list[ContentBlock] | Exception:
+        async with semaphore:
+            try:
+                return await _fetch_page(doc_id, page_num, spec)
+            except Exception as e:
+                return e
+
+    outcomes = await asyncio.gather(*(fetch(p) for p in page_nums))
+
+    summary: dict[str, Any] = {
+        "doc_id": doc_id,
+        "pages": [],
+        "missing": [],
+        "errors": [],
+    }
+    blocks: list[ContentBlock] = []
+    for page_num, outcome in zip(page_nums, outcomes):
+        if not isinstance(outcome, Exception):
+            summary["pages"].append(page_num)
+            blocks.extend(outcome)
+        elif _is_not_found(outcome):
+            summary["missing"].append(page_num)
+        else:
+            summary["errors"].append(_page_error(outcome, doc_id, page_num))
+    return [_json_block(summary), *blocks]
+
+
+# ---------------------------------------------------------------------------
+# Tool: cache_stats
+# ---------------------------------------------------------------------------
+
+
+@mcp.tool(structured_output=False)
+@_instrumented
+async def cache_stats() -> dict[str, Any]:
+    """Report cache counters (for tuning, not for answering).
+
+    Returns:
+        A dict with "search" and "chunk_context" (size, hits, misses,
+        hit_rate, evictions, expirations, invalidations and the current
+        index generation), "page_images" (entries, bytes, hits,
+        revalidated, misses, hit_rate, evictions), "coalescing" (per
+        "search" and "page_images": calls in_flight, leaders that made a
+        backend call and calls coalesced onto one) and "graph_summary"
+        (fingerprint and age_seconds, or None before the first load)
+        sections.
+    """
+    return _cache_stats()
+
+
+def _cache_stats() -> dict[str, Any]:
+    return {
+        "search": _query_cache.stats(),
+        "chunk_context": _chunk_context_cache.stats(),
+        "page_images": _page_cache.stats(),
+        "coalescing": {
+            "search": _search_flight.stats(),
+            "page_images": _page_flight.stats(),
+        },
+        "graph_summary": (
+            {
+                "fingerprint": _graph_summary.fingerprint,
+                "age_seconds": round(time.time() - _graph_summary.loaded_at, 1),
+            }
+            if _graph_summary is not None
+            else None
+        ),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Tool: server_stats
+# ---------------------------------------------------------------------------
+
+
+@mcp.tool(structured_output=False)
+async def server_stats(tool: str | None = None, reset: bool = False) -> dict[str, Any]:
+    """Report per-tool latency, stage timings, result sizes and errors, and
+    cache hit rates (for performance tuning, not for answering).
+
+    Args:
+        tool: Optional tool name to report on; defaults to every tool called.
+        reset: Clear the tool metrics after reading them, e.g. between load
+            test runs.
+
+    Returns:
+        {"since": when recording started, "tools": {tool: {"calls",
+        "errors", "latency_ms", "stages_ms": {stage: ...}, "response_bytes"}},
+        "caches": as returned by cache_stats, "search_backend": OpenSearch
+        node breaker states and retry / hedge / fail-fast counts, once
+        used}. Latencies and sizes are summaries with count, mean, p50, p90,
+        p99 and max; stages include "backend" (search round trip, retries
+        and hedges included), "took" (OpenSearch engine time), "format",
+        "serialize", "blob", "base64" and others.
+    """
+    stats = {**_metrics.snapshot(tool), "caches": _cache_stats()}
+    if _search_backend is not None:
+        stats["search_backend"] = _search_backend.stats()
+    if reset:
+        _metrics.reset()
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+
+async def _serve(transport: str, prewarm: bool) -> None:
+    async with _server_lifespan(prewarm):
+        if transport == "stdio":
+            await mcp.run_stdio_async()
+            return
+        import uvicorn
+
+        # One process on purpose: every session shares the warm clients,
+        # connection pools and caches, which worker processes would not.
+        config = uvicorn.Config(
+            mcp.streamable_http_app(),
+            host=mcp.settings.host,
+            port=mcp.settings.port,
+            log_level="warning",
+            access_log=False,
+            timeout_graceful_shutdown=5,
+        )
+        await uvicorn.Server(config).serve()
+
+
+def main() -> None:
+    """Start the Strategy Review MCP server over stdio or Streamable HTTP."""
+    global _call_slots
+    parser = argparse.ArgumentParser(description="Strategy Review MCP server")
+    parser.add_argument("--transport", choices=("stdio", "http"), default=MCP_TRANSPORT)
+    parser.add_argument("--host", default=MCP_HTTP_HOST)
+    parser.add_argument("--port", type=int, default=MCP_HTTP_PORT)
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=MAX_CONCURRENT_CALLS,
+        help="tool calls run at once (0 = unlimited)",
+    )
+    parser.add_argument(
+        "--prewarm",
+        action=argparse.BooleanOptionalAction,
+        default=PREWARM_CLIENTS,
+        help="open the data store connections in the background at startup",
+    )
+    args = parser.parse_args()
+
+    if args.max_concurrency > 0:
+        _call_slots = asyncio.Semaphore(args.max_concurrency)
+    if args.host != mcp.settings.host:
+        # FastMCP only enables DNS rebinding protection for a loopback host.
+        mcp.settings.host = args.host
+        if args.host not in ("127.0.0.1", "localhost", "::1"):
+            mcp.settings.transport_security = None
+    mcp.settings.port = args.port
+    asyncio.run(_serve(args.transport, args.prewarm))
 
 
 if __name__ == "__main__":
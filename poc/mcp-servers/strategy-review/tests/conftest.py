@@ -0,0 +1,59 @@
+"""Shared fixtures: the server's tools over an in-process memory index."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from strategy_review_mcp import server
+from strategy_review_mcp.search_backends import MemoryBackend, TimedBackend
+
+Chunk = dict[str, Any]
+
+
+def chunk(doc_id: str, n: int, text: str, **fields: Any) -> Chunk:
+    """A chunk record as the ingest pipeline writes it."""
+    return {
+        "chunk_id": f"{doc_id}_{n:03d}",
+        "doc_id": doc_id,
+        "doc_title": fields.pop("doc_title", f"{doc_id} Strategy"),
+        "doc_year": 2024,
+        "organization": "Global Fund",
+        "chunk_text": text,
+        "section": "Overview",
+        "page_number": n,
+        "themes": [],
+        "countries": [],
+        "chunk_order": n,
+        **fields,
+    }
+
+
+@pytest.fixture
+def memory_index(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[Callable[[list[Chunk]], None]]:
+    """Serve the tools from a memory backend over the given chunks.
+
+    The result caches are cleared so no test sees another's results.
+    """
+
+    def install(chunks: list[Chunk]) -> None:
+        path = tmp_path / "chunks.ndjson"
+        path.write_text("".join(json.dumps(c) + "\n" for c in chunks))
+        monkeypatch.setattr(
+            server,
+            "_search_backend",
+            TimedBackend(MemoryBackend(path), server._metrics),
+        )
+        monkeypatch.setattr(server, "_index_generation_checked_at", float("-inf"))
+        server._query_cache.clear()
+        server._chunk_context_cache.clear()
+
+    yield install
+    server._query_cache.clear()
+    server._chunk_context_cache.clear()
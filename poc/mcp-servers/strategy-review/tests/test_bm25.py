@@ -0,0 +1,100 @@
+"""The memory backend scores like OpenSearch: Lucene's BM25 (k1=1.2,
+b=0.75) with one-byte length norms.
+
+The expected scores are worked out by hand from Lucene's formula, so a
+change to the scoring that would make the memory backend rank differently
+from OpenSearch fails here rather than in a comparison against a live node.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from strategy_review_mcp.bm25 import BM25Index, _encoded_length
+
+# chunk_text lengths 6, 7, 4, 6, 6 and 100 terms: avgdl = 129 / 6 = 21.5.
+# c6 is long enough that its norm is lossy: Lucene reads 100 back as 96.
+CORPUS = [
+    ("c1", "TB Strategy", "Tuberculosis elimination requires early case finding."),
+    ("c2", "Malaria Plan", "Malaria control and tuberculosis care in Nigeria."),
+    (
+        "c3",
+        "Tuberculosis Elimination",
+        "Tuberculosis tuberculosis tuberculosis screening.",
+    ),
+    ("c4", "Maternal Health", "Maternal health services reach rural mothers."),
+    ("c5", "Child Health", "Case finding for malaria in children."),
+    ("c6", "Annual Report", "Tuberculosis" + " funding" * 99),
+]
+
+
+@pytest.fixture(scope="module")
+def index() -> BM25Index:
+    docs = [
+        {"chunk_id": chunk_id, "doc_title": title, "chunk_text": text}
+        for chunk_id, title, text in CORPUS
+    ]
+    return BM25Index(docs, [d["chunk_id"] for d in docs])
+
+
+def ranked(index: BM25Index, query: dict) -> list[tuple[str, float]]:
+    hits = index.search({"query": query})["hits"]["hits"]
+    return [(hit["_id"], hit["_score"]) for hit in hits]
+
+
+def assert_ranked(actual, expected) -> None:
+    assert [doc for doc, _ in actual] == [doc for doc, _ in expected]
+    assert [score for _, score in actual] == pytest.approx(
+        [score for _, score in expected], rel=1e-6
+    )
+
+
+@pytest.mark.parametrize(
+    "length, lucene",
+    [(1, 1), (23, 23), (24, 24), (25, 25), (100, 96), (1000, 984)],
+)
+def test_length_norm_matches_lucene(length: int, lucene: int) -> None:
+    # SmallFloat.intToByte4 / byte4ToInt: exact below 24, lossy above.
+    assert _encoded_length(length) == lucene
+
+
+def test_single_term(index: BM25Index) -> None:
+    # idf = ln(1 + (6 - 4 + 0.5) / (4 + 0.5)) = 0.441833
+    # c3: tf 3, len 4:  0.441833 * 3 / (3 + 1.2 * (0.25 + 0.75 * 4 / 21.5))
+    # c6: tf 1, len 96: 0.441833 * 1 / (1 + 1.2 * (0.25 + 0.75 * 96 / 21.5))
+    assert_ranked(
+        ranked(index, {"match": {"chunk_text": "tuberculosis"}}),
+        [("c3", 0.382270), ("c1", 0.284840), ("c2", 0.277355), ("c6", 0.0830731)],
+    )
+
+
+def test_terms_add_up(index: BM25Index) -> None:
+    # "case" and "finding": df 2, idf = ln(1 + 4.5 / 2.5) = 1.029619 each.
+    assert_ranked(
+        ranked(index, {"match": {"chunk_text": "tuberculosis case finding"}}),
+        [
+            ("c1", 1.612385),
+            ("c5", 1.327545),
+            ("c3", 0.382270),
+            ("c2", 0.277355),
+            ("c6", 0.0830731),
+        ],
+    )
+
+
+def test_multi_match_takes_the_best_boosted_field(index: BM25Index) -> None:
+    # Only c3's title (length 2, avgdl 2) has both terms, each with df 1:
+    # 2 * 2 * ln(1 + 5.5 / 1.5) / (1 + 1.2) = 2.800809 beats its
+    # chunk_text score of 0.382270.
+    assert_ranked(
+        ranked(
+            index,
+            {
+                "multi_match": {
+                    "query": "tuberculosis elimination",
+                    "fields": ["doc_title^2", "chunk_text"],
+                }
+            },
+        ),
+        [("c3", 2.800809), ("c1", 1.277930), ("c2", 0.277355), ("c6", 0.0830731)],
+    )
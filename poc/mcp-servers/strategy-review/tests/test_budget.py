@@ -0,0 +1,164 @@
+"""max_chars bounds what the model receives: each tool's response, as
+FastMCP serializes it, fits the budget."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pydantic_core
+import pytest
+from conftest import chunk
+
+from strategy_review_mcp import server
+from strategy_review_mcp.budget import result_chars
+
+QUERY = "tuberculosis"
+
+FIELDS = ["chunk_text", "snippet", "doc_title", "page_number"]
+
+
+def corpus() -> list[dict]:
+    sentence = "Tuberculosis case finding expands to every district clinic. "
+    return [
+        chunk(f"DOC_{d}", n, sentence * (4 + n + d), themes=["TB"])
+        for d in range(1, 4)
+        for n in range(1, 9)
+    ]
+
+
+def sent_chars(response: Any) -> int:
+    """Characters FastMCP sends: one JSON text block per list item."""
+    if isinstance(response, list):
+        return sum(result_chars(item) for item in response)
+    return len(pydantic_core.to_json(response, fallback=str, indent=2).decode())
+
+
+def run(tool: str, **kwargs: Any) -> Any:
+    return asyncio.run(getattr(server, tool)(**kwargs))
+
+
+@pytest.mark.parametrize("max_chars", [800, 2000, 5000])
+def test_search_chunks(memory_index, max_chars: int) -> None:
+    memory_index(corpus())
+
+    results = run(
+        "search_chunks", query=QUERY, top_k=10, fields=FIELDS, max_chars=max_chars
+    )
+
+    assert results and "error" not in results[0]
+    assert sent_chars(results) <= max_chars
+
+
+@pytest.mark.parametrize("max_chars", [800, 2000, 5000])
+def test_pages_fit_with_their_cursor(memory_index, max_chars: int) -> None:
+    memory_index(corpus())
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        page = run(
+            "search_chunks",
+            query=QUERY,
+            top_k=6,
+            fields=FIELDS,
+            paginate=True,
+            cursor=cursor,
+            max_chars=max_chars,
+        )
+        assert "error" not in page
+        # A full last page is only known to be last on the empty one after it.
+        assert page["results"] or page["next_cursor"] is None
+        assert sent_chars(page) <= max_chars
+        seen += [r["chunk_id"] for r in page["results"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    # Hits dropped to fit a page start the next one: none lost or repeated.
+    assert sorted(seen) == sorted(c["chunk_id"] for c in corpus())
+
+
+def test_batch_shares_the_budget(memory_index) -> None:
+    memory_index(corpus())
+    queries = [{"query": QUERY, "top_k": 5}, {"query": "district clinic", "top_k": 5}]
+
+    entries = run("search_chunks_batch", queries=queries, max_chars=3000)
+
+    assert [e["query"] for e in entries] == [q["query"] for q in queries]
+    assert all(e["results"] for e in entries)
+    assert sent_chars(entries) <= 3000
+
+
+def test_graph_search(memory_index, monkeypatch: pytest.MonkeyPatch) -> None:
+    memory_index(corpus())
+
+    async def resolve_graph(*_: Any) -> dict[str, Any]:
+        return {
+            "themes": [{"id": "TB", "name": "Tuberculosis"}],
+            "countries": [],
+            "doc_ids": ["DOC_1", "DOC_2", "DOC_3"],
+        }
+
+    monkeypatch.setattr(server, "_resolve_graph", resolve_graph)
+
+    result = run("graph_search", query=QUERY, theme="TB", fields=FIELDS, max_chars=1500)
+
+    assert "error" not in result
+    assert result["results"]
+    assert sent_chars(result) <= 1500
+
+
+def test_batch_error_entries_count_against_the_budget() -> None:
+    hit = {"chunk_id": "GH_2024_001", "snippet": "Tuberculosis case finding. " * 10}
+    entries = [
+        {"query": "tb", "error": "Search failed: " + "shard failure; " * 200},
+        {"query": "malaria", "results": [hit, hit, hit]},
+    ]
+
+    fitted = server._fit_batch(entries, 1200)
+
+    assert sent_chars(fitted) <= 1200
+    assert fitted[0]["error"].startswith("Search failed: shard failure;")
+    assert fitted[0]["error"].endswith(" …")
+    assert fitted[1]["results"]
+
+
+def test_batch_share_too_small_for_a_result() -> None:
+    hit = {"chunk_id": "GH_2024_001", "snippet": "Tuberculosis case finding."}
+    entries = [{"query": q, "results": [hit]} for q in ("tb", "malaria")]
+
+    fitted = server._fit_batch(entries, 240)
+
+    assert sent_chars(fitted) <= 240
+    assert fitted[0]["error"] == (
+        "120 characters of the budget do not fit one result; "
+        "raise it or send fewer queries"
+    )
+    assert "results" not in fitted[1]
+    assert server._fit_batch(entries, 20) == [
+        {
+            "error": "A budget of 20 characters does not fit 2 queries; "
+            "raise it or send fewer queries"
+        }
+    ]
+
+
+@pytest.mark.parametrize("top_k", [-1, 0, server.MAX_TOP_K + 1])
+def test_top_k_out_of_range_is_rejected(memory_index, top_k: int) -> None:
+    memory_index(corpus())
+    error = f"top_k must be between 1 and {server.MAX_TOP_K}"
+
+    assert run("search_documents", query=QUERY, top_k=top_k) == [{"error": error}]
+    assert run("search_chunks", query=QUERY, top_k=top_k) == [{"error": error}]
+    assert run("search_chunks", query=QUERY, top_k=top_k, paginate=True) == [
+        {"error": error}
+    ]
+    assert run(
+        "search_chunks_batch",
+        queries=[{"query": QUERY}, {"query": QUERY, "top_k": top_k}],
+    ) == [{"error": error}]
+    assert run(
+        "search_documents_batch", queries=[{"query": QUERY, "top_k": top_k}]
+    ) == [{"error": error}]
+    assert run("graph_search", query=QUERY, theme="TB", top_k=top_k) == {"error": error}
@@ -0,0 +1,139 @@
+"""The search result cache: TTL, LRU, counters and index generations."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import pytest
+from conftest import chunk
+
+from strategy_review_mcp import server
+from strategy_review_mcp.cache import TTLCache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+def test_entries_expire_after_the_ttl(clock: Clock) -> None:
+    cache = TTLCache(maxsize=10, ttl=60, clock=clock)
+    cache.set("q", [1])
+
+    clock.now = 59.9
+    assert cache.get("q") == [1]
+    clock.now = 60
+    assert cache.get("q") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock: Clock) -> None:
+    cache = TTLCache(maxsize=2, ttl=60, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # b is now the least recently used
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_hit_and_miss_counters(clock: Clock) -> None:
+    cache = TTLCache(maxsize=10, ttl=60, clock=clock)
+    cache.get("q")
+    cache.set("q", 1)
+    cache.get("q")
+    cache.get("q")
+    cache.get("other")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 2, 0.5)
+
+
+@pytest.mark.parametrize("maxsize, ttl", [(0, 60), (10, 0)])
+def test_disabled_cache_stores_nothing(maxsize: int, ttl: float) -> None:
+    cache = TTLCache(maxsize=maxsize, ttl=ttl)
+    cache.set("q", 1)
+    assert not cache.enabled
+    assert cache.get("q") is None
+
+
+def test_new_generation_drops_every_entry(clock: Clock) -> None:
+    cache = TTLCache(maxsize=10, ttl=60, clock=clock)
+    cache.sync_generation(("chunks", 1))
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.sync_generation(("chunks", 1))
+    assert cache.get("a") == 1
+
+    cache.sync_generation(("chunks", 2))
+    assert cache.get("a") is None and cache.get("b") is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_unknown_generation_leaves_the_cache_alone(clock: Clock) -> None:
+    cache = TTLCache(maxsize=10, ttl=60, clock=clock)
+    cache.sync_generation(("chunks", 1))
+    cache.set("a", 1)
+
+    cache.sync_generation(None)  # e.g. the backend did not answer
+    assert cache.get("a") == 1
+
+    # Nor does None count as a change once the generation is back.
+    cache.sync_generation(("chunks", 1))
+    assert cache.get("a") == 1
+    assert cache.stats()["invalidations"] == 0
+
+
+# ---------------------------------------------------------------------------
+# Through the search tools
+# ---------------------------------------------------------------------------
+
+
+def search(query: str) -> list[dict]:
+    return asyncio.run(server.search_chunks(query, fields=["chunk_text"]))
+
+
+def test_repeated_search_is_served_from_the_cache(memory_index) -> None:
+    memory_index([chunk("GH_2024", 1, "Tuberculosis case finding in prisons.")])
+    hits = server._query_cache.hits
+
+    first = search("tuberculosis")
+    second = search("  Tuberculosis ")  # normalized to the same key
+
+    assert second == first
+    assert server._query_cache.hits == hits + 1
+
+
+def test_reseeded_index_is_not_served_stale(
+    memory_index, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    memory_index([chunk("GH_2024", 1, "Tuberculosis case finding in prisons.")])
+    assert search("tuberculosis")[0]["chunk_text"].endswith("in prisons.")
+
+    path = tmp_path / "chunks.ndjson"
+    reseeded = chunk("GH_2024", 1, "Tuberculosis case finding in schools.")
+    path.write_text(json.dumps(reseeded) + "\n")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    # The next lookup re-reads the generation instead of waiting out
+    # INDEX_GENERATION_CHECK_SECONDS.
+    monkeypatch.setattr(server, "_index_generation_checked_at", float("-inf"))
+
+    assert search("tuberculosis")[0]["chunk_text"].endswith("in schools.")
+    assert server._query_cache.stats()["invalidations"] >= 1
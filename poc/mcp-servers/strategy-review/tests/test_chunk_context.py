@@ -0,0 +1,115 @@
+"""get_chunk_context: the window around a chunk, in as few searches as
+possible."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+from conftest import chunk
+
+from strategy_review_mcp import server
+
+
+def corpus() -> list[dict]:
+    chunks = [chunk("GH_2024", n, f"Global health, part {n}.") for n in range(1, 7)]
+    # Ids that do not follow "<doc_id>_<chunk_order>".
+    chunks += [
+        chunk("ANNUAL", n, f"Annual report, part {n}.", chunk_id=f"annual-{c}")
+        for n, c in enumerate("abcd", start=1)
+    ]
+    # An id that looks like the convention but names the wrong order.
+    chunks += [
+        chunk("MAL_2025", 1, "Malaria, part 1.", chunk_id="MAL_2025_009"),
+        chunk("MAL_2025", 2, "Malaria, part 2."),
+    ]
+    return chunks
+
+
+@pytest.fixture
+def searches(memory_index, monkeypatch: pytest.MonkeyPatch) -> list[dict]:
+    """Serve the corpus; the list collects every search body sent."""
+    memory_index(corpus())
+    backend = server._search_backend
+    bodies: list[dict] = []
+    search = backend.search
+
+    async def counted(body: dict[str, Any]) -> dict[str, Any]:
+        bodies.append(body)
+        return await search(body)
+
+    monkeypatch.setattr(backend, "search", counted)
+    return bodies
+
+
+def context(chunk_id: str, before: int = 1, after: int = 1) -> dict[str, Any]:
+    return asyncio.run(server.get_chunk_context(chunk_id, before, after))
+
+
+def orders(result: dict[str, Any]) -> list[int]:
+    assert "error" not in result, result
+    return [c["chunk_order"] for c in result["chunks"]]
+
+
+def test_window_is_fetched_with_the_chunk_in_one_search(searches) -> None:
+    result = context("GH_2024_003", 1, 2)
+
+    assert orders(result) == [2, 3, 4, 5]
+    assert result["doc_id"] == "GH_2024"
+    assert result["doc_title"] == "GH_2024 Strategy"
+    assert result["chunks"][1]["chunk_text"] == "Global health, part 3."
+    assert len(searches) == 1
+
+
+def test_window_at_the_start_of_a_document(searches) -> None:
+    assert orders(context("GH_2024_001", 3, 1)) == [1, 2]
+    assert len(searches) == 1
+
+
+def test_window_at_the_end_of_a_document(searches) -> None:
+    assert orders(context("GH_2024_006", 1, 4)) == [5, 6]
+    assert len(searches) == 1
+    # Orders past the end were asked for already: no second search.
+    assert orders(context("GH_2024_006", 0, 2)) == [6]
+    assert len(searches) == 1
+
+
+def test_windows_already_read_come_from_the_cache(searches) -> None:
+    context("GH_2024_003", 2, 2)  # orders 1-5
+    assert orders(context("GH_2024_002", 1, 1)) == [1, 2, 3]
+    assert orders(context("GH_2024_004", 1, 1)) == [3, 4, 5]
+    assert len(searches) == 1
+
+    # Only the part not read yet is fetched.
+    assert orders(context("GH_2024_005", 0, 1)) == [5, 6]
+    assert len(searches) == 2
+    assert searches[1]["query"]["bool"]["filter"][1] == {
+        "range": {"chunk_order": {"gte": 6, "lte": 6}}
+    }
+
+
+def test_chunk_id_without_the_seed_convention(searches) -> None:
+    result = context("annual-c", 1, 1)
+
+    assert result["doc_id"] == "ANNUAL"
+    assert [c["chunk_id"] for c in result["chunks"]] == [
+        "annual-b",
+        "annual-c",
+        "annual-d",
+    ]
+    assert len(searches) == 2  # locate the chunk, then its window
+
+
+def test_wrong_guess_falls_back_to_the_real_order(searches) -> None:
+    # The id suggests order 9; the chunk is order 1 of MAL_2025.
+    result = context("MAL_2025_009", 1, 1)
+
+    assert orders(result) == [1, 2]
+    assert result["chunks"][0]["chunk_id"] == "MAL_2025_009"
+    assert len(searches) == 2
+
+
+def test_unknown_chunk(searches) -> None:
+    assert context("GH_2024_042") == {"error": "Chunk GH_2024_042 not found"}
+    assert context("no-such-chunk") == {"error": "Chunk no-such-chunk not found"}
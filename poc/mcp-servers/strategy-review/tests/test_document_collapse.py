@@ -0,0 +1,86 @@
+"""search_documents returns one hit per document, even when a single
+document holds most of the matching chunks."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from conftest import chunk
+
+from strategy_review_mcp import server
+
+QUERY = "tuberculosis elimination"
+
+LONG = "TB_COMPENDIUM"
+
+
+def skewed_corpus() -> list[dict]:
+    """One document whose every chunk matches strongly, and a few that
+    match once each."""
+    chunks = [
+        chunk(
+            LONG,
+            n,
+            f"Tuberculosis elimination plan, part {n}: tuberculosis "
+            "elimination needs case finding and tuberculosis treatment.",
+            doc_title="Tuberculosis Elimination Compendium",
+        )
+        for n in range(1, 31)
+    ]
+    for d in range(1, 7):
+        doc_id = f"SHORT_{d}"
+        chunks.append(
+            chunk(
+                doc_id,
+                1,
+                f"Programme {d} funds clinics, trains nurses and buys supplies; "
+                "it also supports tuberculosis screening in prisons.",
+            )
+        )
+        chunks.append(chunk(doc_id, 2, "Maternal health services reach mothers."))
+    return chunks
+
+
+def test_distinct_documents_fill_top_k(memory_index) -> None:
+    memory_index(skewed_corpus())
+
+    results = asyncio.run(server.search_documents(QUERY, top_k=5))
+
+    doc_ids = [r["doc_id"] for r in results]
+    assert len(doc_ids) == 5
+    assert len(set(doc_ids)) == 5
+    assert doc_ids[0] == LONG
+
+
+def test_chunk_search_is_not_collapsed(memory_index) -> None:
+    # The same query over chunks is all LONG: without the collapse the
+    # document results above would be too.
+    memory_index(skewed_corpus())
+
+    results = asyncio.run(server.search_chunks(QUERY, top_k=5))
+
+    assert [r["doc_id"] for r in results] == [LONG] * 5
+
+
+def test_collapse_returns_more_documents_in_a_smaller_response(memory_index) -> None:
+    # The same comparison as benchmarks/bench_document_collapse.py: the
+    # previous strategy fetched top_k * 5 chunks and deduped them in Python.
+    memory_index(skewed_corpus())
+    collapsed_body = server._documents_query(QUERY, 5)
+    over_body = {
+        k: v for k, v in collapsed_body.items() if k not in ("collapse", "size")
+    }
+    over_body["size"] = 5 * 5
+
+    backend = server._get_search_backend()
+    collapsed = asyncio.run(backend.search(collapsed_body))
+    over = asyncio.run(backend.search(over_body))
+
+    def doc_ids(response: dict) -> list[str]:
+        return [h["_source"]["doc_id"] for h in response["hits"]["hits"]]
+
+    assert len(doc_ids(collapsed)) == len(set(doc_ids(collapsed))) == 5
+    assert len(doc_ids(over)) == 25
+    assert len(set(doc_ids(over))) < 5
+    assert len(json.dumps(collapsed)) * 3 < len(json.dumps(over))
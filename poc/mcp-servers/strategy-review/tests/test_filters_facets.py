@@ -0,0 +1,144 @@
+"""Structured filters and facet_counts on the memory backend."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+from conftest import chunk
+
+from strategy_review_mcp import server
+
+
+def corpus() -> list[dict]:
+    def doc(doc_id: str, texts: list[str], **fields: Any) -> list[dict]:
+        return [chunk(doc_id, n, t, **fields) for n, t in enumerate(texts, start=1)]
+
+    return [
+        *doc(
+            "GF_2024",
+            [
+                "Tuberculosis case finding in prisons.",
+                "Tuberculosis treatment and tuberculosis screening.",
+                "Programme management costs.",
+            ],
+            themes=["TB"],
+            countries=["NGA"],
+            organization="Global Fund",
+            doc_year=2024,
+        ),
+        *doc(
+            "WHO_2023",
+            ["Tuberculosis and HIV co-infection.", "HIV testing in clinics."],
+            themes=["TB", "HIV"],
+            countries=["KEN"],
+            organization="WHO",
+            doc_year=2023,
+        ),
+        *doc(
+            "WHO_2025",
+            ["Maternal health and tuberculosis in pregnancy."],
+            themes=["MNH"],
+            countries=["NGA", "KEN"],
+            organization="WHO",
+            doc_year=2025,
+        ),
+    ]
+
+
+def scores(**kwargs: Any) -> dict[str, float]:
+    results = asyncio.run(
+        server.search_chunks("tuberculosis", top_k=20, fields=["score"], **kwargs)
+    )
+    return {r["chunk_id"]: r["score"] for r in results}
+
+
+def test_filters_are_in_the_bool_filter_context() -> None:
+    filters = {"themes": ["TB"], "countries": ["NGA"], "doc_year_min": 2024}
+    body = server._chunks_query("tuberculosis", None, 5, filters=filters)
+
+    assert body["query"]["bool"]["must"] == [{"match": {"chunk_text": "tuberculosis"}}]
+    assert body["query"]["bool"]["filter"] == [
+        {"terms": {"themes": ["TB"]}},
+        {"terms": {"countries": ["NGA"]}},
+        {"range": {"doc_year": {"gte": 2024}}},
+    ]
+
+
+@pytest.mark.parametrize(
+    "filters, expected",
+    [
+        ({"themes": ["TB"]}, ["GF_2024_001", "GF_2024_002", "WHO_2023_001"]),
+        ({"themes": ["HIV", "MNH"]}, ["WHO_2023_001", "WHO_2025_001"]),
+        ({"countries": ["NGA"], "organization": ["WHO"]}, ["WHO_2025_001"]),
+        ({"doc_year_min": 2024}, ["GF_2024_001", "GF_2024_002", "WHO_2025_001"]),
+        ({"doc_year_max": 2023}, ["WHO_2023_001"]),
+    ],
+)
+def test_filters_narrow_without_changing_scores(
+    memory_index, filters: dict, expected: list[str]
+) -> None:
+    memory_index(corpus())
+    unfiltered = scores()
+
+    filtered = scores(filters=filters)
+
+    # Values within a filter match any of them; filters must all match.
+    assert sorted(filtered) == expected
+    assert filtered == {c: unfiltered[c] for c in filtered}
+
+
+def facet_counts(**kwargs: Any) -> dict[str, Any]:
+    return asyncio.run(server.facet_counts(**kwargs))
+
+
+def test_facet_counts_over_every_chunk(memory_index) -> None:
+    memory_index(corpus())
+
+    result = facet_counts()
+
+    assert (result["chunks"], result["documents"]) == (6, 3)
+    facets = {
+        field: [(b["value"], b["chunks"], b["documents"]) for b in buckets]
+        for field, buckets in result["facets"].items()
+    }
+    assert facets == {
+        "themes": [("TB", 5, 2), ("HIV", 2, 1), ("MNH", 1, 1)],
+        "countries": [("NGA", 4, 2), ("KEN", 3, 2)],
+        "organization": [("Global Fund", 3, 1), ("WHO", 3, 2)],
+        "doc_year": [(2024, 3, 1), (2023, 2, 1), (2025, 1, 1)],
+        "doc_id": [("GF_2024", 3, 1), ("WHO_2023", 2, 1), ("WHO_2025", 1, 1)],
+    }
+    assert "other_chunks" not in result
+
+
+def test_facet_counts_for_a_query_and_filters(memory_index) -> None:
+    memory_index(corpus())
+
+    result = facet_counts(
+        query="tuberculosis", filters={"countries": ["NGA"]}, facets=["doc_id"]
+    )
+
+    assert (result["chunks"], result["documents"]) == (3, 2)
+    assert result["facets"] == {
+        "doc_id": [
+            {"value": "GF_2024", "chunks": 2, "documents": 1},
+            {"value": "WHO_2025", "chunks": 1, "documents": 1},
+        ]
+    }
+
+
+def test_facets_cut_off_by_size_report_the_rest(memory_index) -> None:
+    memory_index(corpus())
+
+    result = facet_counts(doc_id="WHO_2023", facets=["themes"], size=1)
+
+    # Tied counts go by value, as in OpenSearch's terms aggregation.
+    assert result["facets"]["themes"] == [{"value": "HIV", "chunks": 2, "documents": 1}]
+    assert result["other_chunks"] == {"themes": 2}
+
+
+def test_unknown_facet_is_an_error(memory_index) -> None:
+    memory_index(corpus())
+    assert facet_counts(facets=["colour"])["error"].startswith("Unknown facets")
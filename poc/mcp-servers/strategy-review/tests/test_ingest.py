@@ -0,0 +1,129 @@
+"""Incremental ingestion: unchanged chunks are skipped, stale ones deleted."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from strategy_review_mcp import ingest
+
+INDEX = "strategy-chunks"
+
+
+class FakeOpenSearch:
+    """An index as a dict, plus the index settings ingest() touches."""
+
+    def __init__(self) -> None:
+        self.docs: dict[str, dict[str, Any]] = {}
+        self.actions: list[dict[str, Any]] = []
+        self.refresh_interval: str | None = "5s"
+        self.indices = SimpleNamespace(
+            get_settings=self._get_settings,
+            put_settings=self._put_settings,
+            refresh=lambda index: None,
+        )
+
+    def _get_settings(self, index: str, name: str) -> dict[str, Any]:
+        settings = {"refresh_interval": self.refresh_interval}
+        return {index: {"settings": {"index": settings}}}
+
+    def _put_settings(self, index: str, body: dict[str, Any]) -> None:
+        self.refresh_interval = body["index"]["refresh_interval"]
+
+    def scan(self, client: Any, index: str, **_: Any) -> Iterator[dict[str, Any]]:
+        for chunk_id, source in self.docs.items():
+            yield {"_id": chunk_id, "_source": source}
+
+    def parallel_bulk(
+        self, client: Any, actions: Iterable[dict[str, Any]], **_: Any
+    ) -> Iterator[tuple[bool, dict[str, Any]]]:
+        for action in actions:
+            self.actions.append(action)
+            if action.get("_op_type") == "delete":
+                del self.docs[action["_id"]]
+            else:
+                self.docs[action["_id"]] = action["_source"]
+            yield True, {}
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> FakeOpenSearch:
+    client = FakeOpenSearch()
+    monkeypatch.setattr(
+        ingest,
+        "helpers",
+        SimpleNamespace(scan=client.scan, parallel_bulk=client.parallel_bulk),
+    )
+    return client
+
+
+def document(doc_id: str, *pages: str) -> dict[str, Any]:
+    return {
+        "doc_id": doc_id,
+        "doc_title": f"{doc_id} Strategy",
+        "pages": [
+            {"page_number": n, "text": text} for n, text in enumerate(pages, start=1)
+        ],
+    }
+
+
+def run(client: FakeOpenSearch, *docs: dict[str, Any], **kwargs: Any):
+    client.actions.clear()
+    chunks = [c for doc in docs for c in ingest.chunk_document(doc)]
+    return ingest.ingest(client, INDEX, chunks, threads=1, **kwargs)
+
+
+GH = document("GH_2024", "Executive summary.", "Tuberculosis.", "Malaria.")
+WHO = document("WHO_2023", "HIV testing.")
+
+
+def test_second_run_writes_nothing(client: FakeOpenSearch) -> None:
+    first = run(client, GH, WHO)
+    assert (first.read, first.indexed, first.unchanged) == (4, 4, 0)
+    assert all(ingest.HASH_FIELD in c for c in client.docs.values())
+
+    second = run(client, GH, WHO)
+
+    assert (second.read, second.indexed, second.unchanged) == (4, 0, 4)
+    assert second.deleted == 0
+    assert client.actions == []
+
+
+def test_only_changed_chunks_are_reindexed(client: FakeOpenSearch) -> None:
+    run(client, GH, WHO)
+
+    edited = document(
+        "GH_2024", "Executive summary.", "Tuberculosis, revised.", "Malaria."
+    )
+    stats = run(client, edited, WHO)
+
+    assert (stats.indexed, stats.unchanged) == (1, 3)
+    assert [a["_id"] for a in client.actions] == ["GH_2024_002"]
+    assert client.docs["GH_2024_002"]["chunk_text"] == "Tuberculosis, revised."
+
+
+def test_stale_chunks_of_a_shorter_version_are_deleted(client: FakeOpenSearch) -> None:
+    run(client, GH, WHO)
+
+    stats = run(client, document("GH_2024", "Executive summary."))
+
+    assert stats.deleted == 2
+    # WHO_2023 was not re-ingested, so its chunks are left alone.
+    assert sorted(client.docs) == ["GH_2024_001", "WHO_2023_001"]
+
+
+def test_full_run_and_a_new_model_reindex_everything(client: FakeOpenSearch) -> None:
+    run(client, GH, WHO)
+
+    assert run(client, GH, WHO, full=True).indexed == 4
+    # The embedding model salts the hash: a new model re-embeds every chunk.
+    assert run(client, GH, WHO, salt=b"model-v2").indexed == 4
+    assert run(client, GH, WHO, salt=b"model-v2").indexed == 0
+
+
+def test_refresh_interval_is_restored(client: FakeOpenSearch) -> None:
+    run(client, GH)
+    assert client.refresh_interval == "5s"
@@ -0,0 +1,116 @@
+"""The on-disk page image cache, against a fake blob store."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from strategy_review_mcp.page_cache import PageImageCache
+
+KEY = "GH_2024/page_003.png"
+
+
+class Blob:
+    """One blob: answers If-None-Match with a 304 (None) when unchanged."""
+
+    def __init__(self, data: bytes, etag: str = '"0x1"') -> None:
+        self.data = data
+        self.etag = etag
+        self.requests: list[str | None] = []
+
+    async def download(self, etag: str | None) -> tuple[str, bytes] | None:
+        self.requests.append(etag)
+        if etag == self.etag:
+            return None
+        return self.etag, self.data
+
+
+def fetch(cache: PageImageCache, blob: Blob, key: str = KEY) -> tuple[str, bytes]:
+    return asyncio.run(cache.fetch(key, blob.download))
+
+
+def cached_files(root: Path) -> list[str]:
+    return sorted(p.relative_to(root).as_posix() for p in root.rglob("*@*"))
+
+
+def test_fresh_entry_is_served_from_disk(tmp_path: Path) -> None:
+    cache = PageImageCache(tmp_path, max_bytes=1000, max_age=3600)
+    blob = Blob(b"page three")
+
+    assert fetch(cache, blob) == ('"0x1"', b"page three")
+    assert fetch(cache, blob) == ('"0x1"', b"page three")
+
+    assert blob.requests == [None]
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert cached_files(tmp_path) == [f"{KEY}@%220x1%22"]
+
+
+def test_stale_entry_is_revalidated_with_its_etag(tmp_path: Path) -> None:
+    cache = PageImageCache(tmp_path, max_bytes=1000, max_age=0)
+    blob = Blob(b"page three")
+    fetch(cache, blob)
+
+    assert fetch(cache, blob) == ('"0x1"', b"page three")
+
+    # The second request carried If-None-Match and got a 304.
+    assert blob.requests == [None, '"0x1"']
+    assert cache.revalidated == 1
+
+
+def test_changed_blob_replaces_the_cached_file(tmp_path: Path) -> None:
+    cache = PageImageCache(tmp_path, max_bytes=1000, max_age=0)
+    blob = Blob(b"page three")
+    fetch(cache, blob)
+
+    blob.data, blob.etag = b"page three, revised", '"0x2"'
+
+    assert fetch(cache, blob) == ('"0x2"', b"page three, revised")
+    assert cached_files(tmp_path) == [f"{KEY}@%220x2%22"]
+    assert cache.stats()["bytes"] == len(b"page three, revised")
+
+
+def test_least_recently_used_pages_are_evicted(tmp_path: Path) -> None:
+    cache = PageImageCache(tmp_path, max_bytes=25, max_age=3600)
+    cache.put("a", "1", b"x" * 10)
+    cache.put("b", "1", b"x" * 10)
+    assert cache.get_version("a", "1") is not None  # b is now the oldest
+
+    cache.put("c", "1", b"x" * 10)
+
+    assert cached_files(tmp_path) == ["a@1", "c@1"]
+    assert cache.stats()["bytes"] == 20
+    assert cache.evictions == 1
+
+
+def test_page_larger_than_the_budget_is_not_cached(tmp_path: Path) -> None:
+    cache = PageImageCache(tmp_path, max_bytes=5, max_age=3600)
+    assert cache.put("a", "1", b"x" * 6) is None
+    assert cached_files(tmp_path) == []
+
+
+def test_key_outside_the_root_is_refused(tmp_path: Path) -> None:
+    root = tmp_path / "cache"
+    cache = PageImageCache(root, max_bytes=1000, max_age=3600)
+
+    assert cache.put("../outside", "1", b"data") is None
+    assert cache.put("/etc/passwd", "1", b"data") is None
+    assert list(tmp_path.rglob("*@*")) == []
+
+
+def test_index_is_rebuilt_from_disk(tmp_path: Path) -> None:
+    PageImageCache(tmp_path, max_bytes=1000, max_age=3600).put(KEY, '"0x1"', b"p3")
+
+    restarted = PageImageCache(tmp_path, max_bytes=1000, max_age=3600)
+    blob = Blob(b"p3")
+
+    # Entries found on disk have no validation time: revalidated, not refetched.
+    assert fetch(restarted, blob) == ('"0x1"', b"p3")
+    assert blob.requests == ['"0x1"']
+
+
+def test_get_version_only_matches_the_same_etag(tmp_path: Path) -> None:
+    cache = PageImageCache(tmp_path, max_bytes=1000, max_age=3600)
+    cache.put(f"{KEY}.w512_q75.webp", '"0x1"', b"small")
+
+    assert cache.get_version(f"{KEY}.w512_q75.webp", '"0x1"') == b"small"
+    assert cache.get_version(f"{KEY}.w512_q75.webp", '"0x2"') is None
@@ -0,0 +1,113 @@
+"""search_chunks pagination: cursors over a point in time."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+from conftest import chunk
+
+from strategy_review_mcp import server
+
+QUERY = "tuberculosis"
+
+
+def corpus() -> list[dict]:
+    # 12 matching chunks, several with equal scores (so the chunk_id
+    # tie-break matters), and a few that do not match at all.
+    chunks = [
+        chunk(
+            f"DOC_{d}",
+            n,
+            "Tuberculosis screening. " * (1 + n % 3) + "Clinics report monthly.",
+            themes=["TB"] if d % 2 else ["HIV"],
+        )
+        for d in range(1, 5)
+        for n in range(1, 4)
+    ]
+    chunks += [chunk("DOC_9", n, "Maternal health services.") for n in (1, 2)]
+    return chunks
+
+
+def search_chunks(**kwargs: Any) -> Any:
+    return asyncio.run(server.search_chunks(QUERY, **kwargs))
+
+
+def walk(**kwargs: Any) -> list[list[str]]:
+    """The chunk ids of every page, following next_cursor to the end."""
+    pages = []
+    cursor = None
+    while True:
+        page = search_chunks(paginate=True, cursor=cursor, **kwargs)
+        assert "error" not in page, page
+        pages.append([r["chunk_id"] for r in page["results"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_pages_cover_the_ranking_without_duplicates_or_gaps(memory_index) -> None:
+    memory_index(corpus())
+
+    pages = walk(top_k=5)
+
+    ranking = [r["chunk_id"] for r in search_chunks(top_k=50)]
+    assert len(ranking) == 12
+    assert [len(p) for p in pages] == [5, 5, 2]
+    assert [c for page in pages for c in page] == ranking
+
+
+@pytest.mark.parametrize(
+    "narrowed", [{"doc_id": "DOC_2"}, {"filters": {"themes": ["TB"]}}]
+)
+def test_pages_keep_doc_id_and_filters(memory_index, narrowed: dict) -> None:
+    memory_index(corpus())
+
+    pages = walk(top_k=2, **narrowed)
+
+    ranking = [r["chunk_id"] for r in search_chunks(top_k=50, **narrowed)]
+    assert ranking and len(ranking) < 12
+    assert [c for page in pages for c in page] == ranking
+
+
+@pytest.mark.parametrize(
+    "changed",
+    [{"query": "malaria"}, {"doc_id": "DOC_1"}, {"filters": {"themes": ["HIV"]}}],
+)
+def test_cursor_is_rejected_for_another_search(memory_index, changed: dict) -> None:
+    memory_index(corpus())
+    cursor = search_chunks(top_k=5, paginate=True)["next_cursor"]
+
+    args = {"query": QUERY, "top_k": 5, "cursor": cursor, **changed}
+    page = asyncio.run(server.search_chunks(**args))
+
+    assert page == {"error": "Cursor belongs to a different query or filters"}
+
+
+def test_malformed_cursor_is_rejected(memory_index) -> None:
+    memory_index(corpus())
+    assert search_chunks(cursor="not-a-cursor") == {"error": "Invalid cursor"}
+
+
+def test_later_pages_read_the_first_pages_snapshot(
+    memory_index, tmp_path: Path
+) -> None:
+    memory_index(corpus())
+    first = search_chunks(top_k=5, paginate=True)
+
+    # Reseed with everything gone; the open cursor still pages the old data.
+    path = tmp_path / "chunks.ndjson"
+    path.write_text(json.dumps(chunk("DOC_9", 1, "Maternal health.")) + "\n")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    second = search_chunks(top_k=5, cursor=first["next_cursor"])
+
+    assert len(second["results"]) == 5
+    assert not {r["chunk_id"] for r in first["results"]} & {
+        r["chunk_id"] for r in second["results"]
+    }
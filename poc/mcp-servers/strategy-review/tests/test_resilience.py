@@ -0,0 +1,255 @@
+"""Circuit breakers and hedging, on a fake clock and fake nodes."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+from opensearchpy import ConnectionError as OpenSearchConnectionError
+
+from strategy_review_mcp.resilience import CircuitBreaker, CircuitOpen, hedged
+from strategy_review_mcp.search_backends import OpenSearchBackend
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+def test_breaker_opens_after_consecutive_failures(clock: Clock) -> None:
+    breaker = CircuitBreaker(3, 10, clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()  # resets the run
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.opened == 1
+
+
+def test_half_open_lets_one_probe_through(clock: Clock) -> None:
+    breaker = CircuitBreaker(1, 10, clock)
+    breaker.record_failure()
+    clock.now = 10
+
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # the probe is taken
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.opened == 1
+
+
+def test_failed_probe_reopens_for_another_period(clock: Clock) -> None:
+    breaker = CircuitBreaker(1, 10, clock)
+    breaker.record_failure()
+    clock.now = 10
+    assert breaker.allow()
+
+    breaker.record_failure()
+
+    clock.now = 19
+    assert breaker.state == "open"
+    clock.now = 20
+    assert breaker.state == "half_open"
+    assert breaker.opened == 1  # still the same outage
+
+
+def test_released_probe_can_be_claimed_again(clock: Clock) -> None:
+    breaker = CircuitBreaker(1, 10, clock)
+    breaker.record_failure()
+    clock.now = 10
+    assert breaker.allow()
+
+    breaker.release()
+
+    assert breaker.allow()
+
+
+def test_release_without_a_probe_changes_nothing(clock: Clock) -> None:
+    breaker = CircuitBreaker(2, 10, clock)
+    breaker.record_failure()
+
+    breaker.release()
+
+    assert breaker.state == "closed"
+    assert breaker.consecutive_failures == 1
+
+
+def test_zero_failures_disables_the_breaker(clock: Clock) -> None:
+    breaker = CircuitBreaker(0, 10, clock)
+    for _ in range(100):
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+# ---------------------------------------------------------------------------
+# hedged
+# ---------------------------------------------------------------------------
+
+
+def attempt(result: Any, after: float, log: list[str], name: str):
+    async def run() -> Any:
+        log.append(f"{name} start")
+        try:
+            await asyncio.sleep(after)
+        except asyncio.CancelledError:
+            log.append(f"{name} cancelled")
+            raise
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    return run
+
+
+def test_fast_answer_sends_no_hedge() -> None:
+    log: list[str] = []
+    result = asyncio.run(
+        hedged([attempt("a", 0, log, "a"), attempt("b", 0, log, "b")], 0.5)
+    )
+    assert result == ("a", 0)
+    assert log == ["a start"]
+
+
+def test_slow_answer_is_hedged_and_the_loser_cancelled() -> None:
+    log: list[str] = []
+    result = asyncio.run(
+        hedged([attempt("a", 5, log, "a"), attempt("b", 0, log, "b")], 0.02)
+    )
+    assert result == ("b", 1)
+    assert log == ["a start", "b start", "a cancelled"]
+
+
+def test_failure_starts_the_next_attempt_at_once() -> None:
+    log: list[str] = []
+    start = time.perf_counter()
+    result = asyncio.run(
+        hedged([attempt(OSError("down"), 0, log, "a"), attempt("b", 0, log, "b")], 5)
+    )
+    assert result == ("b", 1)
+    assert time.perf_counter() - start < 1
+
+
+def test_final_error_is_raised_without_hedging() -> None:
+    log: list[str] = []
+    with pytest.raises(ValueError):
+        asyncio.run(
+            hedged(
+                [
+                    attempt(ValueError("bad query"), 0, log, "a"),
+                    attempt("b", 0, log, "b"),
+                ],
+                5,
+                is_final=lambda e: isinstance(e, ValueError),
+            )
+        )
+    assert log == ["a start"]
+
+
+def test_last_error_is_raised_when_every_attempt_fails() -> None:
+    log: list[str] = []
+    with pytest.raises(OSError, match="b down"):
+        asyncio.run(
+            hedged(
+                [
+                    attempt(OSError("a down"), 0, log, "a"),
+                    attempt(OSError("b down"), 0.01, log, "b"),
+                ],
+                5,
+            )
+        )
+
+
+# ---------------------------------------------------------------------------
+# OpenSearchBackend: breakers under hedging
+# ---------------------------------------------------------------------------
+
+
+def backend(**kwargs: Any) -> OpenSearchBackend:
+    backend = OpenSearchBackend(
+        "http://a,http://b", "", "", "chunks", breaker_reset=10, **kwargs
+    )
+    backend._client = lambda node: node.url  # the fake calls get the node URL
+    return backend
+
+
+def half_open(backend: OpenSearchBackend, url: str) -> CircuitBreaker:
+    breaker = next(n.breaker for n in backend.nodes if n.url == url)
+    breaker.record_failure()
+    breaker.opened_at = time.monotonic() - breaker.reset_after
+    assert breaker.state == "half_open"
+    return breaker
+
+
+def test_unsent_hedge_leaves_a_half_open_probe_unclaimed() -> None:
+    b = backend(hedge_after=0.5, breaker_failures=1)
+    breaker = half_open(b, "http://b")
+    calls: list[str] = []
+
+    async def call(url: str, _timeout: float) -> str:
+        calls.append(url)
+        return url
+
+    assert asyncio.run(b._request(call)) == "http://a"
+    assert calls == ["http://a"]
+    assert breaker.state == "half_open"
+
+
+def test_hedge_probes_a_half_open_node() -> None:
+    b = backend(hedge_after=0.02, breaker_failures=1)
+    breaker = half_open(b, "http://b")
+
+    async def call(url: str, _timeout: float) -> str:
+        if url == "http://a":
+            await asyncio.sleep(5)
+        return url
+
+    assert asyncio.run(b._request(call)) == "http://b"
+    assert breaker.state == "closed"
+    assert b.stats()["hedges_won"] == 1
+
+
+def test_failing_node_is_skipped_then_calls_fail_fast() -> None:
+    b = backend(retries=1, backoff=0, breaker_failures=2)
+
+    async def call(url: str, _timeout: float) -> str:
+        if url == "http://a":
+            raise OpenSearchConnectionError("N/A", "refused", None)
+        return url
+
+    async def run() -> list[str]:
+        return [await b._request(call) for _ in range(4)]
+
+    # Round robin starts on a, which fails over to b, until a's breaker
+    # opens; then every call goes straight to b.
+    assert asyncio.run(run()) == ["http://b"] * 4
+    assert b.stats()["nodes"]["http://a"] == {"breaker": "open", "opened": 1}
+    assert b.stats()["retries_sent"] == 2
+
+    async def down(url: str, _timeout: float) -> str:
+        raise OpenSearchConnectionError("N/A", "refused", None)
+
+    # b fails twice (the attempt and its retry) and opens as well.
+    with pytest.raises(OpenSearchConnectionError):
+        asyncio.run(b._request(down))
+    with pytest.raises(CircuitOpen):
+        asyncio.run(b._request(down))
+    assert b.stats()["failed_fast"] == 1
@@ -0,0 +1,122 @@
+"""SingleFlight: concurrent identical calls share one."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from strategy_review_mcp.cache import SingleFlight
+
+
+class Backend:
+    """A call that counts its runs and finishes when released."""
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.cancelled = 0
+        self.release = asyncio.Event()
+
+    async def search(self, result: object = "hits") -> object:
+        self.runs += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+
+async def settle() -> None:
+    """Let every waiting task reach its await."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_concurrent_calls_share_one_run() -> None:
+    async def run() -> None:
+        flight, backend = SingleFlight(), Backend()
+        waiters = [
+            asyncio.ensure_future(flight.do("q", backend.search)) for _ in range(4)
+        ]
+        await settle()
+        backend.release.set()
+
+        assert await asyncio.gather(*waiters) == ["hits"] * 4
+        assert backend.runs == 1
+        assert flight.stats()["leaders"] == 1
+        assert flight.stats()["coalesced"] == 3
+        assert flight.stats()["in_flight"] == 0
+
+    asyncio.run(run())
+
+
+def test_different_keys_and_later_calls_run_again() -> None:
+    async def run() -> None:
+        flight, backend = SingleFlight(), Backend()
+        backend.release.set()
+
+        await asyncio.gather(
+            flight.do("a", backend.search), flight.do("b", backend.search)
+        )
+        await flight.do("a", backend.search)  # the first "a" has finished
+
+        assert backend.runs == 3
+        assert flight.stats()["coalesced"] == 0
+
+    asyncio.run(run())
+
+
+def test_leaders_error_reaches_every_waiter() -> None:
+    async def run() -> None:
+        flight, backend = SingleFlight(), Backend()
+        error = RuntimeError("search failed")
+        waiters = [
+            asyncio.ensure_future(flight.do("q", lambda: backend.search(error)))
+            for _ in range(3)
+        ]
+        await settle()
+        backend.release.set()
+
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert results == [error] * 3
+        assert backend.runs == 1
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_call() -> None:
+    async def run() -> None:
+        flight, backend = SingleFlight(), Backend()
+        leader = asyncio.ensure_future(flight.do("q", backend.search))
+        follower = asyncio.ensure_future(flight.do("q", backend.search))
+        await settle()
+
+        leader.cancel()  # e.g. its client went away
+        await settle()
+        backend.release.set()
+
+        assert await follower == "hits"
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert backend.cancelled == 0
+        assert backend.runs == 1
+
+    asyncio.run(run())
+
+
+def test_disabled_runs_every_call() -> None:
+    async def run() -> None:
+        flight, backend = SingleFlight(enabled=False), Backend()
+        waiters = [
+            asyncio.ensure_future(flight.do("q", backend.search)) for _ in range(3)
+        ]
+        await settle()
+        backend.release.set()
+
+        assert await asyncio.gather(*waiters) == ["hits"] * 3
+        assert backend.runs == 3
+
+    asyncio.run(run())
@@ -1,10 +1,31 @@
-"""Seed Azurite blob storage with sample page images."""
+"""Seed Azurite blob storage with sample page images.
 
+With --renditions, also uploads the standard resized renditions that the MCP
+server's get_page_image serves for max_width/format requests. The rendition
+specs, blob names and renderer are the server's own (strategy_review_mcp,
+installed in the same venv), so the seeded blobs are exactly the ones it
+looks for.
+
+Every blob carries the SHA-256 of its content (for renditions: of the source
+page and rendition settings) in its metadata. The container listing is read
+once at start as the manifest of what is already uploaded, and only pages
+whose hash differs are read, rendered and uploaded, concurrently.
+Re-running after adding or editing a few pages transfers just those.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 
 from azure.core.credentials import AzureNamedKeyCredential
-from azure.storage.blob import BlobServiceClient, ContentSettings
+from azure.storage.blob import BlobServiceClient, ContainerClient, ContentSettings
+from strategy_review_mcp.renditions import STANDARD_RENDITIONS, RenditionSpec, render
 
 # Azurite well-known dev credentials (same constants as in the MCP server)
 _AZURITE_ACCOUNT_NAME = "devstoreaccount1"
@@ -18,8 +39,94 @@ BLOB_ENDPOINT = os.environ.get(
 CONTAINER = os.environ.get("AZURE_STORAGE_CONTAINER", "strategy-pages")
 SEED_DIR = Path(__file__).parent
 
+# Blob metadata key holding the hex SHA-256 of what was uploaded
+HASH_METADATA = "content_sha256"
+
+
+@dataclass(frozen=True)
+class Upload:
+    """A blob to upload: a page, or a rendition of it when ``rendition``."""
+
+    name: str
+    path: Path
+    digest: str
+    content_type: str
+    rendition: RenditionSpec | None = None
+
+
+def remote_manifest(container: ContainerClient) -> dict[str, str | None]:
+    """Blob name -> content hash of everything already in the container."""
+    return {
+        blob.name: (blob.metadata or {}).get(HASH_METADATA)
+        for blob in container.list_blobs(include=["metadata"])
+    }
+
+
+def plan_uploads(renditions: bool) -> list[Upload]:
+    """Every page (and optionally rendition) blob the seed data defines."""
+    uploads = []
+    for doc_dir in sorted(SEED_DIR.iterdir()):
+        if not doc_dir.is_dir():
+            continue
+        doc_id = doc_dir.name
+        for png in sorted(doc_dir.glob("*.png")):
+            digest = hashlib.sha256(png.read_bytes()).hexdigest()
+            uploads.append(Upload(f"{doc_id}/{png.name}", png, digest, "image/png"))
+            if not renditions:
+                continue
+            page_num = int(png.stem.rpartition("_")[2])  # page_003.png
+            for fmt, max_width, quality in STANDARD_RENDITIONS:
+                spec = RenditionSpec(fmt, max_width, quality)
+                settings = f"{digest}:{fmt}:{max_width}:{quality}"
+                uploads.append(
+                    Upload(
+                        spec.blob_name(doc_id, page_num),
+                        png,
+                        hashlib.sha256(settings.encode()).hexdigest(),
+                        spec.content_type,
+                        spec,
+                    )
+                )
+    return uploads
+
+
+def upload(container: ContainerClient, item: Upload, max_concurrency: int) -> int:
+    """Upload one blob with its hash in the metadata; returns bytes sent."""
+    data = item.path.read_bytes()
+    if item.rendition is not None:
+        data = render(data, item.rendition)
+    container.upload_blob(
+        item.name,
+        data,
+        overwrite=True,
+        content_settings=ContentSettings(content_type=item.content_type),
+        metadata={HASH_METADATA: item.digest},
+        max_concurrency=max_concurrency,
+    )
+    return len(data)
+
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed Azurite page images.")
+    parser.add_argument(
+        "--renditions",
+        action="store_true",
+        help="also upload pre-generated standard renditions",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="re-upload blobs that are unchanged"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=8, help="blobs uploaded concurrently"
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=2,
+        help="parallel block uploads per blob (large images)",
+    )
+    args = parser.parse_args()
+
     client = BlobServiceClient(
         account_url=BLOB_ENDPOINT,
         credential=AzureNamedKeyCredential(
@@ -36,25 +143,37 @@ def main() -> None:
         print(f"Container '{CONTAINER}' already exists")
 
     container = client.get_container_client(CONTAINER)
-    count = 0
+    start = time.perf_counter()
+    uploads = plan_uploads(args.renditions)
+    existing = {} if args.force else remote_manifest(container)
+    changed = [u for u in uploads if existing.get(u.name) != u.digest]
 
-    for doc_dir in sorted(SEED_DIR.iterdir()):
-        if not doc_dir.is_dir():
-            continue
-        doc_id = doc_dir.name
-        for png in sorted(doc_dir.glob("*.png")):
-            blob_name = f"{doc_id}/{png.name}"
-            print(f"  Uploading {blob_name}...")
-            with open(png, "rb") as f:
-                container.upload_blob(
-                    blob_name,
-                    f,
-                    overwrite=True,
-                    content_settings=ContentSettings(content_type="image/png"),
-                )
-            count += 1
+    pages = renditions = sent = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(upload, container, item, args.max_concurrency): item
+            for item in changed
+        }
+        for future in as_completed(futures):
+            item = futures[future]
+            sent += future.result()
+            if item.rendition is None:
+                pages += 1
+                print(f"  Uploaded {item.name}")
+            else:
+                renditions += 1
+    elapsed = time.perf_counter() - start
 
-    print(f"Azurite seeded successfully. {count} page images uploaded.")
+    print(
+        f"Azurite seeded successfully. {pages} page images uploaded, "
+        f"{len(uploads) - len(changed)} blobs unchanged."
+    )
+    if args.renditions:
+        print(f"{renditions} standard renditions uploaded.")
+    print(
+        f"{len(changed)} blobs, {sent / 1e6:.1f} MB in {elapsed:.2f}s "
+        f"({pages / elapsed:.1f} pages/s, {sent / 1e6 / elapsed:.1f} MB/s)"
+    )
 
 
 if __name__ == "__main__":
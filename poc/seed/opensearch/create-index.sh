@@ -4,10 +4,14 @@ set -euo pipefail
 # Delete index if it exists (idempotent)
 curl -sf -X DELETE "http://localhost:9200/strategy-chunks" > /dev/null 2>&1 || true
 
-# Create index with mapping
+# Create index with mapping (chunk_vector's dimension must match
+# EMBEDDING_DIMS in strategy_review_mcp/embeddings.py)
 curl -sf -X PUT "http://localhost:9200/strategy-chunks" \
   -H "Content-Type: application/json" \
   -d '{
+  "settings": {
+    "index": { "knn": true }
+  },
   "mappings": {
     "properties": {
       "chunk_id":      { "type": "keyword" },
@@ -20,7 +24,13 @@ curl -sf -X PUT "http://localhost:9200/strategy-chunks" \
       "page_number":   { "type": "integer" },
       "themes":        { "type": "keyword" },
       "countries":     { "type": "keyword" },
-      "chunk_order":   { "type": "integer" }
+      "chunk_order":   { "type": "integer" },
+      "content_hash":  { "type": "keyword", "index": false },
+      "chunk_vector":  {
+        "type": "knn_vector",
+        "dimension": 64,
+        "method": { "name": "hnsw", "space_type": "cosinesimil", "engine": "lucene" }
+      }
     }
   }
 }'
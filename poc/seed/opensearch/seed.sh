@@ -2,14 +2,43 @@
 set -euo pipefail
 
 SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/../../.." && pwd)"
+MCP_DIR="$REPO_ROOT/poc/mcp-servers/strategy-review"
 
-echo "Creating OpenSearch index..."
-bash "$SCRIPT_DIR/create-index.sh"
+# Use the poc venv which has numpy installed
+PYTHON="${REPO_ROOT}/poc/.venv/bin/python3"
 
-echo "Bulk indexing document chunks..."
-curl -sf -X POST "http://localhost:9200/_bulk" \
-  -H "Content-Type: application/x-ndjson" \
-  --data-binary "@$SCRIPT_DIR/chunks.ndjson"
+if [ ! -x "$PYTHON" ]; then
+  echo "ERROR: Python venv not found at $PYTHON"
+  echo "Run: python3 -m venv poc/.venv && poc/.venv/bin/pip install uv && cd poc/mcp-servers/strategy-review && ../../.venv/bin/uv sync"
+  exit 1
+fi
+
+# Re-runs keep the index and model and only re-index changed chunks;
+# SEED_RESET=1 drops both and starts over.
+SEED_RESET="${SEED_RESET:-0}"
+MODEL="$SCRIPT_DIR/lsa-model.npz"
+
+# Fit the TF-IDF/LSA encoder on the chunks; the server loads lsa-model.npz
+# to embed queries for mode="hybrid". Refitting changes every vector, so
+# it is only done when the model is missing.
+if [ "$SEED_RESET" = 1 ] || [ ! -f "$MODEL" ]; then
+  echo "Fitting the embedding model..."
+  PYTHONPATH="$MCP_DIR" "$PYTHON" -m strategy_review_mcp.embeddings \
+    "$SCRIPT_DIR/chunks.ndjson" \
+    --model "$MODEL"
+fi
+
+if [ "$SEED_RESET" = 1 ] || ! curl -sf -o /dev/null "http://localhost:9200/strategy-chunks"; then
+  echo "Creating OpenSearch index..."
+  bash "$SCRIPT_DIR/create-index.sh"
+fi
+
+echo "Indexing document chunks..."
+PYTHONPATH="$MCP_DIR" OPENSEARCH_URL="http://localhost:9200" \
+  "$PYTHON" -m strategy_review_mcp.ingest \
+  "$SCRIPT_DIR/chunks.ndjson" \
+  --model "$MODEL"
 
 echo ""
 echo "OpenSearch seeded successfully."
@@ -13,6 +13,8 @@ import AnthropicBedrock from "@anthropic-ai/bedrock-sdk";
 import type {
   MessageParam,
   ContentBlockParam,
+  ImageBlockParam,
+  TextBlockParam,
   ToolResultBlockParam,
   ToolUseBlock,
 } from "@anthropic-ai/sdk/resources/messages.mjs";
@@ -23,6 +25,44 @@ import type { Skill } from "@/components/skill-selector";
 const MODEL_ID = "us.anthropic.claude-sonnet-4-20250514-v1:0";
 const MAX_TOOL_ROUNDS = 10;
 
+type ImageMediaType = "image/jpeg" | "image/png" | "image/gif" | "image/webp";
+
+type McpContentBlock = {
+  type: string;
+  text?: string;
+  data?: string;
+  mimeType?: string;
+};
+
+/**
+ * Convert MCP tool result content into Anthropic tool_result content.
+ * Text blocks pass through and image blocks become base64 image blocks, so
+ * page images reach the model as images instead of as JSON-escaped text.
+ */
+function toToolResultContent(
+  content: unknown
+): ToolResultBlockParam["content"] {
+  if (!Array.isArray(content)) return JSON.stringify(content);
+  return (content as McpContentBlock[]).map(
+    (block): TextBlockParam | ImageBlockParam => {
+      if (block.type === "image" && block.data && block.mimeType) {
+        return {
+          type: "image",
+          source: {
+            type: "base64",
+            media_type: block.mimeType as ImageMediaType,
+            data: block.data,
+          },
+        };
+      }
+      if (block.type === "text" && block.text !== undefined) {
+        return { type: "text", text: block.text };
+      }
+      return { type: "text", text: JSON.stringify(block) };
+    }
+  );
+}
+
 function getBedrock(): AnthropicBedrock {
   const awsAccessKey = process.env.AWS_ACCESS_KEY_ID;
   const awsSecretKey = process.env.AWS_SECRET_ACCESS_KEY;
@@ -154,7 +194,7 @@ export async function POST(request: Request) {
                 return {
                   type: "tool_result" as const,
                   tool_use_id: toolUse.id,
-                  content: JSON.stringify(result),
+                  content: toToolResultContent(result),
                 };
               } catch (error) {
                 const msg =
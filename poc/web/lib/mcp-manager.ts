@@ -1,21 +1,28 @@
 /**
  * MCP Client Manager — spawns strategy-review and neo4j MCP servers as child
  * processes using StdioClientTransport and routes tool calls to them.
+ * When STRATEGY_REVIEW_MCP_URL is set, strategy-review is instead reached
+ * over Streamable HTTP: one shared, already warm server process
+ * (`strategy-review-mcp --transport http`) serves every web worker.
  */
 
 import { Client } from "@modelcontextprotocol/sdk/client/index.js";
 import { StdioClientTransport } from "@modelcontextprotocol/sdk/client/stdio.js";
+import { StreamableHTTPClientTransport } from "@modelcontextprotocol/sdk/client/streamableHttp.js";
+import type { Transport } from "@modelcontextprotocol/sdk/shared/transport.js";
 import type { Tool } from "@anthropic-ai/sdk/resources/messages.mjs";
 
 type McpServerConfig = {
   command: string;
   args: string[];
   env: Record<string, string>;
+  /** Streamable HTTP endpoint; when set, connect to it instead of spawning. */
+  url?: string;
 };
 
 type ConnectedServer = {
   client: Client;
-  transport: StdioClientTransport;
+  transport: Transport;
   tools: Map<string, { name: string; description: string; inputSchema: object }>;
 };
 
@@ -43,7 +50,11 @@ function getServerConfigs(): Record<string, McpServerConfig> {
           "http://azurite:10000/devstoreaccount1",
         AZURE_STORAGE_CONTAINER:
           process.env.AZURE_STORAGE_CONTAINER || "strategy-pages",
+        NEO4J_URI: process.env.NEO4J_URI || "bolt://neo4j:7687",
+        NEO4J_USER: process.env.NEO4J_USER || "neo4j",
+        NEO4J_PASSWORD: process.env.NEO4J_PASSWORD || "password",
       },
+      url: process.env.STRATEGY_REVIEW_MCP_URL,
     },
     neo4j: {
       command: `${workspaceRoot}/poc/.venv/bin/uvx`,
@@ -78,11 +89,13 @@ class McpManager {
 
         console.log(`[mcp-manager] Connecting to ${name}...`);
 
-        const transport = new StdioClientTransport({
-          command: config.command,
-          args: config.args,
-          env: { ...process.env, ...config.env } as Record<string, string>,
-        });
+        const transport: Transport = config.url
+          ? new StreamableHTTPClientTransport(new URL(config.url))
+          : new StdioClientTransport({
+              command: config.command,
+              args: config.args,
+              env: { ...process.env, ...config.env } as Record<string, string>,
+            });
 
         const client = new Client(
           { name: `web-${name}`, version: "1.0.0" },
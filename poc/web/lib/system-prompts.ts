@@ -32,13 +32,25 @@ const DOCUMENT_CORPUS = `## Document Corpus
 
 const TEXT_TOOLS = `## Text Search Tools
 
-- strategy-review__search_documents(query, top_k=5) — broad document-level BM25 search
-- strategy-review__search_chunks(query, doc_id=None, top_k=5) — granular chunk search, optionally filtered by doc_id
-- strategy-review__get_page_image(doc_id, page_num) — retrieve original page image`;
-
-const GRAPH_TOOLS = `## Graph Query Tool
-
-- neo4j__read_neo4j_cypher(query) — execute a read-only Cypher query against the Neo4j knowledge graph`;
+- strategy-review__search_documents(query, top_k=5, mode="bm25", fields=None) — broad document-level search
+- strategy-review__search_chunks(query, doc_id=None, top_k=5, mode="bm25", fields=None) — granular chunk search, optionally filtered by doc_id
+- Each result's snippet holds the passages that matched, with matched terms in **bold**; search_chunks returns the full chunk text only when fields includes "chunk_text" — request it only when the snippet is not enough to answer
+- Pass fields (e.g. ["doc_title", "snippet"]) to get back only what you need
+- Pass max_tokens (e.g. 1500) to any search (including the batch searches and graph_search), especially with fields including "chunk_text", to cap the size of the results; the top hits are kept whole where possible, and a hit marked "truncated" was cut short — use get_chunk_context to read it in full
+- Pass filters={themes, countries, organization, doc_year_min, doc_year_max} to either search (e.g. {"themes": ["TB"], "countries": ["NGA"]}) instead of searching broadly and filtering results yourself
+- strategy-review__facet_counts(query=None, doc_id=None, filters=None, facets=None) — chunk and document counts per theme, country, organization, year and document; use it for "which / how many / how heavily" questions and to find valid filter values
+- To see more chunk results than the first top_k, call search_chunks with paginate=True and then again with cursor=next_cursor (same query and doc_id) — don't re-run the search with a bigger top_k
+- Pass mode="hybrid" to either search when the question is phrased in everyday language rather than the documents' terminology (it also matches by meaning), instead of retrying with reworded queries
+- strategy-review__search_documents_batch(queries) / strategy-review__search_chunks_batch(queries) — run several searches in one call; each query spec is {query, top_k} / {query, doc_id, top_k}
+- strategy-review__graph_search(query, theme=None, country=None, funding_area=None, top_k=5) — resolves a theme, country and/or funding area in the knowledge graph and searches the chunks of the linked documents in one call; use it for "what do the documents say about <theme> in <country>" instead of a Cypher query followed by a search per document
+- strategy-review__get_chunk_context(chunk_id, before=1, after=1) — the full text of the chunks around a hit, in document order; use it to read surrounding context instead of guessing more searches
+- strategy-review__get_page_image(doc_id, page_num, max_width=None, format=None, quality=None) — retrieve a page image; pass max_width=1024, format="webp" unless full resolution is needed
+- strategy-review__get_page_images(doc_id, pages=[...] or start_page/end_page) — retrieve several pages of one document in one call`;
+
+const GRAPH_TOOLS = `## Graph Query Tools
+
+- strategy-review__get_graph_summary(section=None, key=None) — instant answers from an in-memory copy of the graph: documents (themes with weights), themes (indicators with baseline/target, documents, total funding, priority countries), funding_areas (budget, allocations per theme) and countries (priority themes with rank/rationale, programs); e.g. section="themes", key="TB". Try it first
+- neo4j__read_neo4j_cypher(query) — execute a read-only Cypher query against the Neo4j knowledge graph, for questions the summary does not cover`;
 
 const OUTPUT_FORMAT = `## Output Format
 
@@ -71,6 +83,7 @@ const GUIDELINES = `## Guidelines
 
 - For graph queries: use parameterised Cypher, always include LIMIT clauses, return specific properties not full nodes
 - For text queries: start broad with search_documents, then drill down with search_chunks filtered by doc_id
+- When you need several searches (one per theme, country or document), send them together through the batch tools instead of one call each
 - Present financial data in tables with totals and percentages
 - Quote document text exactly when it adds value — use block quotes
 - If graph and text data conflict, flag the discrepancy and present both